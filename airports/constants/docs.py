@@ -0,0 +1,16 @@
+from airports.constants.settings import AIRPORT_SEARCH_MAX_LIMIT
+
+AIRPORT_SEARCH_DESCRIPTION = f"""
+Look up airports in the bundled airport index.
+
+`q` is matched as a prefix against IATA codes, airport names, city names and
+common aliases ("nyc", "heathrow"), ignoring case and accents. When nothing
+starts with `q`, close spellings are returned instead ("frnkfurt").
+
+Results are ranked exact code first, then exact names, then the shortest
+prefix matches. At most {AIRPORT_SEARCH_MAX_LIMIT} results are returned.
+
+The same index turns the locations of every flight search into IATA codes
+before the scraper runs, or into the city name for cities with several
+airports.
+"""
@@ -0,0 +1,19 @@
+import os
+
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+AIRPORTS_DATA_PATH: str = (
+    os.getenv("AIRPORTS_DATA_PATH")
+    or str(Path(__file__).parent.parent / "data" / "airports.csv")
+)
+
+AIRPORT_SEARCH_DEFAULT_LIMIT = 10
+AIRPORT_SEARCH_MAX_LIMIT = 50
+
+# Prefix matches scanned per query before ranking, keeps one-letter queries cheap
+AIRPORT_PREFIX_SCAN_LIMIT = 500
+# Keys sharing the most trigrams with the query that get an edit distance check
+AIRPORT_FUZZY_CANDIDATES = 25
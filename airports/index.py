@@ -0,0 +1,230 @@
+import csv
+import sys
+import unicodedata
+
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Any
+
+from airports.constants.settings import (
+    AIRPORTS_DATA_PATH,
+    AIRPORT_PREFIX_SCAN_LIMIT,
+    AIRPORT_FUZZY_CANDIDATES,
+)
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+
+def fold(text: str) -> str:
+    """Casefold and strip accents, so "İstanbul" and "Bogotá" match "istanbul" and "bogota"."""
+    decomposed = unicodedata.normalize("NFD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_place(text: str) -> str:
+    folded = "".join(char if char.isalnum() else " " for char in fold(text))
+    return " ".join(folded.split())
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance counting a swap of adjacent letters as one edit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+
+    return previous[-1]
+
+
+@dataclass(slots=True, frozen=True)
+class AirportRecord:
+    iata: str
+    name: str
+    city: str
+    country: str
+
+
+@dataclass(slots=True)
+class AirportIndexStats:
+    searches: int = 0
+    fuzzy_searches: int = 0
+    resolved_codes: int = 0
+    resolved_cities: int = 0
+    unresolved: int = 0
+
+
+class AirportIndex:
+    """
+    In-memory index of the bundled airport table.
+
+    Every airport is reachable by its IATA code, name, city and aliases,
+    all normalized (lowercase, no accents or punctuation). The keys live
+    in one sorted list, so a prefix lookup is a binary search followed by
+    a short forward scan, which walks the same keys a trie would without
+    the per-node overhead. Queries with no prefix match fall back to a
+    trigram index and a bounded edit distance.
+    """
+
+    def __init__(self, path: str = AIRPORTS_DATA_PATH) -> None:
+        self.stats = AirportIndexStats()
+        self.airports: tuple[AirportRecord, ...] = ()
+        self.codes: dict[str, int] = {}
+
+        self._keys: list[str] = []
+        self._postings: list[tuple[int, ...]] = []
+        self._trigrams: dict[str, list[int]] = {}
+        self._cities: dict[str, str] = {}
+
+        self._load(path)
+
+    def search(self, query: str, limit: int) -> list[AirportRecord]:
+        self.stats.searches += 1
+        key = normalize_place(query)
+        if not key:
+            return []
+
+        ranked: dict[int, tuple] = {}
+
+        code = self.codes.get(key.upper())
+        if code is not None:
+            ranked[code] = (0, 0, key)
+
+        start = bisect_left(self._keys, key)
+        end = min(start + AIRPORT_PREFIX_SCAN_LIMIT, len(self._keys))
+        for position in range(start, end):
+            candidate = self._keys[position]
+            if not candidate.startswith(key):
+                break
+
+            rank = (1 if candidate == key else 2, len(candidate), candidate)
+            for airport in self._postings[position]:
+                if rank < ranked.get(airport, (3,)):
+                    ranked[airport] = rank
+
+        if not ranked:
+            self.stats.fuzzy_searches += 1
+            for distance, position in self._fuzzy(key):
+                for airport in self._postings[position]:
+                    ranked.setdefault(airport, (3, distance, self._keys[position]))
+
+        order = sorted(ranked, key=lambda airport: (ranked[airport], self.airports[airport].iata))
+        return [self.airports[airport] for airport in order[:limit]]
+
+    def resolve(self, location: str) -> str:
+        """
+        Turn a free-text location into what the search form should be given:
+        the IATA code when it points at exactly one airport, the city name
+        when it names a city with several airports (New York, London), or
+        the text unchanged when the index can't tell. Only exact code, name
+        or alias matches are rewritten: a guessed typo correction would send
+        a city missing from the table (Fargo, Bari) to some other airport.
+        """
+        key = normalize_place(location)
+
+        if key.upper() in self.codes:
+            self.stats.resolved_codes += 1
+            return key.upper()
+
+        airports = self._exact(key)
+
+        if len(airports) == 1:
+            self.stats.resolved_codes += 1
+            return self.airports[airports[0]].iata
+
+        cities = {self.airports[airport].city for airport in airports}
+        if len(cities) == 1:
+            self.stats.resolved_cities += 1
+            return cities.pop()
+
+        self.stats.unresolved += 1
+        return location
+
+    def place_names(self) -> list[str]:
+        """Every normalized name, city and alias, without the bare IATA codes."""
+        return [key for key in self._keys if key.upper() not in self.codes or len(key) != 3]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "airports": len(self.airports),
+            "keys": len(self._keys),
+        }
+
+    def _exact(self, key: str) -> tuple[int, ...]:
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._postings[position]
+        return ()
+
+    def _fuzzy(self, key: str) -> list[tuple[int, int]]:
+        shared = Counter()
+        for trigram in _trigrams(key):
+            shared.update(self._trigrams.get(trigram, ()))
+
+        limit = max(1, len(key) // 4)
+        matches = []
+        for position, _ in shared.most_common(AIRPORT_FUZZY_CANDIDATES):
+            distance = _edit_distance(key, self._keys[position], limit)
+            if distance <= limit:
+                matches.append((distance, position))
+
+        return sorted(matches)
+
+    def _load(self, path: str) -> None:
+        airports = []
+        postings: dict[str, set[int]] = {}
+
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                record = AirportRecord(
+                    iata=sys.intern(row["iata"].strip().upper()),
+                    name=row["name"].strip(),
+                    city=sys.intern(row["city"].strip()),
+                    country=sys.intern(row["country"].strip()),
+                )
+                index = len(airports)
+                airports.append(record)
+
+                names = [record.iata, record.name, record.city]
+                names += [alias for alias in row["aliases"].split("|") if alias.strip()]
+
+                for name in names:
+                    key = normalize_place(name)
+                    if key:
+                        postings.setdefault(sys.intern(key), set()).add(index)
+
+        self.airports = tuple(airports)
+        self.codes = {record.iata: index for index, record in enumerate(airports)}
+        self._keys = sorted(postings)
+        self._postings = [tuple(sorted(postings[key])) for key in self._keys]
+
+        for position, key in enumerate(self._keys):
+            for trigram in _trigrams(key):
+                self._trigrams.setdefault(trigram, []).append(position)
+
+        logger.info(f"Loaded {len(self.airports)} airports under {len(self._keys)} lookup keys")
+
+
+airport_index = AirportIndex()
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class Airport(BaseModel):
+    iata: str
+    name: str
+    city: str
+    country: str
@@ -0,0 +1,39 @@
+from typing import Annotated, Any
+from fastapi import APIRouter, Query
+
+from airports.index import airport_index
+from airports.models import Airport
+from airports.constants.docs import AIRPORT_SEARCH_DESCRIPTION
+from airports.constants.settings import (
+    AIRPORT_SEARCH_DEFAULT_LIMIT,
+    AIRPORT_SEARCH_MAX_LIMIT,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/airports",
+    response_model=list[Airport],
+    description=AIRPORT_SEARCH_DESCRIPTION
+)
+async def search_airports(
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    limit: Annotated[int, Query(ge=1, le=AIRPORT_SEARCH_MAX_LIMIT)] = AIRPORT_SEARCH_DEFAULT_LIMIT
+) -> list[Airport]:
+    return [
+        Airport(
+            iata=airport.iata,
+            name=airport.name,
+            city=airport.city,
+            country=airport.country
+        )
+        for airport in airport_index.search(q, limit)
+    ]
+
+
+@router.get("/airports/stats")
+async def airport_stats() -> dict[str, Any]:
+    return {
+        "airport_index": airport_index.snapshot(),
+    }
@@ -0,0 +1,121 @@
+"""
+Compares the old voice upload path (UploadFile, read(), temporary file,
+reopen) with the streaming reader in voice.upload for 1-25 MB files.
+Sizes above the 25 MB limit measure how cheaply oversized uploads are refused.
+
+Runs fully offline, no OpenAI calls are made:
+
+    python -m benchmarks.audio_upload --sizes 1 5 10 25 --repeat 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from typing import AsyncIterator
+
+from starlette.datastructures import Headers
+from starlette.formparsers import MultiPartParser
+
+from voice.errors import AudioFileTooLargeError
+from voice.upload import read_audio_upload
+
+BOUNDARY = "benchmark-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+CHUNK_SIZE = 64 * 1024
+
+
+def build_body(size_mb: int) -> bytes:
+    audio = os.urandom(size_mb * 1024 * 1024)
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="audio"; filename="clip.mp3"\r\n'
+        "Content-Type: audio/mpeg\r\n\r\n"
+    ).encode() + audio + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def stream_body(body: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+
+async def legacy_upload(body: bytes) -> int:
+    headers = Headers({"content-type": CONTENT_TYPE, "content-length": str(len(body))})
+    form = await MultiPartParser(headers, stream_body(body), max_part_size=len(body)).parse()
+    audio = form["audio"]
+
+    try:
+        audio_content = await audio.read()
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{audio.filename}") as temp_file:
+            temp_file.write(audio_content)
+            temp_file.flush()
+            temp_path = temp_file.name
+
+        try:
+            with open(temp_path, "rb") as audio_file:
+                audio_file.seek(0, 2)
+                return audio_file.tell()
+        finally:
+            os.unlink(temp_path)
+    finally:
+        await form.close()
+
+
+async def streaming_upload(body: bytes) -> int:
+    try:
+        upload = await read_audio_upload(stream_body(body), CONTENT_TYPE, len(body))
+    except AudioFileTooLargeError:
+        # Sizes above the limit show the cost of refusing them early
+        return 0
+    return upload.size
+
+
+async def measure(upload, body: bytes, repeat: int) -> tuple[list[float], int]:
+    timings = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        await upload(body)
+        timings.append((time.perf_counter() - started) * 1000)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return timings, peak
+
+
+async def run(sizes: list[int], repeat: int) -> list[dict]:
+    report = []
+
+    for size_mb in sizes:
+        body = build_body(size_mb)
+
+        legacy_ms, legacy_peak = await measure(legacy_upload, body, repeat)
+        streaming_ms, streaming_peak = await measure(streaming_upload, body, repeat)
+
+        report.append({
+            "size_mb": size_mb,
+            "legacy_median_ms": round(statistics.median(legacy_ms), 2),
+            "streaming_median_ms": round(statistics.median(streaming_ms), 2),
+            "legacy_peak_mb": round(legacy_peak / 1024 / 1024, 2),
+            "streaming_peak_mb": round(streaming_peak / 1024 / 1024, 2),
+        })
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 25])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.sizes, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
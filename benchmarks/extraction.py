@@ -0,0 +1,82 @@
+"""
+Compares per-row and batched flight extraction on a synthetic results page.
+
+Runs fully offline against Playwright's bundled Chromium:
+
+    python -m benchmarks.extraction --rows 10 100 500 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from playwright.async_api import Page, async_playwright
+
+from benchmarks.fixtures import generate_flights, render_results_page
+from scraper.constants.selectors import FLIGHTS_SELECTOR, RESULTS_SELECTORS
+from scraper.utils import process_flight, process_flights
+
+
+async def extract_per_row(page: Page) -> list[dict]:
+    rows = await page.query_selector_all(FLIGHTS_SELECTOR)
+    return list(await asyncio.gather(*(process_flight(row) for row in rows)))
+
+
+def per_row_round_trips(results: list[dict]) -> int:
+    # One query_selector_all, then query_selector per field plus text_content per match
+    lookups = len(results) * len(RESULTS_SELECTORS)
+    reads = sum(value is not None for flight in results for value in flight.values())
+    return 1 + lookups + reads
+
+
+async def time_extraction(extract, page: Page, repeat: int) -> tuple[list[dict], list[float]]:
+    timings = []
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = await extract(page)
+        timings.append((time.perf_counter() - started) * 1000)
+    return results, timings
+
+
+async def run(row_counts: list[int], repeat: int) -> list[dict]:
+    report = []
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+
+        for count in row_counts:
+            await page.set_content(render_results_page(generate_flights(count)))
+
+            per_row, per_row_ms = await time_extraction(extract_per_row, page, repeat)
+            batched, batched_ms = await time_extraction(process_flights, page, repeat)
+
+            if per_row != batched:
+                raise AssertionError(f"Extraction modes disagree for {count} rows")
+
+            report.append({
+                "rows": count,
+                "per_row_round_trips": per_row_round_trips(per_row),
+                "batched_round_trips": 1,
+                "per_row_median_ms": round(statistics.median(per_row_ms), 2),
+                "batched_median_ms": round(statistics.median(batched_ms), 2),
+            })
+
+        await browser.close()
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.rows, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
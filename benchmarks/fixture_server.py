@@ -0,0 +1,117 @@
+"""
+Local stand-in for Google Flights used by the offline benchmarks.
+
+Serves benchmarks/fixture/flights.html at /flights and the synthetic
+results it fetches after Search at /results. The number of rows and the
+artificial latencies are read from the server's config on every request,
+so one server can be reconfigured between benchmark runs.
+
+It can also stand in for Google while running the API itself:
+
+    python -m benchmarks.fixture_server --port 8765 --rows 500
+    FLIGHTS_PAGE_URL=http://127.0.0.1:8765/flights BRAVE_EXECUTABLE_PATH= fastapi dev main.py
+"""
+import argparse
+import json
+import threading
+import time
+
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.fixtures import generate_flights
+
+PAGE_PATH = Path(__file__).parent / "fixture" / "flights.html"
+
+
+@dataclass(slots=True)
+class FixtureConfig:
+    rows: int = 100
+    initial_rows: int = 10
+    seed: int = 0
+    duplicate_ratio: float = 0.1
+    autocomplete_ms: int = 50
+    results_ms: int = 100
+    more_flights_ms: int = 150
+
+
+class FixtureServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = FixtureConfig()
+        self._page = PAGE_PATH.read_text(encoding="utf-8")
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/flights"
+
+    def configure(self, **changes) -> None:
+        for name, value in changes.items():
+            setattr(self.config, name, value)
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path = self.path.split("?", 1)[0]
+                config = fixture.config
+
+                if path == "/flights":
+                    body = fixture._page.replace("{{CONFIG}}", json.dumps(asdict(config)))
+                    self._send(body.encode("utf-8"), "text/html; charset=utf-8")
+                elif path == "/results":
+                    flights = generate_flights(config.rows, config.seed, config.duplicate_ratio)
+                    self._send(json.dumps({"flights": flights}).encode("utf-8"), "application/json")
+                else:
+                    self.send_error(404)
+
+            def _send(self, body: bytes, content_type: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+
+    with FixtureServer(port=args.port) as server:
+        server.configure(rows=args.rows)
+        print(f"Serving the flights fixture at {server.url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import html
+import random
+
+AIRLINES = (
+    "Delta", "United", "American", "JetBlue", "British Airways",
+    "Virgin Atlantic", "Lufthansa", "Air France", "KLM", "Iberia",
+)
+
+STOPS = ("Nonstop", "1 stop", "2 stops")
+
+
+def _clock(minutes: int) -> str:
+    hours, minutes = divmod(minutes % (24 * 60), 60)
+    suffix = "AM" if hours < 12 else "PM"
+    return f"{(hours % 12) or 12}:{minutes:02d} {suffix}"
+
+
+def generate_flights(count: int, seed: int = 0, duplicate_ratio: float = 0.1) -> list[dict]:
+    rng = random.Random(seed)
+    flights = []
+
+    for _ in range(count):
+        if flights and rng.random() < duplicate_ratio:
+            flights.append(dict(rng.choice(flights)))
+            continue
+
+        departure = rng.randrange(0, 24 * 60, 5)
+        duration = rng.randrange(60, 20 * 60, 5)
+        arrival = departure + duration
+        day_offset = arrival // (24 * 60)
+
+        flights.append({
+            "airline": rng.choice(AIRLINES),
+            "departure_time": _clock(departure),
+            "arrival_time": _clock(arrival) + (f"+{day_offset}" if day_offset else ""),
+            "duration": f"{duration // 60} hr {duration % 60} min",
+            "stops": rng.choice(STOPS),
+            "price": f"${rng.randrange(89, 2400):,}",
+        })
+
+    return flights
+
+
+def render_flight_row(flight: dict) -> str:
+    value = {key: html.escape(text) for key, text in flight.items()}
+    return (
+        '<li class="pIav2d">'
+        f'<div class="sSHqwe tPgKwe ogfYpf">{value["airline"]}</div>'
+        f'<span aria-label="Departure time: {value["departure_time"]}.">{value["departure_time"]}</span>'
+        f'<span aria-label="Arrival time: {value["arrival_time"]}.">{value["arrival_time"]}</span>'
+        f'<div aria-label="Total duration {value["duration"]}.">{value["duration"]}</div>'
+        f'<div class="hF6lYb"><span class="rGRiKd">{value["stops"]}</span></div>'
+        f'<div class="FpEdX"><span>{value["price"]}</span></div>'
+        '</li>'
+    )
+
+
+def render_results_page(flights: list[dict]) -> str:
+    rows = "".join(render_flight_row(flight) for flight in flights)
+    return f"<!doctype html><html><body><ul>{rows}</ul></body></html>"
@@ -0,0 +1,98 @@
+"""
+Compares the deep link and form-filling engines on the same search.
+
+Each run starts from a fresh page parked on Google Flights and measures the
+time until result rows are visible. Needs network access to Google and the
+browser configured through BRAVE_EXECUTABLE_PATH:
+
+    python -m benchmarks.navigation --departure JFK --destination LHR \\
+        --departure-date 2026-03-15 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from playwright.async_api import Page, async_playwright
+
+from scraper.browser import launch_browser, create_browser_context, create_page_instance
+from scraper.models import SearchParams
+from scraper.scraper import fill_search_form, wait_for_results, open_deep_link
+
+
+async def via_form(page: Page, params: SearchParams) -> bool:
+    await fill_search_form(page, params)
+    await wait_for_results(page)
+    return True
+
+
+async def via_deep_link(page: Page, params: SearchParams) -> bool:
+    return await open_deep_link(page, params)
+
+
+async def run(params: SearchParams, repeat: int) -> dict:
+    engines = {"form": via_form, "deeplink": via_deep_link}
+    report = {}
+
+    async with async_playwright() as playwright:
+        browser = await launch_browser(playwright)
+
+        for name, open_results in engines.items():
+            timings = []
+            failures = 0
+
+            for _ in range(repeat):
+                context = await create_browser_context(browser)
+                page = await create_page_instance(context)
+
+                started = time.perf_counter()
+                try:
+                    succeeded = await open_results(page, params)
+                except Exception:
+                    succeeded = False
+                elapsed = (time.perf_counter() - started) * 1000
+
+                if succeeded:
+                    timings.append(elapsed)
+                else:
+                    failures += 1
+
+                await context.close()
+
+            report[name] = {
+                "runs": repeat,
+                "failures": failures,
+                "median_ms": round(statistics.median(timings), 2) if timings else None,
+                "min_ms": round(min(timings), 2) if timings else None,
+            }
+
+        await browser.close()
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--departure", default="JFK")
+    parser.add_argument("--destination", default="LHR")
+    parser.add_argument("--departure-date", required=True)
+    parser.add_argument("--return-date")
+    parser.add_argument("--flight-type", default="Economy")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    params = SearchParams(
+        departure=args.departure,
+        destination=args.destination,
+        departure_date=args.departure_date,
+        return_date=args.return_date,
+        ticket_type="Round Trip" if args.return_date else "One Way",
+        flight_type=args.flight_type,
+    )
+
+    print(json.dumps(asyncio.run(run(params, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
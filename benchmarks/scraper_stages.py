@@ -0,0 +1,234 @@
+"""
+Times every stage of a search against the local flights fixture, fully
+offline, on Playwright's bundled Chromium (or --executable-path):
+
+    python -m benchmarks.scraper_stages --rows 10 100 1000 5000 --repeat 3 \\
+        --output stages.json
+
+Stages: page_ready (new page + goto), form_fill, results_wait,
+more_flights, extraction, dedup and serialization (the JSON the API
+returns). Pass --compare with an earlier output to print per-stage ratios
+and exit non-zero when a stage got slower than --tolerance allows.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from playwright.async_api import Browser, async_playwright
+from pydantic import TypeAdapter
+
+from benchmarks.fixture_server import FixtureServer
+from scraper.browser import launch_browser, create_browser_context, create_page_instance
+from scraper.models import SearchParams, Flight
+from scraper.scraper import fill_search_form, wait_for_results, extract_flight_rows
+from scraper.utils import click_more_flights_button, process_duplicate_flights
+from scraper.constants.settings import EXTRACTION_MODE
+
+STAGES = (
+    "page_ready",
+    "form_fill",
+    "results_wait",
+    "more_flights",
+    "extraction",
+    "dedup",
+    "serialization",
+)
+
+SEARCHES = {
+    "one_way": SearchParams(
+        departure="JFK",
+        destination="LHR",
+        departure_date="2026-03-15",
+        ticket_type="One Way",
+        passengers={"Adult": 2},
+    ),
+    "round_trip": SearchParams(
+        departure="JFK",
+        destination="LHR",
+        departure_date="2026-03-15",
+        return_date="2026-03-22",
+        ticket_type="Round Trip",
+        flight_type="Business",
+    ),
+    "multi_city": SearchParams(
+        departure=["JFK", "LHR", "CDG"],
+        destination=["LHR", "CDG", "JFK"],
+        departure_date=["2026-03-15", "2026-03-20", "2026-03-25"],
+        ticket_type="Multi-City",
+        city_amount=1,
+    ),
+}
+
+FLIGHTS = TypeAdapter(list[Flight])
+
+
+def _ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+async def run_search(browser: Browser, url: str, params: SearchParams) -> tuple[dict, int, int]:
+    timings = {}
+    context = await create_browser_context(browser)
+
+    try:
+        started = time.perf_counter()
+        page = await create_page_instance(context, url)
+        timings["page_ready"] = _ms(started)
+
+        started = time.perf_counter()
+        await fill_search_form(page, params)
+        timings["form_fill"] = _ms(started)
+
+        started = time.perf_counter()
+        await wait_for_results(page)
+        timings["results_wait"] = _ms(started)
+
+        started = time.perf_counter()
+        await click_more_flights_button(page)
+        timings["more_flights"] = _ms(started)
+
+        started = time.perf_counter()
+        rows = await extract_flight_rows(page)
+        timings["extraction"] = _ms(started)
+    finally:
+        await context.close()
+
+    started = time.perf_counter()
+    flights = process_duplicate_flights(rows)
+    timings["dedup"] = _ms(started)
+
+    started = time.perf_counter()
+    FLIGHTS.dump_json(FLIGHTS.validate_python(flights))
+    timings["serialization"] = _ms(started)
+
+    return timings, len(rows), len(flights)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "min_ms": round(ordered[0], 2),
+    }
+
+
+async def run(
+    row_counts: list[int],
+    repeat: int,
+    search: str,
+    executable_path: str | None
+) -> list[dict]:
+    params = SEARCHES[search]
+    report = []
+
+    with FixtureServer() as server:
+        async with async_playwright() as playwright:
+            browser = await launch_browser(playwright, executable_path)
+
+            for count in row_counts:
+                server.configure(rows=count)
+                samples = {stage: [] for stage in STAGES}
+                extracted = unique = 0
+
+                for _ in range(repeat):
+                    timings, extracted, unique = await run_search(browser, server.url, params)
+                    for stage, value in timings.items():
+                        samples[stage].append(value)
+
+                totals = [sum(run) for run in zip(*samples.values())]
+                report.append({
+                    "rows": count,
+                    "extracted_rows": extracted,
+                    "unique_flights": unique,
+                    "stages": {stage: summarize(values) for stage, values in samples.items()},
+                    "total": summarize(totals),
+                })
+
+            await browser.close()
+
+    return report
+
+
+def metadata(search: str, repeat: int) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "search": search,
+        "repeat": repeat,
+        "extraction_mode": EXTRACTION_MODE.value,
+    }
+
+
+def _medians(entry: dict) -> dict[str, float]:
+    medians = {stage: values["median_ms"] for stage, values in entry["stages"].items()}
+    medians["total"] = entry["total"]["median_ms"]
+    return medians
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> bool:
+    baseline_rows = {entry["rows"]: _medians(entry) for entry in baseline["results"]}
+    regressed = False
+
+    print(f"{'rows':>6} {'stage':<14} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for entry in current["results"]:
+        previous = baseline_rows.get(entry["rows"])
+        if previous is None:
+            continue
+
+        for stage, now in _medians(entry).items():
+            before = previous.get(stage)
+            if before is None:
+                continue
+
+            ratio = now / before if before else 1.0
+            flag = " !" if ratio > 1 + tolerance else ""
+            regressed |= bool(flag)
+            print(f"{entry['rows']:>6} {stage:<14} {before:>10.2f} {now:>10.2f} {ratio:>7.2f}{flag}")
+
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--search", choices=sorted(SEARCHES), default="one_way")
+    parser.add_argument("--executable-path", default=None, help="Browser binary, bundled Chromium by default")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.rows, args.repeat, args.search, args.executable_path))
+    report = {"meta": metadata(args.search, args.repeat), "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Measures search throughput against the local flights fixture as scraping
+moves from the API's event loop into worker processes, fully offline:
+
+    python -m benchmarks.worker_pool --workers 0 1 2 4 --searches 40 \\
+        --concurrency 8 --output workers.json
+
+--workers 0 runs scrape_flights in-process on the browser and page pools,
+as the API does with SCRAPER_WORKERS=0; any other count runs the same
+searches through a ScrapeWorkerPool of that size. Every search uses a
+distinct route and date so route affinity spreads them over the workers,
+and the result cache is bypassed. Speedups are relative to the first
+count given. Worker processes can only run in parallel on as many cores
+as the host has.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+from benchmarks.fixture_server import FixtureServer
+
+AIRPORTS = ("JFK", "LHR", "CDG", "FRA", "AMS", "MAD", "FCO", "IST", "DXB", "SIN", "HND", "LAX")
+
+
+def build_searches(count: int) -> list:
+    from scraper.models import SearchParams
+
+    routes = [(a, b) for a in AIRPORTS for b in AIRPORTS if a != b]
+    return [
+        SearchParams(
+            departure=routes[i % len(routes)][0],
+            destination=routes[i % len(routes)][1],
+            departure_date=f"2026-03-{1 + i // len(routes) % 28:02d}",
+            ticket_type="One Way",
+        )
+        for i in range(count)
+    ]
+
+
+def summarize(latencies: list[float], elapsed: float, failed: int) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "searches": len(ordered),
+        "failed": failed,
+        "elapsed_s": round(elapsed, 2),
+        "searches_per_s": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "median_ms": round(statistics.median(ordered) * 1000, 2) if ordered else None,
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2) if ordered else None,
+    }
+
+
+async def drive(scrape, searches: list, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failed = 0
+
+    async def one(params) -> None:
+        nonlocal failed
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await scrape(params)
+            except Exception:
+                failed += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(params) for params in searches))
+    return summarize(latencies, time.perf_counter() - started, failed)
+
+
+async def run_in_process(searches: list, concurrency: int, warmup: int) -> dict:
+    from scraper.pool import browser_pool
+    from scraper.page_pool import page_pool
+    from scraper.scraper import scrape_flights
+
+    await browser_pool.start()
+    await page_pool.start()
+    try:
+        await drive(scrape_flights, searches[:warmup], concurrency)
+        return await drive(scrape_flights, searches[warmup:], concurrency)
+    finally:
+        await page_pool.stop()
+        await browser_pool.stop()
+
+
+async def run_workers(size: int, searches: list, concurrency: int, warmup: int) -> dict:
+    from scraper.workers import ScrapeWorkerPool
+
+    pool = ScrapeWorkerPool(size=size)
+    await pool.start()
+    try:
+        # Lets every worker launch its browser before the clock starts
+        await drive(pool.scrape, searches[:warmup], concurrency)
+        report = await drive(pool.scrape, searches[warmup:], concurrency)
+        report["restarts"] = pool.snapshot()["restarts"]
+        return report
+    finally:
+        await pool.stop()
+
+
+def run(
+    worker_counts: list[int],
+    searches: int,
+    concurrency: int,
+    rows: int,
+    executable_path: str | None
+) -> list[dict]:
+    report = []
+
+    with FixtureServer() as server:
+        server.configure(rows=rows)
+
+        # Settings are read at import, here and in every spawned worker
+        os.environ["FLIGHTS_PAGE_URL"] = server.url
+        os.environ["BRAVE_EXECUTABLE_PATH"] = executable_path or ""
+
+        for size in worker_counts:
+            warmup = max(size, 1) * 2
+            params = build_searches(warmup + searches)
+
+            if size == 0:
+                result = asyncio.run(run_in_process(params, concurrency, warmup))
+            else:
+                result = asyncio.run(run_workers(size, params, concurrency, warmup))
+
+            report.append({"workers": size, **result})
+
+    baseline = report[0]["searches_per_s"] if report else None
+    for entry in report:
+        if baseline and entry["searches_per_s"]:
+            entry["speedup"] = round(entry["searches_per_s"] / baseline, 2)
+
+    return report
+
+
+def metadata(searches: int, concurrency: int, rows: int) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "searches": searches,
+        "concurrency": concurrency,
+        "rows": rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--searches", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--executable-path", default=None, help="Browser binary, bundled Chromium by default")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    results = run(args.workers, args.searches, args.concurrency, args.rows, args.executable_path)
+    report = {"meta": metadata(args.searches, args.concurrency, args.rows), "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
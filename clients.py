@@ -0,0 +1,24 @@
+import os
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+load_dotenv()
+
+OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", "60"))
+
+
+def create_openai_client() -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            )
+        ),
+    )
@@ -0,0 +1,20 @@
+from history.constants.settings import HISTORY_DEFAULT_DAYS, HISTORY_MAX_DAYS
+
+HISTORY_DESCRIPTION = f"""
+Price history for a route and departure date, built from every search the
+scraper has run.
+
+Each scrape's flights are appended to a local columnar store, partitioned by
+route and departure date. Prices are whole amounts in the currency Google
+Flights displayed. Multi-city searches and searches with non ISO dates are
+not recorded.
+
+Observations are matched on the exact search shape: `return_date` (omit it for
+one way searches), `flight_type` and the total number of `passengers`.
+`airline` narrows them to one carrier. `origin` and `destination` are resolved
+through the airport index like search locations.
+
+Returns the minimum and maximum price over the last `days` days (default
+{HISTORY_DEFAULT_DAYS}, maximum {HISTORY_MAX_DAYS}), the airline offering the minimum, when the route was
+first and last seen, and a per-day (UTC) breakdown.
+"""
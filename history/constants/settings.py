@@ -0,0 +1,15 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HISTORY_ENABLED: bool = os.getenv("HISTORY_ENABLED", "true").lower() == "true"
+HISTORY_DIR: str = os.getenv("HISTORY_DIR", ".cache/history")
+# A route/date partition is merged into one segment once it holds this many
+HISTORY_COMPACT_SEGMENTS: int = int(os.getenv("HISTORY_COMPACT_SEGMENTS", "8"))
+# Observations older than this are dropped when compacting, 0 keeps everything
+HISTORY_RETENTION_DAYS: int = int(os.getenv("HISTORY_RETENTION_DAYS", "0"))
+
+HISTORY_DEFAULT_DAYS = 7
+HISTORY_MAX_DAYS = 365
@@ -0,0 +1,30 @@
+from datetime import date, datetime
+
+from pydantic import BaseModel
+
+from scraper.types import FlightType
+
+
+class DailyPrice(BaseModel):
+    day: date
+    min_price: int
+    max_price: int
+    observations: int
+
+
+class PriceHistory(BaseModel):
+    origin: str
+    destination: str
+    departure_date: date
+    return_date: date | None = None
+    flight_type: FlightType
+    passengers: int
+    airline: str | None = None
+    since: datetime
+    observations: int
+    min_price: int | None = None
+    max_price: int | None = None
+    cheapest_airline: str | None = None
+    first_seen: datetime | None = None
+    last_seen: datetime | None = None
+    daily: list[DailyPrice]
@@ -0,0 +1,83 @@
+import asyncio
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Annotated, Any
+from fastapi import APIRouter, Query
+
+from airports.index import airport_index
+from history.store import price_history
+from history.models import PriceHistory, DailyPrice
+from history.constants.docs import HISTORY_DESCRIPTION
+from history.constants.settings import HISTORY_DEFAULT_DAYS, HISTORY_MAX_DAYS
+from scraper.types import FlightType
+from scraper.constants.settings import RESOLVE_LOCATIONS
+
+router = APIRouter()
+
+
+@router.get(
+    "/history",
+    response_model=PriceHistory,
+    description=HISTORY_DESCRIPTION
+)
+async def price_history_search(
+    origin: Annotated[str, Query(min_length=1, max_length=100)],
+    destination: Annotated[str, Query(min_length=1, max_length=100)],
+    departure_date: date,
+    return_date: date | None = None,
+    days: Annotated[int, Query(ge=1, le=HISTORY_MAX_DAYS)] = HISTORY_DEFAULT_DAYS,
+    flight_type: FlightType = FlightType.economy,
+    passengers: Annotated[int, Query(ge=1, le=9)] = 1,
+    airline: str | None = None
+) -> PriceHistory:
+    if RESOLVE_LOCATIONS:
+        origin = airport_index.resolve(origin)
+        destination = airport_index.resolve(destination)
+
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+
+    # Large partitions take a while to scan, so keep it off the event loop
+    summary = await asyncio.to_thread(
+        price_history.query,
+        origin,
+        destination,
+        departure_date,
+        since,
+        return_date=return_date,
+        flight_type=flight_type,
+        passengers=passengers,
+        airline=airline,
+    )
+
+    return PriceHistory(
+        origin=origin,
+        destination=destination,
+        departure_date=departure_date,
+        return_date=return_date,
+        flight_type=flight_type,
+        passengers=passengers,
+        airline=airline,
+        since=since,
+        observations=summary.observations,
+        min_price=summary.min_price,
+        max_price=summary.max_price,
+        cheapest_airline=summary.cheapest_airline,
+        first_seen=summary.first_seen,
+        last_seen=summary.last_seen,
+        daily=[
+            DailyPrice(
+                day=daily.day,
+                min_price=daily.min_price,
+                max_price=daily.max_price,
+                observations=daily.observations
+            )
+            for daily in summary.daily
+        ]
+    )
+
+
+@router.get("/history/stats")
+async def history_stats() -> dict[str, Any]:
+    return {
+        "price_history": price_history.snapshot(),
+    }
@@ -0,0 +1,641 @@
+import asyncio
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+from airports.index import normalize_place
+from scraper.models import SearchParams
+from scraper.types import FlightType, PassengerType, TicketType
+from scraper.utils import parse_price
+from history.constants.settings import (
+    HISTORY_DIR,
+    HISTORY_COMPACT_SEGMENTS,
+    HISTORY_RETENTION_DAYS,
+)
+from logging_config import get_logger
+
+logger = get_logger("history")
+
+# Fixed-width columns, widest first so every column starts 8-byte aligned
+COLUMNS = (
+    ("scraped_at", "q"),
+    ("price", "i"),
+    ("airline", "H"),
+    ("stops", "H"),
+    ("departure_minutes", "h"),
+    ("duration_minutes", "h"),
+    ("return_days", "h"),
+    ("cabin", "B"),
+    ("passengers", "B"),
+)
+DICTIONARY_COLUMNS = ("airline", "stops", "cabin")
+# Codes a dictionary column's width can hold
+DICTIONARY_CAPACITY = {
+    name: 1 << (8 * struct.calcsize(code)) for name, code in COLUMNS if name in DICTIONARY_COLUMNS
+}
+
+SEGMENT_MAGIC = b"FHS1"
+SEGMENT_VERSION = 1
+SEGMENT_SUFFIX = ".seg"
+# magic, version, column count, rows, min scraped_at, max scraped_at
+SEGMENT_HEADER = struct.Struct("<4sHHIqq4x")
+
+UNKNOWN = -1
+ONE_WAY = -1
+
+_CLOCK = re.compile(r"(\d{1,2}):(\d{2})\s*([AP]M)?", re.IGNORECASE)
+_HOURS = re.compile(r"(\d+)\s*h", re.IGNORECASE)
+_MINUTES = re.compile(r"(\d+)\s*m", re.IGNORECASE)
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _slug(location: str) -> str:
+    return normalize_place(location).upper().replace(" ", "_")
+
+
+def _first(value: list[str] | str | None) -> str | None:
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _iso_date(value: str | None) -> date | None:
+    try:
+        return date.fromisoformat(value.strip()) if value else None
+    except ValueError:
+        return None
+
+
+def clock_minutes(value: str) -> int:
+    match = _CLOCK.search(value or "")
+    if not match:
+        return UNKNOWN
+
+    hours, minutes, meridiem = int(match.group(1)), int(match.group(2)), match.group(3)
+    if meridiem:
+        hours = hours % 12 + (12 if meridiem.upper() == "PM" else 0)
+    return hours * 60 + minutes
+
+
+def duration_minutes(value: str) -> int:
+    hours = _HOURS.search(value or "")
+    minutes = _MINUTES.search(value or "")
+    if not hours and not minutes:
+        return UNKNOWN
+    return (int(hours.group(1)) if hours else 0) * 60 + (int(minutes.group(1)) if minutes else 0)
+
+
+@dataclass(slots=True, frozen=True)
+class Partition:
+    origin: str
+    destination: str
+    departure_date: date
+
+    @property
+    def path(self) -> Path:
+        return Path(f"{self.origin}-{self.destination}") / self.departure_date.isoformat()
+
+    @classmethod
+    def of(cls, origin: str, destination: str, departure_date: date) -> "Partition":
+        return cls(_slug(origin), _slug(destination), departure_date)
+
+
+@dataclass(slots=True)
+class ColumnBatch:
+    columns: dict[str, array] = field(
+        default_factory=lambda: {name: array(typecode) for name, typecode in COLUMNS}
+    )
+
+    def __len__(self) -> int:
+        return len(self.columns["scraped_at"])
+
+    def extend(self, other: "ColumnBatch | Segment", start: int = 0) -> None:
+        for name, _ in COLUMNS:
+            self.columns[name].extend(other.columns[name][start:])
+
+
+class Segment:
+    """
+    A memory-mapped, immutable segment file. Each column is exposed as a
+    zero-copy memoryview over the mapping, rows sorted by `scraped_at`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._mmap)
+        try:
+            magic, version, column_count, rows, self.min_ts, self.max_ts = (
+                SEGMENT_HEADER.unpack_from(view)
+            )
+            if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION or column_count != len(COLUMNS):
+                raise ValueError(f"Unsupported segment {path.name}")
+
+            self.rows = rows
+            self.columns: dict[str, memoryview] = {}
+            offset = SEGMENT_HEADER.size
+
+            for name, typecode in COLUMNS:
+                size = rows * array(typecode).itemsize
+                self.columns[name] = view[offset:offset + size].cast(typecode)
+                offset += _padded(size)
+        except BaseException:
+            view.release()
+            self._mmap.close()
+            raise
+
+        self._view = view
+
+    def close(self) -> None:
+        for column in self.columns.values():
+            column.release()
+        self._view.release()
+        self._mmap.close()
+
+    @staticmethod
+    def write(path: Path, batch: ColumnBatch) -> None:
+        rows = len(batch)
+        timestamps = batch.columns["scraped_at"]
+        temp_path = path.with_suffix(".tmp")
+
+        with open(temp_path, "wb") as f:
+            f.write(SEGMENT_HEADER.pack(
+                SEGMENT_MAGIC, SEGMENT_VERSION, len(COLUMNS), rows, min(timestamps), max(timestamps)
+            ))
+            for name, _ in COLUMNS:
+                data = batch.columns[name].tobytes()
+                f.write(data)
+                f.write(b"\0" * (_padded(len(data)) - len(data)))
+
+        os.replace(temp_path, path)
+
+
+@dataclass(slots=True)
+class DailyPrices:
+    day: date
+    min_price: int
+    max_price: int
+    observations: int
+
+
+@dataclass(slots=True)
+class PriceSummary:
+    observations: int = 0
+    min_price: int | None = None
+    max_price: int | None = None
+    cheapest_airline: str | None = None
+    first_seen: datetime | None = None
+    last_seen: datetime | None = None
+    daily: list[DailyPrices] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class PriceHistoryStats:
+    rows_appended: int = 0
+    segments_written: int = 0
+    compactions: int = 0
+    rows_compacted: int = 0
+    rows_expired: int = 0
+    queries: int = 0
+    rows_scanned: int = 0
+    skipped_searches: int = 0
+    skipped_rows: int = 0
+    errors: int = 0
+
+
+class PriceHistoryStore:
+    """
+    Columnar store of every scraped price, partitioned by route and
+    departure date under `directory` (`JFK-LHR/2026-03-15/*.seg`).
+
+    Each append writes one immutable segment per partition holding
+    fixed-width columns: timestamps and prices as integers, airline, stops
+    and cabin as codes into dictionaries shared by all partitions. Queries
+    memory-map a partition's segments, skip those older than the window
+    from their header and bisect the sorted timestamps for the rest. Once a
+    partition holds `compact_segments` segments they are merged into one,
+    dropping rows past `retention_days`.
+    """
+
+    def __init__(
+        self,
+        directory: str = HISTORY_DIR,
+        compact_segments: int = HISTORY_COMPACT_SEGMENTS,
+        retention_days: int = HISTORY_RETENTION_DAYS,
+    ) -> None:
+        self.directory = Path(directory)
+        self.compact_segments = max(2, compact_segments)
+        self.retention_days = retention_days
+        self.stats = PriceHistoryStats()
+
+        # Guards the dictionaries and segment files; readers only hold it
+        # while listing and mapping a partition
+        self._lock = threading.Lock()
+        self._dictionaries: dict[str, list[str]] | None = None
+        self._codes: dict[str, dict[str, int]] = {}
+        self._dictionaries_dirty = False
+        self._last_sequence = 0
+        self._compacting: set[Partition] = set()
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def record(self, params: SearchParams, flights: list[dict]) -> None:
+        """Appends a finished scrape in the background, off the event loop."""
+        task = asyncio.create_task(
+            asyncio.to_thread(self.append_many, [(params, flights, time.time())])
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+
+    async def stop(self) -> None:
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    def append_many(self, scrapes: Iterable[tuple[SearchParams, list[dict], float]]) -> int:
+        """
+        Bulk append: rows of all `scrapes` are grouped per partition and each
+        partition gets a single new segment. Returns the rows written.
+        """
+        batches: dict[Partition, ColumnBatch] = defaultdict(ColumnBatch)
+
+        with self._lock:
+            for params, flights, scraped_at in scrapes:
+                partition = self._partition(params)
+                if partition is None:
+                    self.stats.skipped_searches += 1
+                    continue
+                self._encode(batches[partition], params, partition, flights, scraped_at)
+
+            try:
+                # Persisted before any segment can reference the new codes
+                if self._dictionaries_dirty:
+                    self._save_dictionaries()
+                    self._dictionaries_dirty = False
+            except OSError as e:
+                self.stats.errors += 1
+                logger.warning(f"Failed to save price history dictionaries: {str(e)}")
+                return 0
+
+            written = 0
+            due = []
+            for partition, batch in batches.items():
+                if not len(batch):
+                    continue
+
+                try:
+                    written += self._write_segment(partition, batch)
+                except OSError as e:
+                    self.stats.errors += 1
+                    logger.warning(f"Failed to append price history for {partition.path}: {str(e)}")
+                    continue
+
+                if len(self._segment_paths(partition)) >= self.compact_segments:
+                    due.append(partition)
+
+        # Outside the lock, so appends and queries go on while it merges
+        for partition in due:
+            try:
+                self.compact(partition)
+            except (OSError, ValueError, struct.error) as e:
+                self.stats.errors += 1
+                logger.warning(f"Failed to compact price history for {partition.path}: {str(e)}")
+
+        return written
+
+    def query(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: date,
+        since: datetime,
+        return_date: date | None = None,
+        flight_type: FlightType = FlightType.economy,
+        passengers: int = 1,
+        airline: str | None = None,
+    ) -> PriceSummary:
+        self.stats.queries += 1
+        partition = Partition.of(origin, destination, departure_date)
+        summary = PriceSummary()
+
+        with self._lock:
+            dictionaries = self._load_dictionaries()
+            cabin = self._codes["cabin"].get(flight_type.value)
+            airline_code = self._codes["airline"].get(airline) if airline else None
+            if cabin is None or (airline and airline_code is None):
+                return summary
+            segments = self._open_segments(partition)
+
+        accepts = (
+            cabin,
+            passengers,
+            (return_date - departure_date).days if return_date else ONE_WAY,
+            airline_code,
+        )
+        since_ts = int(since.timestamp())
+        days: dict[int, list[int]] = {}
+        cheapest_code = None
+
+        try:
+            for segment in segments:
+                if segment.max_ts >= since_ts:
+                    cheapest_code = self._scan(segment, since_ts, accepts, summary, days, cheapest_code)
+        finally:
+            for segment in segments:
+                segment.close()
+
+        if not summary.observations:
+            return summary
+
+        summary.cheapest_airline = dictionaries["airline"][cheapest_code]
+        summary.first_seen = datetime.fromtimestamp(min(day[3] for day in days.values()), timezone.utc)
+        summary.last_seen = datetime.fromtimestamp(max(day[4] for day in days.values()), timezone.utc)
+        summary.daily = [
+            DailyPrices(
+                day=datetime.fromtimestamp(epoch_day * 86400, timezone.utc).date(),
+                min_price=day[0],
+                max_price=day[1],
+                observations=day[2],
+            )
+            for epoch_day, day in sorted(days.items())
+        ]
+        return summary
+
+    def compact(self, partition: Partition) -> int:
+        """
+        Merges every segment of `partition` into one, ordered by time and
+        without expired rows. Returns the rows kept.
+
+        The lock is only held to list and map the segments and then to swap
+        the merged one in; reading, sorting and writing it happen outside,
+        and segments appended in the meantime are left for the next run.
+        """
+        with self._lock:
+            if partition in self._compacting:
+                return 0
+            paths = self._segment_paths(partition)
+            if not paths:
+                return 0
+            segments = self._open_segments(partition)
+            self._compacting.add(partition)
+
+        # Staged under a name queries don't list until the swap
+        staged = paths[-1].with_suffix(".compacting")
+        try:
+            merged = self._merge(segments)
+            if len(merged):
+                Segment.write(staged, self._sorted(merged))
+
+            with self._lock:
+                # The merged segment takes the newest name, so a crash before the
+                # old segments are removed duplicates rows instead of losing them
+                if len(merged):
+                    os.replace(staged, paths[-1])
+                else:
+                    paths[-1].unlink(missing_ok=True)
+
+                for path in paths[:-1]:
+                    path.unlink(missing_ok=True)
+        finally:
+            staged.unlink(missing_ok=True)
+            with self._lock:
+                self._compacting.discard(partition)
+
+        self.stats.compactions += 1
+        self.stats.rows_compacted += len(merged)
+        return len(merged)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "pending_writes": len(self._background_tasks),
+            "airlines": len(self._dictionaries["airline"]) if self._dictionaries else None,
+        }
+
+    def _partition(self, params: SearchParams) -> Partition | None:
+        # A multi-city price covers every leg, so it has no single route to file under
+        if params.ticket_type == TicketType.multi_city:
+            return None
+
+        origin, destination = _first(params.departure), _first(params.destination)
+        departure_date = _iso_date(_first(params.departure_date))
+        if not origin or not destination or departure_date is None:
+            return None
+
+        return Partition.of(origin, destination, departure_date)
+
+    def _encode(
+        self,
+        batch: ColumnBatch,
+        params: SearchParams,
+        partition: Partition,
+        flights: list[dict],
+        scraped_at: float
+    ) -> None:
+        return_date = _iso_date(_first(params.return_date))
+        return_days = (
+            (return_date - partition.departure_date).days
+            if params.ticket_type == TicketType.round_trip and return_date else ONE_WAY
+        )
+        cabin = self._code("cabin", params.flight_type.value)
+        # Counted with the form's defaults, which book one adult unless told otherwise
+        passengers = min(sum(
+            params.passengers.get(passenger_type, 1 if passenger_type == PassengerType.adult else 0)
+            for passenger_type in PassengerType
+        ), 255)
+        columns = batch.columns
+
+        for flight in flights:
+            price = parse_price(flight.get("price"))
+            if price is None or price > 2**31 - 1 or cabin is None:
+                self.stats.skipped_rows += 1
+                continue
+
+            airline = self._code("airline", flight.get("airline") or "")
+            stops = self._code("stops", flight.get("stops") or "")
+            if airline is None or stops is None:
+                self.stats.skipped_rows += 1
+                continue
+
+            columns["scraped_at"].append(int(scraped_at))
+            columns["price"].append(price)
+            columns["airline"].append(airline)
+            columns["stops"].append(stops)
+            columns["departure_minutes"].append(clock_minutes(flight.get("departure_time")))
+            columns["duration_minutes"].append(duration_minutes(flight.get("duration")))
+            columns["return_days"].append(return_days)
+            columns["cabin"].append(cabin)
+            columns["passengers"].append(passengers)
+
+    def _code(self, column: str, value: str) -> int | None:
+        """Code of `value`, or None once the column's dictionary is full."""
+        self._load_dictionaries()
+        codes = self._codes[column]
+        code = codes.get(value)
+
+        if code is None:
+            values = self._dictionaries[column]
+            code = len(values)
+            if code >= DICTIONARY_CAPACITY[column]:
+                return None
+            values.append(value)
+            codes[value] = code
+            self._dictionaries_dirty = True
+
+        return code
+
+    def _load_dictionaries(self) -> dict[str, list[str]]:
+        if self._dictionaries is not None:
+            return self._dictionaries
+
+        try:
+            with open(self.directory / "dictionary.json", "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            stored = {}
+
+        self._dictionaries = {column: list(stored.get(column, [])) for column in DICTIONARY_COLUMNS}
+        self._codes = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in self._dictionaries.items()
+        }
+        return self._dictionaries
+
+    def _save_dictionaries(self) -> None:
+        path = self.directory / "dictionary.json"
+        temp_path = path.with_suffix(".tmp")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._dictionaries, f)
+        os.replace(temp_path, path)
+
+    def _segment_paths(self, partition: Partition) -> list[Path]:
+        return sorted((self.directory / partition.path).glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _open_segments(self, partition: Partition) -> list[Segment]:
+        segments = []
+
+        for path in self._segment_paths(partition):
+            try:
+                segments.append(Segment(path))
+            except (OSError, ValueError, struct.error) as e:
+                self.stats.errors += 1
+                logger.warning(f"Skipping unreadable price history segment {path}: {str(e)}")
+
+        return segments
+
+    def _next_name(self) -> str:
+        # Time-ordered and unique, so name order is append order
+        self._last_sequence = max(time.time_ns(), self._last_sequence + 1)
+        return f"{self._last_sequence:020d}{SEGMENT_SUFFIX}"
+
+    def _write_segment(self, partition: Partition, batch: ColumnBatch) -> int:
+        directory = self.directory / partition.path
+        directory.mkdir(parents=True, exist_ok=True)
+
+        if any(
+            batch.columns["scraped_at"][index] > batch.columns["scraped_at"][index + 1]
+            for index in range(len(batch) - 1)
+        ):
+            batch = self._sorted(batch)
+
+        Segment.write(directory / self._next_name(), batch)
+        self.stats.segments_written += 1
+        self.stats.rows_appended += len(batch)
+        return len(batch)
+
+    def _merge(self, segments: list[Segment]) -> ColumnBatch:
+        cutoff = time.time() - self.retention_days * 86400 if self.retention_days > 0 else None
+        merged = ColumnBatch()
+
+        try:
+            for segment in segments:
+                start = bisect_left(segment.columns["scraped_at"], cutoff) if cutoff else 0
+                self.stats.rows_expired += start
+                merged.extend(segment, start)
+        finally:
+            for segment in segments:
+                segment.close()
+
+        return merged
+
+    def _sorted(self, batch: ColumnBatch) -> ColumnBatch:
+        timestamps = batch.columns["scraped_at"]
+        order = sorted(range(len(batch)), key=timestamps.__getitem__)
+
+        ordered = ColumnBatch()
+        for name, typecode in COLUMNS:
+            column = batch.columns[name]
+            ordered.columns[name] = array(typecode, (column[index] for index in order))
+        return ordered
+
+    def _scan(
+        self,
+        segment: Segment,
+        since_ts: int,
+        accepts: tuple[int, int, int, int | None],
+        summary: PriceSummary,
+        days: dict[int, list[int]],
+        cheapest_code: int | None
+    ) -> int | None:
+        cabin, passengers, return_days, airline_code = accepts
+        start = bisect_left(segment.columns["scraped_at"], since_ts)
+        self.stats.rows_scanned += segment.rows - start
+
+        rows = zip(*(segment.columns[name][start:] for name in (
+            "scraped_at", "price", "airline", "cabin", "passengers", "return_days"
+        )))
+
+        for scraped_at, price, airline_value, cabin_value, passengers_value, return_value in rows:
+            if (
+                cabin_value != cabin
+                or passengers_value != passengers
+                or return_value != return_days
+                or (airline_code is not None and airline_value != airline_code)
+            ):
+                continue
+
+            summary.observations += 1
+            if summary.min_price is None or price < summary.min_price:
+                summary.min_price = price
+                cheapest_code = airline_value
+            if summary.max_price is None or price > summary.max_price:
+                summary.max_price = price
+
+            epoch_day = scraped_at // 86400
+            day = days.get(epoch_day)
+            if day is None:
+                days[epoch_day] = [price, price, 1, scraped_at, scraped_at]
+            else:
+                day[0] = min(day[0], price)
+                day[1] = max(day[1], price)
+                day[2] += 1
+                day[3] = min(day[3], scraped_at)
+                day[4] = max(day[4], scraped_at)
+
+        return cheapest_code
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.errors += 1
+            logger.error(f"Price history append failed: {str(task.exception())}")
+
+
+price_history = PriceHistoryStore()
@@ -1,17 +1,81 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from scraper.pool import browser_pool
+from scraper.page_pool import page_pool
+from scraper.cache import result_cache
+from scraper.singleflight import search_coalescer
+from scraper.admission import admission_controller
+from scraper.workers import worker_pool
+from scraper.blocking import request_blocker
+from scraper.assets import asset_cache
 from scraper.router import router as scraper_router
 from voice.router import router as voice_router
 from text.router import router as text_router
+from airports.router import router as airports_router
+from history.router import router as history_router
 from middleware import register_exception_handlers
+from profiling import PROFILING_ENABLED, ProfilingMiddleware
+from clients import create_openai_client
+from text.cache import extraction_cache
+from text.parser import query_parser
+from voice.cache import transcription_cache
+from airports.index import airport_index
+from history.store import price_history
+from metrics import registry, CONTENT_TYPE
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.openai_client = create_openai_client()
+    # In worker mode the browsers live in the worker processes
+    if worker_pool.enabled:
+        await worker_pool.start()
+    else:
+        await browser_pool.start()
+        await page_pool.start()
+    yield
+    await worker_pool.stop()
+    await page_pool.stop()
+    await browser_pool.stop()
+    await price_history.stop()
+    await app.state.openai_client.close()
+    extraction_cache.close()
+
 
 app = FastAPI(
     title="Flight Search API",
     description="API for voice and text-based flight search",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 register_exception_handlers(app)
 
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 app.include_router(scraper_router, prefix='/flights')
 app.include_router(voice_router, prefix='/flights')
 app.include_router(text_router, prefix='/flights')
+app.include_router(airports_router, prefix='/flights')
+app.include_router(history_router, prefix='/flights')
+
+registry.register_collector("browser_pool", browser_pool.snapshot)
+registry.register_collector("page_pool", page_pool.snapshot)
+registry.register_collector("result_cache", result_cache.snapshot)
+registry.register_collector("single_flight", search_coalescer.snapshot)
+registry.register_collector("admission_controller", admission_controller.snapshot)
+registry.register_collector("scrape_workers", worker_pool.snapshot)
+registry.register_collector("request_blocking", request_blocker.snapshot)
+registry.register_collector("asset_cache", asset_cache.snapshot)
+registry.register_collector("transcription_cache", transcription_cache.snapshot)
+registry.register_collector("extraction_cache", extraction_cache.snapshot)
+registry.register_collector("query_parser", query_parser.snapshot)
+registry.register_collector("airport_index", airport_index.snapshot)
+registry.register_collector("price_history", price_history.snapshot)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
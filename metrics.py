@@ -0,0 +1,359 @@
+import math
+import time
+
+from bisect import bisect_left
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, spanning a cache hit to a search that exhausts its retries
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Timer:
+    """Times a block or every call of a sync or async function."""
+
+    __slots__ = ("_observe", "_started")
+
+    def __init__(self, observe: Callable[[float], None]) -> None:
+        self._observe = observe
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._observe(time.perf_counter() - self._started)
+
+    def __call__(self, fn: Callable) -> Callable:
+        observe = self._observe
+
+        if iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - started)
+
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - started)
+
+        return wrapper
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def track_inprogress(self) -> "_InProgress":
+        return _InProgress(self)
+
+
+class _InProgress:
+    __slots__ = ("_gauge",)
+
+    def __init__(self, gauge: _GaugeChild) -> None:
+        self._gauge = gauge
+
+    def __enter__(self) -> None:
+        self._gauge.value += 1
+
+    def __exit__(self, *exc_info) -> None:
+        self._gauge.value -= 1
+
+    async def __aenter__(self) -> None:
+        self._gauge.value += 1
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._gauge.value -= 1
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: tuple[float, ...]) -> None:
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * len(upper_bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        # Counts are per bucket and only made cumulative when rendered
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> _Timer:
+        return _Timer(self.observe)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def labels(self, **labels: str) -> Any:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{line}\n" for line in self._samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+    def track_inprogress(self) -> _InProgress:
+        return self._children[()].track_inprogress()
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.upper_bounds = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def time(self, **labels: str) -> _Timer:
+        return self.labels(**labels).time()
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds, child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+class MetricsRegistry:
+    """
+    Holds the process metrics and renders them in the Prometheus text format.
+
+    Metrics are updated from the event loop thread only, so children are
+    plain attributes without locks. Components that already keep stats
+    (pools, caches) are exported through collectors that read their
+    `snapshot()` at scrape time instead of adding work to the hot path.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self._metrics: list[_Metric] = []
+        self._collectors: list[tuple[str, Callable[[], dict[str, Any]]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets))
+
+    def register_collector(self, component: str, snapshot: Callable[[], dict[str, Any]]) -> None:
+        self._collectors.append((component, snapshot))
+
+    def render(self) -> str:
+        parts = [metric.render() for metric in self._metrics]
+
+        for component, snapshot in self._collectors:
+            for key, value in snapshot().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{self.namespace}_{component}_{key}"
+                parts.append(
+                    f"# HELP {name} {key.replace('_', ' ')} reported by {component}\n"
+                    f"# TYPE {name} untyped\n{name} {_format_value(value)}\n"
+                )
+
+        return "".join(parts)
+
+    def _add(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+
+registry = MetricsRegistry("flights")
+
+SEARCH_STAGE_SECONDS = registry.histogram(
+    "stage_duration_seconds",
+    "Time spent in each stage of a search, transcription or extraction",
+    ["stage"],
+)
+SEARCH_DURATION_SECONDS = registry.histogram(
+    "scrape_duration_seconds",
+    "End to end time of a scrape, retries included",
+    ["outcome"],
+)
+SEARCH_IDLE_SAVED_SECONDS = registry.histogram(
+    "search_idle_saved_seconds",
+    "Idle time per search avoided by readiness waits over the fixed sleeps they replace",
+)
+SEARCH_BLOCKED_REQUESTS = registry.histogram(
+    "search_blocked_requests",
+    "Requests aborted by context-level blocking per search",
+    buckets=(0, 5, 10, 25, 50, 100, 250, 500),
+)
+SEARCH_TRANSFERRED_BYTES = registry.histogram(
+    "search_transferred_bytes",
+    "Bytes the results document transferred per search",
+    buckets=(64e3, 256e3, 1e6, 2.5e6, 5e6, 10e6, 25e6),
+)
+SEARCH_RETRIES = registry.counter(
+    "scrape_retries_total",
+    "Scrapes moved to a fresh page after theirs became unusable",
+    ["error"],
+)
+STAGE_RETRIES = registry.counter(
+    "stage_retries_total",
+    "Search stages retried in place on the same page",
+    ["stage"],
+)
+STAGE_TIME_LOST_SECONDS = registry.counter(
+    "stage_time_lost_seconds_total",
+    "Time spent in failed stage attempts and the backoff between them",
+    ["stage"],
+)
+SEARCHES_IN_FLIGHT = registry.gauge(
+    "scrapes_in_flight",
+    "Scrapes currently running",
+)
+ADMISSION_LIMIT = registry.gauge(
+    "admission_concurrency_limit",
+    "Scrapes the admission controller currently lets run at once",
+)
+ADMISSION_QUEUE_DEPTH = registry.gauge(
+    "admission_queue_depth",
+    "Scrapes waiting for an admission slot",
+)
+ADMISSION_WAIT_SECONDS = registry.histogram(
+    "admission_wait_seconds",
+    "Time admitted scrapes spent waiting for a slot",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total",
+    "Scrapes shed with 429 by the admission controller",
+    ["reason"],
+)
+API_ERRORS = registry.counter(
+    "api_errors_total",
+    "Errors turned into responses by the exception handlers",
+    ["error"],
+)
@@ -15,8 +15,11 @@ from text.errors import EmptyTextInputError
 from scraper.errors import (
     NoFlightsFoundError,
     AdultPerInfantsOnLapError,
+    SearchOverloadedError,
 )
 
+from metrics import API_ERRORS
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,7 +27,8 @@ def create_error_handler(
     error_name: str,
     status_code: int,
     log_message: str,
-    log_level: str = "error"
+    log_level: str = "error",
+    headers: Callable[[Exception], dict[str, str]] | None = None
 ) -> Callable:
     """
     Factory function to create error handlers with consistent structure.
@@ -34,11 +38,16 @@ def create_error_handler(
         status_code: HTTP status code to return
         log_message: Message template for logging (will be formatted with exception)
         log_level: Logging level to use ("warning", "error", or "exception")
+        headers: Optional function building extra response headers from the exception
     
     Returns:
         An async error handler function
     """
+    # Resolved up front so every handled error type is exported, even at zero
+    errors = API_ERRORS.labels(error=error_name)
+
     async def error_handler(request: Request, exc: Exception) -> JSONResponse:
+        errors.inc()
         log_func = getattr(logger, log_level)
         log_func(f"{log_message}: {str(exc)}")
         
@@ -47,7 +56,8 @@ def create_error_handler(
             content={
                 "error": error_name,
                 "detail": str(exc)
-            }
+            },
+            headers=headers(exc) if headers is not None else None
         )
     
     return error_handler
@@ -102,6 +112,14 @@ adult_per_infants_on_lap_error_handler = create_error_handler(
     log_level="error"
 )
 
+search_overloaded_error_handler = create_error_handler(
+    error_name="SearchOverloaded",
+    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+    log_message="Search rejected by admission control",
+    log_level="warning",
+    headers=lambda exc: {"Retry-After": str(exc.retry_after)}
+)
+
 
 empty_text_input_error_handler = create_error_handler(
     error_name="EmptyTextInputError",
@@ -111,9 +129,13 @@ empty_text_input_error_handler = create_error_handler(
 )
 
 
+internal_errors = API_ERRORS.labels(error="InternalServerError")
+
+
 async def general_exception_handler(
     request: Request, exc: Exception
 ) -> JSONResponse:
+    internal_errors.inc()
     logger.exception(f"Unexpected error: {str(exc)}")
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -132,6 +154,7 @@ def register_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(VoiceRecognitionError, voice_recognition_error_handler)
     app.add_exception_handler(NoFlightsFoundError, no_flights_found_error_handler)
     app.add_exception_handler(AdultPerInfantsOnLapError, adult_per_infants_on_lap_error_handler)
+    app.add_exception_handler(SearchOverloadedError, search_overloaded_error_handler)
     app.add_exception_handler(EmptyTextInputError, empty_text_input_error_handler)
 
     app.add_exception_handler(Exception, general_exception_handler)
@@ -0,0 +1,270 @@
+import asyncio
+import gc
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from dotenv import load_dotenv
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from logging_config import get_logger
+
+load_dotenv()
+
+# The middleware is only installed when enabled, so requests pay nothing otherwise
+PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_HEADER: str = os.getenv("PROFILING_HEADER", "X-Profile")
+# Internal use only: PROFILING_HEADER must carry this secret to force a profile,
+# and is ignored while it is empty, so clients can't ask for sampling themselves
+PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+PROFILING_ID_HEADER = "X-Profile-Id"
+PROFILING_DIR: str = os.getenv("PROFILING_DIR", ".cache/profiles")
+PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "1"))
+PROFILING_MAX_ARTIFACTS: int = int(os.getenv("PROFILING_MAX_ARTIFACTS", "200"))
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+_CPU_ROOT = ("[cpu]", "", 0)
+_AWAIT_ROOT = ("[await]", "", 0)
+_MAX_DEPTH = 256
+
+logger = get_logger("profiling")
+
+FrameKey = tuple[str, str, int]
+
+
+def _frame_key(frame: FrameType) -> FrameKey:
+    code = frame.f_code
+    return (code.co_qualname, code.co_filename, code.co_firstlineno)
+
+
+class TaskSampler:
+    """
+    Samples the stack of one asyncio task from a background thread.
+
+    While the task is running on the event loop thread the sample is its
+    live Python stack, rooted under "[cpu]". While it is suspended the
+    sample is the chain of coroutines it is awaiting, followed into child
+    tasks and `gather` children, rooted under "[await]". Together they
+    account for the request's wall time.
+    """
+
+    def __init__(self, task: asyncio.Task, interval_ms: float = PROFILING_INTERVAL_MS) -> None:
+        self.task = task
+        self.interval = interval_ms / 1000
+        self.samples: dict[tuple[FrameKey, ...], float] = {}
+        self.sample_count = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+        self._loop_thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        last = self.started
+
+        while not self._stop.wait(self.interval):
+            # Weighted by the time since the previous sample, since a
+            # CPU-bound loop thread holds the GIL and delays this one
+            now = time.perf_counter()
+            stack = self._task_stack()
+            if stack is not None:
+                self.samples[stack] = self.samples.get(stack, 0.0) + now - last
+                self.sample_count += 1
+            last = now
+
+    def _task_stack(self) -> tuple[FrameKey, ...] | None:
+        frames: list[FrameKey] = []
+        awaitable: Any = self.task.get_coro()
+
+        # The loop thread keeps mutating these objects, so any inconsistent
+        # read just drops the sample
+        for _ in range(_MAX_DEPTH):
+            if isinstance(awaitable, asyncio.Task):
+                awaitable = awaitable.get_coro()
+                continue
+
+            if isinstance(awaitable, asyncio.Future):
+                children = getattr(awaitable, "_children", None) or ()
+                awaitable = next((child for child in children if not child.done()), None)
+                if awaitable is None:
+                    break
+                continue
+
+            if not hasattr(awaitable, "cr_frame") and not hasattr(awaitable, "gi_frame"):
+                # C futures are awaited through an iterator that only exposes
+                # its future to the garbage collector
+                awaitable = next(
+                    (ref for ref in gc.get_referents(awaitable) if isinstance(ref, asyncio.Future)),
+                    None
+                )
+                if awaitable is None:
+                    break
+                continue
+
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                break
+
+            if getattr(awaitable, "cr_running", False) or getattr(awaitable, "gi_running", False):
+                live = self._live_stack(frame)
+                return (_CPU_ROOT, *frames, *live) if live is not None else None
+
+            frames.append(_frame_key(frame))
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+
+        return (_AWAIT_ROOT, *frames) if frames else None
+
+    def _live_stack(self, root: FrameType) -> list[FrameKey] | None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = []
+
+        while frame is not None:
+            stack.append(_frame_key(frame))
+            if frame is root:
+                stack.reverse()
+                return stack
+            frame = frame.f_back
+
+        return None
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        frames: list[FrameKey] = []
+        indexes: dict[FrameKey, int] = {}
+        samples, weights = [], []
+
+        for stack, seconds in self.samples.items():
+            sample = []
+            for key in stack:
+                if key not in indexes:
+                    indexes[key] = len(frames)
+                    frames.append(key)
+                sample.append(indexes[key])
+            samples.append(sample)
+            weights.append(round(seconds * 1000, 3))
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "flight-searcher-api",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": function, "file": file, "line": line} if file else {"name": function}
+                    for function, file, line in frames
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(self.elapsed * 1000, 3),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that send `PROFILING_HEADER: <token>`, plus a random
+    `sample_rate` share of all requests, and writes a speedscope profile
+    to `directory` from a worker thread. The artifact ID is returned in
+    `X-Profile-Id`. The header is meant for operators only: without a
+    `token` configured it is ignored.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str = PROFILING_DIR,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+        header: str = PROFILING_HEADER,
+        token: str = PROFILING_TOKEN,
+        interval_ms: float = PROFILING_INTERVAL_MS,
+        max_artifacts: int = PROFILING_MAX_ARTIFACTS,
+    ) -> None:
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.header = header.lower().encode("latin-1")
+        self.token = token.encode("latin-1")
+        self.interval_ms = interval_ms
+        self.max_artifacts = max_artifacts
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        id_header = (PROFILING_ID_HEADER.lower().encode("latin-1"), profile_id.encode("latin-1"))
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), id_header]}
+            await send(message)
+
+        sampler = TaskSampler(asyncio.current_task(), self.interval_ms)
+        sampler.start()
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            await asyncio.to_thread(self._write, profile_id, f"{scope['method']} {scope['path']}", sampler)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == self.header:
+                    return hmac.compare_digest(value, self.token)
+
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _write(self, profile_id: str, name: str, sampler: TaskSampler) -> None:
+        path = self.directory / f"{profile_id}.speedscope.json"
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(sampler.to_speedscope(name)))
+            self._prune()
+        except OSError as e:
+            logger.warning(f"Failed to write profile {profile_id}: {str(e)}")
+            return
+
+        logger.info(
+            f"Profiled {name} in {sampler.elapsed * 1000:.1f} ms "
+            f"({sampler.sample_count} samples) -> {path}"
+        )
+
+    def _prune(self) -> None:
+        artifacts = sorted(
+            self.directory.glob("*.speedscope.json"),
+            key=lambda artifact: artifact.stat().st_mtime
+        )
+
+        for artifact in artifacts[:max(0, len(artifacts) - self.max_artifacts)]:
+            artifact.unlink(missing_ok=True)
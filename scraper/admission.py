@@ -0,0 +1,307 @@
+import asyncio
+import math
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator
+
+from .errors import AdultPerInfantsOnLapError, NoFlightsFoundError, SearchOverloadedError
+from .constants.settings import (
+    ADMISSION_INITIAL_CONCURRENCY,
+    ADMISSION_MIN_CONCURRENCY,
+    ADMISSION_MAX_CONCURRENCY,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ADMISSION_TARGET_LATENCY_SECONDS,
+    ADMISSION_MAX_ERROR_RATE,
+    ADMISSION_MIN_AVAILABLE_MEMORY,
+    ADMISSION_DECREASE_FACTOR,
+    ADMISSION_DECREASE_COOLDOWN_SECONDS,
+)
+from logging_config import get_logger
+from metrics import (
+    ADMISSION_LIMIT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_WAIT_SECONDS,
+    ADMISSION_REJECTED
+)
+
+logger = get_logger("scraper")
+
+MEMINFO_PATH = "/proc/meminfo"
+MEMORY_CHECK_INTERVAL_SECONDS = 1.0
+MAX_RETRY_AFTER_SECONDS = 120
+
+# Outcomes of the search itself, which say nothing about the host's load
+_NEUTRAL_ERRORS = (AdultPerInfantsOnLapError, NoFlightsFoundError)
+# Weight of the latest scrape in the latency and error rate averages
+_SMOOTHING = 0.2
+
+
+def available_memory_ratio(path: str = MEMINFO_PATH) -> float | None:
+    """
+    Share of host memory still available, from MemAvailable / MemTotal.
+    Returns None where /proc/meminfo can't be read (e.g. outside Linux).
+    """
+    fields = {}
+
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("MemTotal", "MemAvailable"):
+                    fields[name] = int(value.split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    if not fields.get("MemTotal") or "MemAvailable" not in fields:
+        return None
+
+    return fields["MemAvailable"] / fields["MemTotal"]
+
+
+@dataclass(slots=True)
+class AdmissionStats:
+    admitted: int = 0
+    queued: int = 0
+    rejected_queue_full: int = 0
+    rejected_queue_timeout: int = 0
+    increases: int = 0
+    decreases: int = 0
+    memory_pressure: int = 0
+
+
+class AdmissionController:
+    """
+    Bounds how many browser-backed scrapes run at once.
+
+    Scrapes over the concurrency limit wait in a FIFO queue of at most
+    `max_queue`; past that, or after waiting `queue_timeout` seconds, they
+    are rejected with SearchOverloadedError carrying a Retry-After estimate.
+    The limit follows AIMD: it grows by one slot per limit's worth of
+    healthy completions while the controller is saturated, and is cut by
+    `decrease_factor` (at most once per cooldown) when a scrape runs past
+    `target_latency`, the smoothed error rate exceeds `max_error_rate`, or
+    available host memory drops under `min_available_memory`.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = ADMISSION_INITIAL_CONCURRENCY,
+        min_limit: int = ADMISSION_MIN_CONCURRENCY,
+        max_limit: int = ADMISSION_MAX_CONCURRENCY,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        target_latency: float = ADMISSION_TARGET_LATENCY_SECONDS,
+        max_error_rate: float = ADMISSION_MAX_ERROR_RATE,
+        min_available_memory: float = ADMISSION_MIN_AVAILABLE_MEMORY,
+        decrease_factor: float = ADMISSION_DECREASE_FACTOR,
+        decrease_cooldown: float = ADMISSION_DECREASE_COOLDOWN_SECONDS,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.min_available_memory = min_available_memory
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.stats = AdmissionStats()
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._latency: float | None = None
+        self._error_rate = 0.0
+        self._last_decrease = -math.inf
+        self._memory: float | None = None
+        self._memory_checked = -math.inf
+
+        ADMISSION_LIMIT.set(self.slots)
+
+    @property
+    def slots(self) -> int:
+        return int(self.limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self._acquire()
+
+        started = time.monotonic()
+        failed = False
+        sample = True
+
+        try:
+            yield
+        except _NEUTRAL_ERRORS:
+            raise
+        except asyncio.CancelledError:
+            # The caller went away, which says nothing about the scrape
+            sample = False
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._in_flight -= 1
+            if sample:
+                self._observe(time.monotonic() - started, failed)
+            self._wake()
+
+    def retry_after(self) -> int:
+        # Rough time until the queue ahead drains at the current limit
+        latency = self._latency if self._latency is not None else self.target_latency / 2
+        waves = (len(self._waiters) + 1) / self.slots
+        return max(1, min(math.ceil(latency * waves), MAX_RETRY_AFTER_SECONDS))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "limit": round(self.limit, 2),
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "latency_seconds": round(self._latency, 3) if self._latency is not None else None,
+            "error_rate": round(self._error_rate, 4),
+            "available_memory": round(self._memory, 4) if self._memory is not None else None,
+        }
+
+    async def _acquire(self) -> None:
+        self._check_memory()
+
+        if not self._waiters and self._in_flight < self.slots:
+            self._in_flight += 1
+            self.stats.admitted += 1
+            ADMISSION_WAIT_SECONDS.observe(0)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats.queued += 1
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+        queued = time.monotonic()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except BaseException as e:
+            handed_slot = waiter.done() and not waiter.cancelled()
+
+            if isinstance(e, TimeoutError) and handed_slot:
+                # A slot was handed over just as the wait ran out
+                pass
+            else:
+                if handed_slot:
+                    self._in_flight -= 1
+                    self._wake()
+                else:
+                    waiter.cancel()
+                    self._remove_waiter(waiter)
+
+                if isinstance(e, TimeoutError):
+                    self._reject("queue_timeout")
+                raise
+
+        self.stats.admitted += 1
+        ADMISSION_WAIT_SECONDS.observe(time.monotonic() - queued)
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.slots:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+
+            # The slot is taken on the waiter's behalf so nobody can jump the queue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+
+    def _reject(self, reason: str) -> None:
+        retry_after = self.retry_after()
+
+        if reason == "queue_full":
+            self.stats.rejected_queue_full += 1
+        else:
+            self.stats.rejected_queue_timeout += 1
+        ADMISSION_REJECTED.labels(reason=reason).inc()
+
+        logger.warning(
+            f"Rejected search ({reason}): {self._in_flight} running, "
+            f"{len(self._waiters)} queued, limit {self.slots}, retry after {retry_after}s"
+        )
+        raise SearchOverloadedError(
+            "Too many searches in progress, try again later",
+            retry_after=retry_after
+        )
+
+    def _observe(self, latency: float, failed: bool) -> None:
+        saturated = bool(self._waiters) or self._in_flight + 1 >= self.slots
+
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += _SMOOTHING * (latency - self._latency)
+        self._error_rate += _SMOOTHING * (float(failed) - self._error_rate)
+
+        if latency > self.target_latency:
+            self._decrease(f"scrape took {latency:.1f}s")
+        elif self._error_rate > self.max_error_rate:
+            self._decrease(f"error rate {self._error_rate:.0%}")
+        elif not failed and saturated:
+            self._increase()
+
+    def _check_memory(self) -> None:
+        now = time.monotonic()
+        if now - self._memory_checked < MEMORY_CHECK_INTERVAL_SECONDS:
+            return
+
+        self._memory_checked = now
+        self._memory = available_memory_ratio()
+
+        if self._memory is not None and self._memory < self.min_available_memory:
+            self.stats.memory_pressure += 1
+            self._decrease(f"{self._memory:.0%} of memory available")
+
+    def _increase(self) -> None:
+        if self.limit >= self.max_limit:
+            return
+
+        previous = self.slots
+        self.limit = min(self.limit + 1 / self.slots, float(self.max_limit))
+
+        if self.slots > previous:
+            self.stats.increases += 1
+            ADMISSION_LIMIT.set(self.slots)
+            logger.info(f"Raised search concurrency limit to {self.slots}")
+            self._wake()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown or self.limit <= self.min_limit:
+            return
+
+        previous = self.slots
+        self._last_decrease = now
+        self.limit = max(self.limit * self.decrease_factor, float(self.min_limit))
+        self.stats.decreases += 1
+
+        if self.slots < previous:
+            ADMISSION_LIMIT.set(self.slots)
+            logger.warning(f"Lowered search concurrency limit to {self.slots}: {reason}")
+
+
+admission_controller = AdmissionController()
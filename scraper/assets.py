@@ -0,0 +1,351 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import APIResponse, BrowserContext, Route
+
+from .constants.settings import (
+    ASSET_CACHE_URL_PATTERN,
+    ASSET_CACHE_MAX_ENTRIES,
+    ASSET_CACHE_MAX_BYTES,
+    ASSET_CACHE_MAX_ENTRY_BYTES,
+    ASSET_CACHE_TTL_SECONDS,
+    ASSET_CACHE_DIR,
+    ASSET_CACHE_DISK_MAX_ENTRIES,
+    ASSET_CACHE_REPLAY,
+)
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+# Describe the connection or the original encoding, not the decoded body we replay
+_DROPPED_HEADERS = frozenset({
+    "connection",
+    "content-encoding",
+    "content-length",
+    "date",
+    "keep-alive",
+    "set-cookie",
+    "transfer-encoding",
+})
+_SAFE_VARY = frozenset({"accept-encoding", "origin"})
+_MAX_AGE = re.compile(r"(?:^|,)\s*(?:s-maxage|max-age)\s*=\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class AssetCacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    stored: int = 0
+    uncacheable: int = 0
+    evictions: int = 0
+    disk_evictions: int = 0
+    errors: int = 0
+    bytes_served: int = 0
+    bytes_fetched: int = 0
+
+
+@dataclass(slots=True)
+class CachedAsset:
+    url: str
+    status: int
+    headers: dict[str, str]
+    expires_at: float
+    body: bytes = field(default=b"", repr=False)
+
+    def fresh(self, now: float) -> bool:
+        return self.expires_at > now
+
+    def validators(self) -> dict[str, str]:
+        validators = {}
+        if "etag" in self.headers:
+            validators["if-none-match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            validators["if-modified-since"] = self.headers["last-modified"]
+        return validators
+
+
+def freshness_seconds(headers: dict[str, str], max_ttl: int) -> int | None:
+    """
+    How long a response may be served without revalidation, capped at
+    `max_ttl`. Returns None when it must not be stored at all.
+    """
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return None
+
+    vary = {value.strip().lower() for value in headers.get("vary", "").split(",") if value.strip()}
+    if not vary <= _SAFE_VARY:
+        return None
+
+    if "no-cache" in cache_control:
+        return 0
+
+    match = _MAX_AGE.search(cache_control)
+    return min(int(match.group(1)), max_ttl) if match else max_ttl
+
+
+class AssetCache:
+    """
+    Shares static JS/CSS bundles across browser contexts.
+
+    Each context routes URLs matching `pattern` through `handle`, which
+    serves fresh entries with `route.fulfill` and fetches the rest through
+    `route.fetch`, storing responses their Cache-Control allows. Stale
+    entries are revalidated with their ETag / Last-Modified, and a 304
+    only renews them. The memory tier is an LRU bounded by entry count and
+    body bytes. When `directory` is set, entries are also written there as
+    `<key>.json` plus `<key>.body`; that tier is read and written in a
+    worker thread, off the event loop. With `replay` the directory is
+    served as is: entries never expire, nothing is written, and misses go
+    to the network, so recorded assets can back offline runs.
+    """
+
+    def __init__(
+        self,
+        pattern: str = ASSET_CACHE_URL_PATTERN,
+        max_entries: int = ASSET_CACHE_MAX_ENTRIES,
+        max_bytes: int = ASSET_CACHE_MAX_BYTES,
+        max_entry_bytes: int = ASSET_CACHE_MAX_ENTRY_BYTES,
+        ttl_seconds: int = ASSET_CACHE_TTL_SECONDS,
+        directory: str = ASSET_CACHE_DIR,
+        disk_max_entries: int = ASSET_CACHE_DISK_MAX_ENTRIES,
+        replay: bool = ASSET_CACHE_REPLAY,
+    ) -> None:
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl_seconds = ttl_seconds
+        self.directory = Path(directory) if directory else None
+        self.disk_max_entries = disk_max_entries
+        self.replay = replay
+        self.stats = AssetCacheStats()
+
+        self._entries: OrderedDict[str, CachedAsset] = OrderedDict()
+        self._bytes = 0
+        self._disk_entries: int | None = None
+        # Writes (and the pruning they trigger) go one at a time
+        self._disk_lock = asyncio.Lock()
+
+    async def install(self, context: BrowserContext) -> None:
+        await context.route(self.pattern, self.handle)
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        if request.method != "GET":
+            await route.fallback()
+            return
+
+        asset = await self.get(request.url)
+        now = time.time()
+
+        if asset is not None and (self.replay or asset.fresh(now)):
+            self.stats.hits += 1
+            await self._fulfill(route, asset)
+            return
+
+        if self.replay:
+            self.stats.misses += 1
+            await route.fallback()
+            return
+
+        headers = {**request.headers, **asset.validators()} if asset is not None else None
+
+        try:
+            response = await route.fetch(headers=headers)
+            body = b"" if response.status == 304 else await response.body()
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Asset fetch failed for {request.url}: {str(e)}")
+
+            if asset is not None:
+                # A stale copy beats a failed navigation
+                await self._fulfill(route, asset)
+            else:
+                await route.fallback()
+            return
+
+        if response.status == 304 and asset is not None:
+            self.stats.revalidated += 1
+            ttl = freshness_seconds({**asset.headers, **response.headers}, self.ttl_seconds)
+            asset.expires_at = now + (ttl or 0)
+            await self._fulfill(route, asset)
+            await self.put(asset)
+            return
+
+        self.stats.misses += 1
+        self.stats.bytes_fetched += len(body)
+
+        fetched = self._from_response(request.url, response, body, now)
+        if fetched is None:
+            self.stats.uncacheable += 1
+            await route.fulfill(response=response, body=body)
+            return
+
+        await self._fulfill(route, fetched)
+        await self.put(fetched)
+
+    async def get(self, url: str) -> CachedAsset | None:
+        asset = self._entries.get(url)
+        if asset is not None:
+            self._entries.move_to_end(url)
+            return asset
+
+        if self.directory is None:
+            return None
+
+        asset = await asyncio.to_thread(self._read_disk, url)
+        if asset is not None:
+            self.stats.disk_hits += 1
+            self._store_memory(asset)
+
+        return asset
+
+    async def put(self, asset: CachedAsset) -> None:
+        self._store_memory(asset)
+        if self.replay or self.directory is None:
+            return
+
+        async with self._disk_lock:
+            await asyncio.to_thread(self._write_disk, asset)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.stats.hits + self.stats.revalidated + self.stats.misses
+        return {
+            **asdict(self.stats),
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hit_rate": round((self.stats.hits + self.stats.revalidated) / lookups, 4) if lookups else 0.0,
+            "disk_entries": self._disk_entries if self.directory else None,
+        }
+
+    async def _fulfill(self, route: Route, asset: CachedAsset) -> None:
+        self.stats.bytes_served += len(asset.body)
+        await route.fulfill(status=asset.status, headers=asset.headers, body=asset.body)
+
+    def _from_response(
+        self,
+        url: str,
+        response: APIResponse,
+        body: bytes,
+        now: float
+    ) -> CachedAsset | None:
+        if response.status != 200 or len(body) > self.max_entry_bytes:
+            return None
+
+        headers = {
+            name.lower(): value
+            for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+
+        ttl = freshness_seconds(headers, self.ttl_seconds)
+        if ttl is None:
+            return None
+
+        self.stats.stored += 1
+        return CachedAsset(url=url, status=response.status, headers=headers, expires_at=now + ttl, body=body)
+
+    def _store_memory(self, asset: CachedAsset) -> None:
+        size = len(asset.body)
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(asset.url, None)
+        if previous is not None:
+            self._bytes -= len(previous.body)
+
+        self._entries[asset.url] = asset
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self.stats.evictions += 1
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _read_disk(self, url: str) -> CachedAsset | None:
+        if self.directory is None:
+            return None
+
+        key = self._key(url)
+
+        try:
+            with open(self.directory / f"{key}.json", "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            body = (self.directory / f"{key}.body").read_bytes()
+            return CachedAsset(**metadata, body=body)
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, json.JSONDecodeError) as e:
+            self.stats.errors += 1
+            logger.warning(f"Asset cache read failed: {str(e)}")
+            return None
+
+    def _write_disk(self, asset: CachedAsset) -> None:
+        if self.directory is None:
+            return
+
+        key = self._key(asset.url)
+        metadata_path = self.directory / f"{key}.json"
+        body_path = self.directory / f"{key}.body"
+        metadata = asdict(asset)
+        del metadata["body"]
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            existed = metadata_path.exists()
+
+            # Body first, then metadata, each written then renamed, so a
+            # reader that finds the metadata always finds a whole body
+            body_temp_path = self.directory / f"{key}.body.tmp"
+            body_temp_path.write_bytes(asset.body)
+            os.replace(body_temp_path, body_path)
+
+            metadata_temp_path = self.directory / f"{key}.json.tmp"
+            with open(metadata_temp_path, "w", encoding="utf-8") as f:
+                json.dump(metadata, f)
+            os.replace(metadata_temp_path, metadata_path)
+
+            if self._disk_entries is None:
+                self._disk_entries = sum(1 for _ in self.directory.glob("*.json"))
+            elif not existed:
+                self._disk_entries += 1
+
+            if self._disk_entries > self.disk_max_entries:
+                self._prune_disk()
+        except OSError as e:
+            self.stats.errors += 1
+            logger.warning(f"Asset cache write failed: {str(e)}")
+
+    def _prune_disk(self) -> None:
+        # Prune down to 90% of the limit so the directory isn't rescanned on every write
+        files = sorted(self.directory.glob("*.json"), key=lambda file: file.stat().st_mtime)
+        overflow = max(len(files) - int(self.disk_max_entries * 0.9), 0)
+
+        for file in files[:overflow]:
+            file.unlink(missing_ok=True)
+            file.with_suffix(".body").unlink(missing_ok=True)
+            self.stats.disk_evictions += 1
+
+        self._disk_entries = len(files) - overflow
+
+
+asset_cache = AssetCache()
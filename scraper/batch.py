@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+from .models import (
+    SearchParams,
+    BatchSearchItem,
+    BatchSearchResponse
+)
+from .scraper import search_flights
+from .utils import elapsed_ms
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+
+async def run_searches(
+    searches: list[SearchParams],
+    concurrency: int,
+    timeout: float | None = None
+) -> list[BatchSearchItem]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, params: SearchParams) -> BatchSearchItem:
+        queued = time.perf_counter()
+
+        async with semaphore:
+            queued_ms = elapsed_ms(queued)
+            started = time.perf_counter()
+
+            try:
+                flights = await asyncio.wait_for(search_flights(params), timeout)
+            except TimeoutError:
+                logger.warning(f"Search {index} timed out after {timeout}s")
+                return BatchSearchItem(
+                    index=index,
+                    status="timeout",
+                    error="SearchTimeout",
+                    detail=f"Search did not finish within {timeout} seconds",
+                    queued_ms=queued_ms,
+                    elapsed_ms=elapsed_ms(started),
+                )
+            except Exception as e:
+                logger.warning(f"Search {index} failed: {type(e).__name__}: {str(e)}")
+                return BatchSearchItem(
+                    index=index,
+                    status="error",
+                    error=type(e).__name__,
+                    detail=str(e),
+                    queued_ms=queued_ms,
+                    elapsed_ms=elapsed_ms(started),
+                )
+
+            return BatchSearchItem(
+                index=index,
+                status="ok",
+                flights=flights,
+                queued_ms=queued_ms,
+                elapsed_ms=elapsed_ms(started),
+            )
+
+    return await asyncio.gather(
+        *(run_one(index, params) for index, params in enumerate(searches))
+    )
+
+
+async def run_batch_search(
+    searches: list[SearchParams],
+    concurrency: int
+) -> BatchSearchResponse:
+    logger.info(f"Running batch of {len(searches)} searches with concurrency {concurrency}")
+
+    started = time.perf_counter()
+    results = await run_searches(searches, concurrency)
+    failed = sum(1 for item in results if item.status != "ok")
+
+    return BatchSearchResponse(
+        results=results,
+        succeeded=len(results) - failed,
+        failed=failed,
+        wall_time_ms=elapsed_ms(started),
+    )
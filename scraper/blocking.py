@@ -0,0 +1,97 @@
+import re
+
+from dataclasses import dataclass, field, asdict
+from typing import Any, Iterable
+from weakref import WeakKeyDictionary
+
+from playwright.async_api import BrowserContext, Page, Route
+
+from .constants.settings import BLOCKED_DOMAINS, BLOCKED_EXTENSIONS
+from .constants.scripts import TRANSFERRED_BYTES_SCRIPT
+from .trace import record_traffic
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+
+def compile_block_pattern(domains: Iterable[str], extensions: Iterable[str]) -> re.Pattern:
+    """
+    Builds one pattern matching URLs whose host contains any of `domains`
+    or whose path, before any query or fragment, ends in any of
+    `extensions`. It has to stay within the regex syntax JavaScript shares
+    with Python, since Playwright evaluates it in the driver.
+    """
+    hosts = "|".join(re.escape(domain) for domain in domains)
+    suffixes = "|".join(re.escape(extension.lstrip(".")) for extension in extensions)
+    return re.compile(
+        rf"^[a-z][a-z0-9+.-]*://[^/?#]*(?:{hosts})|^[^?#]*\.(?:{suffixes})(?:[?#]|$)",
+        re.IGNORECASE
+    )
+
+
+BLOCKED_URL_PATTERN = compile_block_pattern(BLOCKED_DOMAINS, BLOCKED_EXTENSIONS)
+
+
+@dataclass(slots=True)
+class RequestBlockingStats:
+    blocked: int = 0
+    searches: int = 0
+    transferred_bytes: int = 0
+    blocked_by_type: dict[str, int] = field(default_factory=dict)
+
+
+class RequestBlocker:
+    """
+    Aborts tracking, image, font and media requests for whole browser
+    contexts.
+
+    The route is registered with a compiled pattern, so Playwright matches
+    URLs in its driver and only blocked requests are handed to Python;
+    allowed requests never leave the browser. Images are also switched off
+    in Blink (see BROWSER_ARGS), so most of them are never requested.
+    """
+
+    def __init__(self, pattern: re.Pattern = BLOCKED_URL_PATTERN) -> None:
+        self.pattern = pattern
+        self.stats = RequestBlockingStats()
+        self._blocked: WeakKeyDictionary[BrowserContext, int] = WeakKeyDictionary()
+
+    async def install(self, context: BrowserContext) -> None:
+        self._blocked[context] = 0
+        await context.route(self.pattern, lambda route: self._abort(context, route))
+
+    async def record_search(self, page: Page) -> None:
+        """
+        Adds the blocked requests of the page's context and the bytes its
+        current document transferred to the search trace and the totals.
+        """
+        blocked = self._blocked.get(page.context, 0)
+
+        try:
+            transferred = int(await page.evaluate(TRANSFERRED_BYTES_SCRIPT))
+        except Exception as e:
+            logger.warning(f"Failed to read transferred bytes: {str(e)}")
+            transferred = 0
+
+        self.stats.searches += 1
+        self.stats.transferred_bytes += transferred
+        record_traffic(blocked, transferred)
+
+    def snapshot(self) -> dict[str, Any]:
+        stats = asdict(self.stats)
+        by_type = stats.pop("blocked_by_type")
+        return {
+            **stats,
+            **{f"blocked_{resource_type}": count for resource_type, count in by_type.items()},
+        }
+
+    async def _abort(self, context: BrowserContext, route: Route) -> None:
+        resource_type = route.request.resource_type
+        self.stats.blocked += 1
+        self.stats.blocked_by_type[resource_type] = self.stats.blocked_by_type.get(resource_type, 0) + 1
+        self._blocked[context] = self._blocked.get(context, 0) + 1
+
+        await route.abort("blockedbyclient")
+
+
+request_blocker = RequestBlocker()
@@ -1,24 +1,24 @@
-from playwright.async_api import Playwright, BrowserContext, Page, Route
-import os
+from playwright.async_api import Playwright, Browser, BrowserContext, Page
 from .constants.settings import (
+    BRAVE_EXECUTABLE_PATH,
     BROWSER_ARGS, 
     USER_AGENT, 
-    FLIGHTS_PAGE_URL, 
-    BLOCKED_DOMAINS, 
-    BLOCKED_EXTENSIONS
+    FLIGHTS_PAGE_URL,
+    ASSET_CACHE_ENABLED
 )
+from .assets import asset_cache
+from .blocking import request_blocker
+from metrics import SEARCH_STAGE_SECONDS
 
 
-async def create_browser_instance(playwright: Playwright) -> BrowserContext:
-    brave_path = os.getenv(
-        "BRAVE_EXECUTABLE_PATH", 
-        "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
-    )
-    
+async def launch_browser(
+    playwright: Playwright,
+    executable_path: str | None = BRAVE_EXECUTABLE_PATH
+) -> Browser:
     browser = await playwright.chromium.launch(
         headless=True,
         args=BROWSER_ARGS,
-        executable_path=brave_path,
+        executable_path=executable_path or None,
         ignore_default_args=['--disable-http-compression'],
         chromium_sandbox=False,
         handle_sigint=False,
@@ -26,29 +26,31 @@ async def create_browser_instance(playwright: Playwright) -> BrowserContext:
         handle_sighup=False,
     )
 
+    return browser
+
+
+async def create_browser_context(browser: Browser) -> BrowserContext:
     context = await browser.new_context(
         viewport={'width': 1280, 'height': 800},
         user_agent=USER_AGENT.strip(),
         locale='en-US',
         timezone_id='UTC',
         color_scheme='light',
-        ignore_https_errors=True
+        ignore_https_errors=True,
+        # Service worker fetches would bypass the context's routes
+        service_workers='block'
     )
 
-    return context
-
+    # Routes registered last are tried first, so blocking wins over the cache
+    if ASSET_CACHE_ENABLED:
+        await asset_cache.install(context)
+    await request_blocker.install(context)
 
-async def block_resources(route: Route) -> None:
-    if any(route.request.url.endswith(ext) for ext in BLOCKED_EXTENSIONS):
-        await route.abort()
-    elif any(domain in route.request.url for domain in BLOCKED_DOMAINS):
-        await route.abort()
-    else:
-        await route.continue_()
+    return context
 
 
-async def create_page_instance(context: BrowserContext) -> Page:
+async def create_page_instance(context: BrowserContext, url: str = FLIGHTS_PAGE_URL) -> Page:
     page = await context.new_page()
-    await page.route("**/*", block_resources)
-    await page.goto(FLIGHTS_PAGE_URL, wait_until='domcontentloaded')
+    with SEARCH_STAGE_SECONDS.time(stage="page_goto"):
+        await page.goto(url, wait_until='domcontentloaded')
     return page
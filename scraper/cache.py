@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import json
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from enum import StrEnum
+from typing import Any, Awaitable, Callable
+
+from .models import SearchParams
+from .types import TicketType, PassengerType
+from .errors import NoFlightsFoundError
+from .constants.settings import (
+    RESULT_CACHE_TTL_SECONDS,
+    RESULT_CACHE_STALE_SECONDS,
+    RESULT_CACHE_NEGATIVE_TTL_SECONDS,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_MAX_BYTES,
+)
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+
+class CacheState(StrEnum):
+    fresh = "fresh"
+    stale = "stale"
+    miss = "miss"
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    refreshes: int = 0
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    flights: list[dict] | None
+    error: str | None
+    ttl: float
+    stale_ttl: float
+    size: int
+    stored_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+    @property
+    def state(self) -> CacheState:
+        if self.age < self.ttl:
+            return CacheState.fresh
+        if self.age < self.ttl + self.stale_ttl:
+            return CacheState.stale
+        return CacheState.miss
+
+    def result(self) -> list[dict]:
+        if self.error is not None:
+            raise NoFlightsFoundError(self.error)
+        return list(self.flights)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    return value
+
+
+def search_cache_key(params: SearchParams) -> str:
+    passengers = {
+        passenger_type.value: params.passengers.get(
+            passenger_type, 1 if passenger_type == PassengerType.adult else 0
+        )
+        for passenger_type in PassengerType
+    }
+
+    canonical = {
+        "departure": _normalize(params.departure),
+        "destination": _normalize(params.destination),
+        "departure_date": _normalize(params.departure_date),
+        # The form ignores fields that don't apply to the ticket type
+        "return_date": (
+            _normalize(params.return_date)
+            if params.ticket_type == TicketType.round_trip else None
+        ),
+        "city_amount": (
+            params.city_amount if params.ticket_type == TicketType.multi_city else 0
+        ),
+        "ticket_type": params.ticket_type.value,
+        "flight_type": params.flight_type.value,
+        "passengers": passengers,
+    }
+
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache of search results bounded by entry count and serialized size.
+
+    Entries are fresh for `ttl` seconds and then served stale for another
+    `stale_ttl` seconds while a background refresh runs. NoFlightsFoundError
+    outcomes are cached for `negative_ttl` seconds with no stale window.
+    """
+
+    def __init__(
+        self,
+        ttl: float = RESULT_CACHE_TTL_SECONDS,
+        stale_ttl: float = RESULT_CACHE_STALE_SECONDS,
+        negative_ttl: float = RESULT_CACHE_NEGATIVE_TTL_SECONDS,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def get(self, key: str) -> tuple[CacheState, CacheEntry | None]:
+        entry = self._entries.get(key)
+        state = entry.state if entry is not None else CacheState.miss
+
+        match state:
+            case CacheState.miss:
+                if entry is not None:
+                    self._remove(key)
+                self.stats.misses += 1
+                return state, None
+            case CacheState.stale:
+                self.stats.stale_hits += 1
+            case CacheState.fresh if entry.error is not None:
+                self.stats.negative_hits += 1
+            case CacheState.fresh:
+                self.stats.hits += 1
+
+        self._entries.move_to_end(key)
+        return state, entry
+
+    def put(self, key: str, flights: list[dict]) -> None:
+        size = len(json.dumps(flights, default=str))
+        self._store(key, CacheEntry(
+            flights=list(flights),
+            error=None,
+            ttl=self.ttl,
+            stale_ttl=self.stale_ttl,
+            size=size,
+        ))
+
+    def put_negative(self, key: str, message: str) -> None:
+        self._store(key, CacheEntry(
+            flights=None,
+            error=message,
+            ttl=self.negative_ttl,
+            stale_ttl=0,
+            size=len(message),
+        ))
+
+    def schedule_refresh(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def run() -> None:
+            try:
+                await refresh()
+            except NoFlightsFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Background refresh of cached search failed: {str(e)}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self.stats.refreshes += 1
+        self._refreshing[key] = asyncio.create_task(run())
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "refreshing": len(self._refreshing),
+        }
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+result_cache = ResultCache()
@@ -1,4 +1,11 @@
-from scraper.models import Flight
+from scraper.models import Flight, BatchSearchResponse, MatrixSearchResponse
+from scraper.constants.settings import (
+    BATCH_MAX_SEARCHES,
+    BATCH_DEFAULT_CONCURRENCY,
+    BATCH_MAX_CONCURRENCY,
+    MATRIX_MAX_CELLS,
+    MATRIX_MAX_WINDOW_DAYS,
+)
 
 API_DESCRIPTION = """
 Perform a real-time flight search using Google Flights.
@@ -9,12 +16,22 @@ It supports:
 - **Economy**, **Premium Economy**, **Business**, and **First** class
 - Multiple passenger types (Adults, Children, Infants)
 
-The scraper will:
-1. Launch a headless browser
-2. Navigate to Google Flights
-3. Input the search parameters
-4. Extract flight details from the results
-5. Return a structured list of flights
+Identical searches are answered from an in-process result cache. Slightly
+outdated results are served immediately while a background refresh runs,
+and "no flights found" outcomes are cached briefly. Concurrent identical
+searches share a single scrape.
+
+Scrapes go through admission control: only a limited number run at once,
+adapting to scrape latency, error rate and free host memory, and the rest
+wait in a bounded queue. When the queue is full, or a search waited too
+long for a slot, the request fails fast with 429 and a `Retry-After` header.
+
+On a cache miss the scraper will:
+1. Take a pre-warmed page, already parked on Google Flights, from the page pool
+2. Open the results, either through a direct results URL (deep link engine) or by
+   filling in the search form, which is also the fallback when the deep link fails
+3. Extract flight details from the results
+4. Return a structured list of flights
 """
 
 API_RESPONSES = {
@@ -25,7 +42,120 @@ API_RESPONSES = {
     422: {
         "description": "Validation Error - Invalid search parameters",
     },
+    429: {
+        "description": "Too Many Requests - The scraper is at capacity; retry after `Retry-After` seconds",
+    },
     500: {
         "description": "Server Error - Failed to scrape flight data",
     }
 }
+
+
+BATCH_API_DESCRIPTION = f"""
+Run many flight searches in one request.
+
+Searches are scraped concurrently, at most `concurrency` at a time
+(default {BATCH_DEFAULT_CONCURRENCY}, maximum {BATCH_MAX_CONCURRENCY}), across isolated browser contexts.
+Up to {BATCH_MAX_SEARCHES} searches can be sent per batch.
+
+Every search gets its own entry in `results`, in request order, with either
+its flights or the error that search raised (e.g. `NoFlightsFoundError`),
+so one failing search never fails the batch. Each entry reports how long it
+waited for a free slot (`queued_ms`) and how long it ran (`elapsed_ms`);
+`wall_time_ms` covers the whole batch.
+"""
+
+BATCH_API_RESPONSES = {
+    200: {
+        "description": "Batch completed; inspect each result's status",
+        "model": BatchSearchResponse,
+    },
+    422: {
+        "description": "Validation Error - Invalid batch or search parameters",
+    },
+}
+
+MATRIX_API_DESCRIPTION = f"""
+Search every combination of origins, destinations and dates in one request,
+e.g. "cheapest JFK/EWR/LGA to London any day between 3 and 10 March".
+
+The request is expanded into one search per cell (origin x destination x
+departure date, and x return date when `return_dates` is given, searching
+round trips). Up to {MATRIX_MAX_CELLS} cells are allowed, and each date window may span at
+most {MATRIX_MAX_WINDOW_DAYS} days. Cells are scraped in parallel over
+the shared page pool, at most `concurrency` at a time.
+
+The response contains:
+- **cells**: per-cell status and cheapest price
+- **flights**: every flight found, deduplicated and sorted by price, tagged with its cell
+- **cheapest**: the cell with the lowest price
+- **complete**: `false` when some cells timed out (`cell_timeout_seconds`) or failed,
+  in which case the remaining cells are still returned
+"""
+
+MATRIX_API_RESPONSES = {
+    200: {
+        "description": "Matrix searched; partial when `complete` is false",
+        "model": MatrixSearchResponse,
+    },
+    422: {
+        "description": "Validation Error - Invalid matrix or too many cells",
+    },
+}
+
+STREAM_API_DESCRIPTION = """
+Perform a real-time flight search and stream progress and results as they are extracted.
+
+The response is newline-delimited JSON (`application/x-ndjson`), or Server-Sent Events
+when the request sends `Accept: text/event-stream`. Every event carries `event` and
+`elapsed_ms` since the request started:
+
+- **stage**: `stage` is one of `cache_hit`, `browser_ready`, `form_filled`
+  (or `deep_link_opened`), `results_visible` or `more_flights_loaded`. When scraping
+  runs in worker processes (`SCRAPER_WORKERS`), the only stage is `dispatched_to_worker`
+  and the flights arrive in a single chunk
+- **flights**: a chunk of newly extracted flights; duplicates of flights already
+  streamed are dropped as rows are extracted
+- **summary**: the final deduplicated list sorted by price, as returned by `/flights/search`
+- **error**: `error` and `detail` when the search fails; the stream ends after it.
+  A search rejected by admission control (`SearchOverloadedError`) also carries `retry_after`
+
+Streaming searches are not retried once started, since events already sent can't be taken back.
+"""
+
+STREAM_API_RESPONSES = {
+    200: {
+        "description": "Stream of search events",
+        "content": {
+            "application/x-ndjson": {},
+            "text/event-stream": {},
+        },
+    },
+    422: {
+        "description": "Validation Error - Invalid search parameters",
+    },
+}
+
+STATS_DESCRIPTION = """
+Runtime statistics for the scraper.
+
+- **browser_pool**: cold (browser had to be launched) versus warm (already running
+  browser reused) context acquisitions, launches, recycled browsers and failed health checks
+- **page_pool**: searches served from a pre-warmed page versus pages prepared on demand,
+  idle pages and pages discarded for going stale
+- **result_cache**: fresh, stale and negative ("no flights found") hits, misses,
+  evictions, background refreshes and current size
+- **single_flight**: scrapes started, duplicate searches coalesced onto an in-flight
+  scrape, and shared scrapes abandoned because every caller went away
+- **admission**: the adaptive concurrency limit, running and queued scrapes, admitted,
+  queued and rejected (queue full or queue timeout) scrapes, limit increases and decreases,
+  and the smoothed latency, error rate and available memory driving them
+- **workers**: with `SCRAPER_WORKERS` set, searches dispatched to worker processes, completed,
+  failed and cancelled because their caller went away, searches moved off their route's worker because it was busier (`spilled`) or
+  because it crashed (`redispatched`), crashes and restarts, and each worker's pid and load.
+  Browser and page pool stats then stay empty, since those pools live in the workers
+- **request_blocking**: tracking, image, font and media requests aborted (in total and
+  per resource type) and the bytes transferred by the results documents of finished searches
+- **asset_cache**: static bundles served to browser contexts from the shared cache, revalidated
+  with a 304, fetched and stored, plus evictions, bytes served and fetched, and current size
+"""
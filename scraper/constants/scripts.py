@@ -0,0 +1,48 @@
+# Receives every matched flight row plus the RESULTS_SELECTORS values and an
+# optional [start, end) row range, and returns one array of text contents
+# (or null) per row, in selector order
+EXTRACT_FLIGHT_ROWS_SCRIPT = """
+(rows, [selectors, start, end]) => rows.slice(start, end ?? rows.length).map(
+    (row) => selectors.map((selector) => {
+        const element = row.querySelector(selector);
+        return element ? element.textContent : null;
+    })
+)
+"""
+
+# Runs on the "more flights" button after it was clicked. Resolves "loaded"
+# once more rows than `before` exist (or the button went away) and the list
+# has seen no DOM mutations for `quietMs`, or "timeout" after `timeoutMs`
+WAIT_FOR_MORE_FLIGHTS_SCRIPT = """
+(button, [rowSelector, before, quietMs, timeoutMs]) => new Promise((resolve) => {
+    const list = button.closest('ul') ?? button.parentElement ?? document.body;
+    const loaded = () => !button.isConnected
+        || document.querySelectorAll(rowSelector).length > before;
+    let quietTimer = null;
+
+    const finish = (result) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadline);
+        resolve(result);
+    };
+    const check = () => {
+        clearTimeout(quietTimer);
+        if (loaded()) {
+            quietTimer = setTimeout(() => finish('loaded'), quietMs);
+        }
+    };
+
+    const observer = new MutationObserver(check);
+    observer.observe(list, { childList: true, subtree: true });
+    const deadline = setTimeout(() => finish('timeout'), timeoutMs);
+    check();
+})
+"""
+
+# Bytes the current document transferred over the network, itself included
+TRANSFERRED_BYTES_SCRIPT = """
+() => performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'))
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0)
+"""
@@ -1,8 +1,135 @@
-STOP_AFTER_ATTEMPTS: int = 5
+import os
 
-FLIGHTS_PAGE_URL = "https://www.google.com/flights"
+from dotenv import load_dotenv
+
+from scraper.types import ExtractionMode, SearchEngine
+
+load_dotenv()
+
+# Fresh pages a search may be moved to once its page became unusable
+STOP_AFTER_ATTEMPTS: int = int(os.getenv("STOP_AFTER_ATTEMPTS", "3"))
+# In-place attempts per stage (form sections, results wait, extraction)
+STAGE_RETRY_ATTEMPTS: int = int(os.getenv("STAGE_RETRY_ATTEMPTS", "3"))
+STAGE_RETRY_MAX_WAIT_SECONDS: float = float(os.getenv("STAGE_RETRY_MAX_WAIT_SECONDS", "1"))
+
+# "batched" pulls every row in one in-page call, "per_row" queries each field separately
+EXTRACTION_MODE = ExtractionMode(os.getenv("EXTRACTION_MODE", ExtractionMode.batched))
+
+# "deeplink" opens the results URL directly and falls back to the form when that fails
+SEARCH_ENGINE = SearchEngine(os.getenv("SEARCH_ENGINE", SearchEngine.form))
+DEEPLINK_RESULTS_TIMEOUT_SECONDS: int = int(os.getenv("DEEPLINK_RESULTS_TIMEOUT_SECONDS", "20"))
+RESULTS_TIMEOUT_SECONDS: int = int(os.getenv("RESULTS_TIMEOUT_SECONDS", "30"))
+
+# Empty to use Playwright's bundled Chromium
+BRAVE_EXECUTABLE_PATH: str = os.getenv(
+    "BRAVE_EXECUTABLE_PATH",
+    "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
+)
+
+BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_CONTEXTS: int = int(os.getenv("BROWSER_MAX_CONTEXTS", "100"))
+BROWSER_MAX_AGE_SECONDS: int = int(os.getenv("BROWSER_MAX_AGE_SECONDS", "1800"))
+BROWSER_HEALTH_CHECK_INTERVAL_SECONDS: int = int(
+    os.getenv("BROWSER_HEALTH_CHECK_INTERVAL_SECONDS", "30")
+)
+
+# Scrape in this many worker processes, each with its own browser and page
+# pools, instead of on the API's event loop; 0 keeps scraping in-process
+SCRAPER_WORKERS: int = int(os.getenv("SCRAPER_WORKERS", "0"))
+# A busy route's worker hands searches to the least loaded one past this many extra
+WORKER_AFFINITY_SKEW: int = int(os.getenv("WORKER_AFFINITY_SKEW", "4"))
+# Times a search is sent to a worker before a crash fails it
+WORKER_MAX_JOB_ATTEMPTS: int = int(os.getenv("WORKER_MAX_JOB_ATTEMPTS", "2"))
+# Workers that crash sooner than this after starting wait this long to be restarted
+WORKER_RESTART_BACKOFF_SECONDS: float = float(os.getenv("WORKER_RESTART_BACKOFF_SECONDS", "5"))
+WORKER_HEALTH_CHECK_INTERVAL_SECONDS: float = float(
+    os.getenv("WORKER_HEALTH_CHECK_INTERVAL_SECONDS", "1")
+)
+WORKER_STOP_TIMEOUT_SECONDS: float = float(os.getenv("WORKER_STOP_TIMEOUT_SECONDS", "15"))
+
+PAGE_POOL_SIZE: int = int(os.getenv("PAGE_POOL_SIZE", "2"))
+PAGE_POOL_MAX_IDLE_SECONDS: int = int(os.getenv("PAGE_POOL_MAX_IDLE_SECONDS", "300"))
+PAGE_POOL_REFILL_BACKOFF_SECONDS: int = int(
+    os.getenv("PAGE_POOL_REFILL_BACKOFF_SECONDS", "5")
+)
+
+RESULT_CACHE_TTL_SECONDS: int = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "300"))
+RESULT_CACHE_STALE_SECONDS: int = int(os.getenv("RESULT_CACHE_STALE_SECONDS", "600"))
+RESULT_CACHE_NEGATIVE_TTL_SECONDS: int = int(
+    os.getenv("RESULT_CACHE_NEGATIVE_TTL_SECONDS", "60")
+)
+RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+RESULT_CACHE_MAX_BYTES: int = int(
+    os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+BATCH_MAX_SEARCHES: int = int(os.getenv("BATCH_MAX_SEARCHES", "500"))
+BATCH_DEFAULT_CONCURRENCY: int = int(os.getenv("BATCH_DEFAULT_CONCURRENCY", "4"))
+BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+
+MATRIX_MAX_CELLS: int = int(os.getenv("MATRIX_MAX_CELLS", "200"))
+MATRIX_MAX_WINDOW_DAYS: int = int(os.getenv("MATRIX_MAX_WINDOW_DAYS", "366"))
+MATRIX_CELL_TIMEOUT_SECONDS: int = int(os.getenv("MATRIX_CELL_TIMEOUT_SECONDS", "90"))
+
+# Browser-backed scrapes allowed at once; the limit moves between the bounds
+# with observed latency, error rate and host memory
+ADMISSION_INITIAL_CONCURRENCY: int = int(os.getenv("ADMISSION_INITIAL_CONCURRENCY", "4"))
+ADMISSION_MIN_CONCURRENCY: int = int(os.getenv("ADMISSION_MIN_CONCURRENCY", "1"))
+ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "16"))
+# Scrapes waiting for a slot beyond this are rejected with 429
+ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "30"))
+# Scrapes slower than this count as a sign of overload
+ADMISSION_TARGET_LATENCY_SECONDS: float = float(os.getenv("ADMISSION_TARGET_LATENCY_SECONDS", "45"))
+ADMISSION_MAX_ERROR_RATE: float = float(os.getenv("ADMISSION_MAX_ERROR_RATE", "0.3"))
+# Share of host memory that must stay available (read from /proc/meminfo)
+ADMISSION_MIN_AVAILABLE_MEMORY: float = float(os.getenv("ADMISSION_MIN_AVAILABLE_MEMORY", "0.15"))
+ADMISSION_DECREASE_FACTOR: float = float(os.getenv("ADMISSION_DECREASE_FACTOR", "0.7"))
+ADMISSION_DECREASE_COOLDOWN_SECONDS: float = float(
+    os.getenv("ADMISSION_DECREASE_COOLDOWN_SECONDS", "5")
+)
+
+ASSET_CACHE_ENABLED: bool = os.getenv("ASSET_CACHE_ENABLED", "true").lower() == "true"
+# Static bundles worth sharing across contexts, matched in the Playwright driver
+ASSET_CACHE_URL_PATTERN: str = (
+    os.getenv("ASSET_CACHE_URL_PATTERN")
+    or r"^https://(?:www|ssl)\.gstatic\.com/|^https://www\.google\.com/xjs/"
+)
+ASSET_CACHE_MAX_ENTRIES: int = int(os.getenv("ASSET_CACHE_MAX_ENTRIES", "2000"))
+ASSET_CACHE_MAX_BYTES: int = int(os.getenv("ASSET_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+ASSET_CACHE_MAX_ENTRY_BYTES: int = int(
+    os.getenv("ASSET_CACHE_MAX_ENTRY_BYTES", str(8 * 1024 * 1024))
+)
+# Upper bound on freshness, whatever max-age the response carries
+ASSET_CACHE_TTL_SECONDS: int = int(os.getenv("ASSET_CACHE_TTL_SECONDS", "3600"))
+# Directory for the on-disk tier, left empty to keep the cache in memory only
+ASSET_CACHE_DIR: str = os.getenv("ASSET_CACHE_DIR", "")
+ASSET_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("ASSET_CACHE_DISK_MAX_ENTRIES", "5000"))
+# Serve what ASSET_CACHE_DIR holds without expiring or adding to it, for offline runs
+ASSET_CACHE_REPLAY: bool = os.getenv("ASSET_CACHE_REPLAY", "false").lower() == "true"
+
+# Readiness waits treat the DOM as settled after this long without mutations
+READINESS_QUIET_MS: int = int(os.getenv("READINESS_QUIET_MS", "100"))
+MORE_FLIGHTS_TIMEOUT_MS: int = int(os.getenv("MORE_FLIGHTS_TIMEOUT_MS", "5000"))
+POPOVER_CLOSE_TIMEOUT_MS: int = int(os.getenv("POPOVER_CLOSE_TIMEOUT_MS", "1000"))
+# How long the date dialog gets to open after the dates were typed
+DATE_DIALOG_TIMEOUT_MS: int = int(os.getenv("DATE_DIALOG_TIMEOUT_MS", "800"))
+
+STREAM_CHUNK_SIZE: int = int(os.getenv("STREAM_CHUNK_SIZE", "20"))
+
+# Map free-text locations to IATA codes through the bundled airport index
+RESOLVE_LOCATIONS: bool = os.getenv("RESOLVE_LOCATIONS", "true").lower() == "true"
+
+# Overridable so the service can be pointed at the offline benchmark fixture
+FLIGHTS_PAGE_URL: str = os.getenv("FLIGHTS_PAGE_URL") or "https://www.google.com/flights"
+FLIGHTS_SEARCH_URL = "https://www.google.com/travel/flights/search"
 FLIGHTS_AUTOMATIC_MULTI_CITY_SPAWN = 2
 
+# Fixed sleeps and probe timeouts the readiness waits replaced, kept to
+# report how much idle time each search saves
+FIXED_MULTI_CITY_SPAWN_WAIT_MS = 500
+FIXED_MORE_FLIGHTS_WAIT_MS = 500
+
 BROWSER_ARGS = [
     "--disable-blink-features=AutomationControlled",
     "--disable-dev-shm-usage",
@@ -31,12 +158,18 @@ BROWSER_ARGS = [
     "--safebrowsing-disable-auto-update",
     "--password-store=basic",
     "--use-mock-keychain",
+    # Images are never rendered, so skip requesting them at all
+    "--blink-settings=imagesEnabled=false",
 ]
 
+# Stylesheets stay allowed, since element visibility checks depend on layout
 BLOCKED_EXTENSIONS = (
-    ".png", ".jpg", ".jpeg", ".webp", ".gif", ".svg"
+    ".png", ".jpg", ".jpeg", ".webp", ".gif", ".svg", ".ico",
+    ".woff", ".woff2", ".ttf", ".otf",
+    ".mp4", ".webm", ".mp3", ".m4a"
 )
 
+# Matched against the host only
 BLOCKED_DOMAINS = (
     "analytics", 
     "google-analytics", 
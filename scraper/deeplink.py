@@ -0,0 +1,139 @@
+import base64
+import re
+
+from urllib.parse import urlencode
+
+from .models import SearchParams
+from .types import TicketType, FlightType, PassengerType
+from .constants.settings import FLIGHTS_SEARCH_URL
+
+# Field numbers and enum values of the protobuf message Google Flights
+# carries, base64 encoded, in the `tfs` query parameter of a results URL
+INFO_LEGS_FIELD = 3
+INFO_PASSENGERS_FIELD = 8
+INFO_SEAT_FIELD = 9
+INFO_TRIP_FIELD = 19
+
+LEG_DATE_FIELD = 2
+LEG_FROM_FIELD = 13
+LEG_TO_FIELD = 14
+AIRPORT_CODE_FIELD = 2
+
+SEAT_CODES = {
+    FlightType.economy: 1,
+    FlightType.premium_economy: 2,
+    FlightType.business: 3,
+    FlightType.first: 4,
+}
+
+TRIP_CODES = {
+    TicketType.round_trip: 1,
+    TicketType.one_way: 2,
+    TicketType.multi_city: 3,
+}
+
+PASSENGER_CODES = {
+    PassengerType.adult: 1,
+    PassengerType.children: 2,
+    PassengerType.infant_seat: 3,
+    PassengerType.infant_lap: 4,
+}
+
+IATA_CODE_PATTERN = re.compile(r"[A-Za-z]{3}")
+ISO_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _varint(value: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def _varint_field(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _bytes_field(number: int, value: bytes) -> bytes:
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def _airport(code: str) -> bytes:
+    return _bytes_field(AIRPORT_CODE_FIELD, code.strip().upper().encode("ascii"))
+
+
+def _leg(departure: str, destination: str, date: str) -> bytes:
+    return (
+        _bytes_field(LEG_DATE_FIELD, date.strip().encode("ascii"))
+        + _bytes_field(LEG_FROM_FIELD, _airport(departure))
+        + _bytes_field(LEG_TO_FIELD, _airport(destination))
+    )
+
+
+def _as_list(value: list[str] | str | None) -> list[str]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def search_legs(params: SearchParams) -> list[tuple[str, str, str]]:
+    departures = _as_list(params.departure)
+    destinations = _as_list(params.destination)
+    dates = _as_list(params.departure_date)
+
+    match params.ticket_type:
+        case TicketType.multi_city:
+            return list(zip(departures, destinations, dates))
+        case TicketType.round_trip:
+            return [
+                (departures[0], destinations[0], dates[0]),
+                (destinations[0], departures[0], _as_list(params.return_date)[0]),
+            ]
+        case _:
+            return [(departures[0], destinations[0], dates[0])]
+
+
+def encode_search(params: SearchParams) -> str | None:
+    legs = search_legs(params)
+
+    encodable = legs and all(
+        IATA_CODE_PATTERN.fullmatch(departure.strip())
+        and IATA_CODE_PATTERN.fullmatch(destination.strip())
+        and ISO_DATE_PATTERN.fullmatch(date.strip())
+        for departure, destination, date in legs
+    )
+
+    if not encodable:
+        return None
+
+    passengers = []
+    for passenger_type, code in PASSENGER_CODES.items():
+        default = 1 if passenger_type == PassengerType.adult else 0
+        passengers += [code] * params.passengers.get(passenger_type, default)
+
+    message = b"".join(
+        _bytes_field(INFO_LEGS_FIELD, _leg(*leg)) for leg in legs
+    )
+    message += _bytes_field(INFO_PASSENGERS_FIELD, b"".join(_varint(code) for code in passengers))
+    message += _varint_field(INFO_SEAT_FIELD, SEAT_CODES[params.flight_type])
+    message += _varint_field(INFO_TRIP_FIELD, TRIP_CODES[params.ticket_type])
+
+    return base64.urlsafe_b64encode(message).decode("ascii").rstrip("=")
+
+
+def build_search_url(params: SearchParams) -> str | None:
+    """
+    Encode SearchParams into a Google Flights results URL, or None when the
+    search can't be expressed as one (locations that aren't IATA codes or
+    dates that aren't YYYY-MM-DD), in which case the form has to be used.
+    """
+    encoded = encode_search(params)
+    if encoded is None:
+        return None
+
+    return f"{FLIGHTS_SEARCH_URL}?{urlencode({'tfs': encoded, 'hl': 'en'})}"
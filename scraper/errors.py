@@ -9,4 +9,30 @@ class NoFlightsFoundError(Exception):
     """
     Raised when no flights are found
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class PageUnusableError(Exception):
+    """
+    Raised when a page crashed, was closed, or kept failing a stage, so the
+    search has to start over on a fresh page
+    """
+    pass
+
+
+class SearchOverloadedError(Exception):
+    """
+    Raised when the scraper is at capacity and its admission queue is full,
+    or a search waited too long for a slot
+    """
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ScrapeWorkerError(Exception):
+    """
+    Raised when a scrape failed inside a worker process with an error that
+    can't be rebuilt here, or its worker kept crashing
+    """
+    pass
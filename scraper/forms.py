@@ -1,6 +1,9 @@
+import time
+
 from .models import SearchParams
 from .types import TicketType, PassengerType
 from playwright.async_api import Page, expect
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from .utils import (
     spawn_multi_city_selectors,
     ensure_popover_is_closed,
@@ -22,13 +25,15 @@ from .constants.selectors import (
     PASSENGER_DECREMENT_BUTTON,
     PASSENGER_DONE_BUTTON,
 )
-from .constants.settings import FLIGHTS_AUTOMATIC_MULTI_CITY_SPAWN
+from .constants.settings import FLIGHTS_AUTOMATIC_MULTI_CITY_SPAWN, DATE_DIALOG_TIMEOUT_MS
+from .trace import record_wait
 from logging_config import get_logger
+from metrics import SEARCH_STAGE_SECONDS
 
 logger = get_logger("scraper")
 
 
-async def fill_multi_city_form(page: Page, params: SearchParams) -> None:
+async def fill_multi_city_route(page: Page, params: SearchParams) -> None:
     await spawn_multi_city_selectors(page, params.city_amount)
 
     logger.info(f"Spawned {params.city_amount} multi city selectors")
@@ -37,15 +42,12 @@ async def fill_multi_city_form(page: Page, params: SearchParams) -> None:
 
     from_inputs = page.locator(f"{FROM_SELECTOR}:visible")
     to_inputs = page.locator(f"{TO_SELECTOR}:visible")
-    departure_date_inputs = page.locator(f"{DEPARTURE_DATE_SELECTOR}:visible")
 
     await expect(from_inputs).to_have_count(total_legs)
     await expect(to_inputs).to_have_count(total_legs)
-    await expect(departure_date_inputs).to_have_count(total_legs)
 
-    # Ensures index safe lookup on departure, destination and departure_date params 
+    # Ensures index safe lookup on departure and destination params 
     legs = min(total_legs, len(params.departure), len(params.destination))
-    date_legs = min(total_legs, len(params.departure_date))
 
     for i in range(legs):
         from_input = from_inputs.nth(i)
@@ -56,13 +58,25 @@ async def fill_multi_city_form(page: Page, params: SearchParams) -> None:
 
         logger.info(f"Setting multi-city departure cities: {departure_selectors}")
         await ensure_popover_is_closed(page)
-        await process_multi_city_selectors(from_input, departure_selectors)
-        await page.locator("li").filter(has_text=departure_selectors).first.click()
+        with SEARCH_STAGE_SECONDS.time(stage="autocomplete"):
+            await process_multi_city_selectors(from_input, departure_selectors)
+            await page.locator("li").filter(has_text=departure_selectors).first.click()
 
         logger.info(f"Setting multi-city destination cities: {destination_selectors}")
         await ensure_popover_is_closed(page)
-        await process_multi_city_selectors(to_input, destination_selectors)
-        await page.locator("li").filter(has_text=destination_selectors).first.click()
+        with SEARCH_STAGE_SECONDS.time(stage="autocomplete"):
+            await process_multi_city_selectors(to_input, destination_selectors)
+            await page.locator("li").filter(has_text=destination_selectors).first.click()
+
+
+async def fill_multi_city_dates(page: Page, params: SearchParams) -> None:
+    total_legs = params.city_amount + FLIGHTS_AUTOMATIC_MULTI_CITY_SPAWN
+    departure_date_inputs = page.locator(f"{DEPARTURE_DATE_SELECTOR}:visible")
+
+    await expect(departure_date_inputs).to_have_count(total_legs)
+
+    # Ensures index safe lookup on departure_date params 
+    date_legs = min(total_legs, len(params.departure_date))
 
     for i in range(date_legs):
         await ensure_popover_is_closed(page)
@@ -74,10 +88,12 @@ async def fill_multi_city_form(page: Page, params: SearchParams) -> None:
         await dep_input.press("Enter")
 
 
-async def fill_one_way_and_round_trip_form(page: Page, params: SearchParams) -> None:
+async def fill_one_way_and_round_trip_route(page: Page, params: SearchParams) -> None:
     await process_flight_selectors(page, FROM_SELECTOR, params.departure)
     await process_flight_selectors(page, TO_SELECTOR, params.destination)
 
+
+async def fill_one_way_and_round_trip_dates(page: Page, params: SearchParams) -> None:
     match params.ticket_type:
         case TicketType.round_trip:
             logger.info("Setting round trip dates")
@@ -87,17 +103,28 @@ async def fill_one_way_and_round_trip_form(page: Page, params: SearchParams) ->
             logger.info("Setting one way dates")
             await process_date_selectors(page, DEPARTURE_DATE_SELECTOR, params.departure_date)
 
+    # The dialog can open a few frames after the dates were typed, so wait
+    # for it (returning as soon as it shows) rather than probing once
+    started = time.perf_counter()
+    date_dialog = page.get_by_role("dialog").first
+    try:
+        await date_dialog.wait_for(state="visible", timeout=DATE_DIALOG_TIMEOUT_MS)
+        dialog_open = True
+    except PlaywrightTimeoutError:
+        dialog_open = False
+    record_wait("date_dialog", started, 0)
+
     # If the date dialog popped open
     # Close it by clicking its own 'Done' button (scoped to the dialog)
-    try:
-        date_dialog = page.get_by_role("dialog").first
-        await date_dialog.wait_for(state='visible', timeout=800)
-        await date_dialog.get_by_role("button", name="Done").click()
-    except:
-        # Dialog not present or not visible; proceed without clicking Done
-        pass
+    if dialog_open:
+        try:
+            await date_dialog.get_by_role("button", name="Done").click()
+        except:
+            # Dialog closed on its own in the meantime; proceed without clicking Done
+            pass
 
 
+@SEARCH_STAGE_SECONDS.time(stage="passenger_form")
 async def fill_passenger_form(page: Page, params: SearchParams) -> None:
     dialog = page.get_by_role("dialog").first
     await dialog.wait_for(state="visible")
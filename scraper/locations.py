@@ -0,0 +1,29 @@
+from airports.index import airport_index
+
+from .models import SearchParams
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+
+def _resolve(value: list[str] | str) -> list[str] | str:
+    if isinstance(value, list):
+        return [airport_index.resolve(location) for location in value]
+    return airport_index.resolve(value)
+
+
+def resolve_locations(params: SearchParams) -> SearchParams:
+    """
+    Replace free-text departures and destinations with IATA codes (or the
+    canonical city name for multi-airport cities) from the bundled airport
+    index, so the form's autocomplete pick is unambiguous and equivalent
+    spellings share a cache entry.
+    """
+    departure = _resolve(params.departure)
+    destination = _resolve(params.destination)
+
+    if departure == params.departure and destination == params.destination:
+        return params
+
+    logger.info(f"Resolved locations {params.departure} -> {departure}, {params.destination} -> {destination}")
+    return params.model_copy(update={"departure": departure, "destination": destination})
@@ -0,0 +1,73 @@
+import time
+
+from .models import (
+    MatrixSearchRequest,
+    MatrixSearchResponse,
+    MatrixCell,
+    MatrixFlight
+)
+from .batch import run_searches
+from .utils import parse_price, elapsed_ms
+from .errors import NoFlightsFoundError
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+
+def _price_key(price: str | None) -> float:
+    amount = parse_price(price)
+    return amount if amount is not None else float("inf")
+
+
+async def run_matrix_search(request: MatrixSearchRequest) -> MatrixSearchResponse:
+    searches = request.expand()
+
+    logger.info(f"Running matrix search over {len(searches)} cells")
+
+    started = time.perf_counter()
+    items = await run_searches(
+        searches,
+        request.concurrency,
+        timeout=request.cell_timeout_seconds
+    )
+
+    cells: list[MatrixCell] = []
+    merged: dict[tuple, MatrixFlight] = {}
+
+    for params, item in zip(searches, items):
+        route = {
+            "departure": params.departure,
+            "destination": params.destination,
+            "departure_date": params.departure_date,
+            "return_date": params.return_date,
+        }
+
+        cheapest = min(item.flights, key=lambda flight: _price_key(flight.price), default=None)
+
+        cells.append(MatrixCell(
+            **route,
+            status=item.status,
+            flights_found=len(item.flights),
+            cheapest_price=cheapest.price if cheapest else None,
+            error=item.error,
+            detail=item.detail,
+            elapsed_ms=item.elapsed_ms,
+        ))
+
+        for flight in item.flights:
+            matrix_flight = MatrixFlight(**flight.model_dump(), **route)
+            merged.setdefault(tuple(matrix_flight.model_dump().values()), matrix_flight)
+
+    priced_cells = [cell for cell in cells if cell.cheapest_price is not None]
+
+    return MatrixSearchResponse(
+        cells=cells,
+        flights=sorted(merged.values(), key=lambda flight: _price_key(flight.price)),
+        cheapest=min(priced_cells, key=lambda cell: _price_key(cell.cheapest_price), default=None),
+        # A "no flights" answer is still an answer; timeouts and failures are gaps
+        complete=all(
+            cell.status == "ok" or cell.error == NoFlightsFoundError.__name__
+            for cell in cells
+        ),
+        wall_time_ms=elapsed_ms(started),
+    )
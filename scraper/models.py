@@ -1,4 +1,7 @@
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Literal
+from datetime import date, timedelta
+from itertools import product
 import unicodedata
 import re
 from scraper.types import (
@@ -9,6 +12,14 @@ from scraper.types import (
     PassengerType,
 )
 from scraper.validators import ensure_list_with_min_len
+from scraper.constants.settings import (
+    BATCH_MAX_SEARCHES,
+    BATCH_DEFAULT_CONCURRENCY,
+    BATCH_MAX_CONCURRENCY,
+    MATRIX_MAX_CELLS,
+    MATRIX_MAX_WINDOW_DAYS,
+    MATRIX_CELL_TIMEOUT_SECONDS,
+)
 
 
 class SearchParams(BaseModel):
@@ -64,3 +75,152 @@ class Flight(BaseModel):
         # Remove trailing +N day offset if present
         normalized = re.sub(r"\s*\+\d+\s*$", "", normalized)
         return normalized
+
+
+class BatchSearchRequest(BaseModel):
+    searches: list[SearchParams] = Field(min_length=1, max_length=BATCH_MAX_SEARCHES)
+    concurrency: int = Field(
+        default=BATCH_DEFAULT_CONCURRENCY,
+        ge=1,
+        le=BATCH_MAX_CONCURRENCY,
+        description="Maximum number of searches scraped at the same time"
+    )
+
+
+class BatchSearchItem(BaseModel):
+    index: int
+    status: Literal["ok", "error", "timeout"]
+    flights: list[Flight] = Field(default_factory=list)
+    error: str | None = None
+    detail: str | None = None
+    queued_ms: float
+    elapsed_ms: float
+
+
+class BatchSearchResponse(BaseModel):
+    results: list[BatchSearchItem]
+    succeeded: int
+    failed: int
+    wall_time_ms: float
+
+
+class DateWindow(BaseModel):
+    start: date
+    end: date
+
+    @model_validator(mode="after")
+    def validate_order(self) -> "DateWindow":
+        if self.end < self.start:
+            raise ValueError("The end of a date window can't be before its start")
+        if self.days() > MATRIX_MAX_WINDOW_DAYS:
+            raise ValueError(f"A date window can span at most {MATRIX_MAX_WINDOW_DAYS} days")
+        return self
+
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
+
+    def dates(self) -> list[date]:
+        return [
+            self.start + timedelta(days=offset)
+            for offset in range(self.days())
+        ]
+
+
+class MatrixSearchRequest(BaseModel):
+    origins: list[str] = Field(min_length=1, max_length=MATRIX_MAX_CELLS)
+    destinations: list[str] = Field(min_length=1, max_length=MATRIX_MAX_CELLS)
+    departure_dates: DateWindow
+    return_dates: DateWindow | None = Field(
+        default=None,
+        description="Searches round trips for every valid departure/return pair when set"
+    )
+    flight_type: FlightType = FlightType.economy
+    passengers: PassengersType = {PassengerType.adult: 1}
+    concurrency: int = Field(default=BATCH_DEFAULT_CONCURRENCY, ge=1, le=BATCH_MAX_CONCURRENCY)
+    cell_timeout_seconds: float = Field(default=MATRIX_CELL_TIMEOUT_SECONDS, gt=0)
+
+    @model_validator(mode="after")
+    def validate_cell_count(self) -> "MatrixSearchRequest":
+        # Counted without expanding, so an oversized matrix is rejected cheaply
+        cells = self.cell_count()
+        if cells == 0:
+            raise ValueError("The matrix doesn't contain any searchable route and date")
+        if cells > MATRIX_MAX_CELLS:
+            raise ValueError(
+                f"The matrix expands to {cells} searches, the maximum is {MATRIX_MAX_CELLS}"
+            )
+        return self
+
+    def cell_count(self) -> int:
+        routes = sum(
+            1 for origin, destination in product(
+                dict.fromkeys(self.origins), dict.fromkeys(self.destinations)
+            )
+            if origin.strip().casefold() != destination.strip().casefold()
+        )
+
+        if self.return_dates is None:
+            return routes * self.departure_dates.days()
+
+        # Returns on or after each departure day
+        date_pairs = sum(
+            max(0, (self.return_dates.end - max(self.return_dates.start, departure)).days + 1)
+            for departure in self.departure_dates.dates()
+        )
+        return routes * date_pairs
+
+    def expand(self) -> list[SearchParams]:
+        date_pairs = [
+            (departure, None) for departure in self.departure_dates.dates()
+        ] if self.return_dates is None else [
+            (departure, return_date)
+            for departure, return_date in product(
+                self.departure_dates.dates(), self.return_dates.dates()
+            )
+            if return_date >= departure
+        ]
+
+        return [
+            SearchParams(
+                departure=origin,
+                destination=destination,
+                departure_date=departure.isoformat(),
+                return_date=return_date.isoformat() if return_date else None,
+                ticket_type=TicketType.round_trip if return_date else TicketType.one_way,
+                flight_type=self.flight_type,
+                passengers=self.passengers,
+            )
+            for origin, destination in product(
+                dict.fromkeys(self.origins), dict.fromkeys(self.destinations)
+            )
+            if origin.strip().casefold() != destination.strip().casefold()
+            for departure, return_date in date_pairs
+        ]
+
+
+class MatrixFlight(Flight):
+    departure: str
+    destination: str
+    departure_date: str
+    return_date: str | None = None
+
+
+class MatrixCell(BaseModel):
+    departure: str
+    destination: str
+    departure_date: str
+    return_date: str | None = None
+    status: Literal["ok", "error", "timeout"]
+    flights_found: int = 0
+    cheapest_price: str | None = None
+    error: str | None = None
+    detail: str | None = None
+    elapsed_ms: float
+
+
+class MatrixSearchResponse(BaseModel):
+    cells: list[MatrixCell]
+    flights: list[MatrixFlight]
+    cheapest: MatrixCell | None = None
+    complete: bool
+    wall_time_ms: float
@@ -0,0 +1,171 @@
+import asyncio
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator
+
+from playwright.async_api import Page
+
+from .browser import create_page_instance
+from .pool import BrowserPool, ContextLease, browser_pool
+from .constants.settings import (
+    PAGE_POOL_SIZE,
+    PAGE_POOL_MAX_IDLE_SECONDS,
+    PAGE_POOL_REFILL_BACKOFF_SECONDS,
+)
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+
+@dataclass(slots=True)
+class PagePoolStats:
+    warm_hits: int = 0
+    cold_misses: int = 0
+    pages_prepared: int = 0
+    discarded_stale: int = 0
+    refill_failures: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class WarmPage:
+    lease: ContextLease
+    page: Page
+    parked_at: float = field(default_factory=time.monotonic)
+
+    def usable(self, max_idle_seconds: float) -> bool:
+        return (
+            not self.page.is_closed()
+            and self.lease.browser.healthy
+            and time.monotonic() - self.parked_at < max_idle_seconds
+        )
+
+
+class PagePool:
+    """
+    Keeps `size` pages parked on the Google Flights landing page, each in its
+    own browser context with request blocking already installed. Pages are
+    never reused: the whole context is closed after a search so no form state
+    or cookies leak between users, and the pool is refilled in the background.
+    """
+
+    def __init__(
+        self,
+        browsers: BrowserPool,
+        size: int = PAGE_POOL_SIZE,
+        max_idle_seconds: float = PAGE_POOL_MAX_IDLE_SECONDS,
+        refill_backoff_seconds: float = PAGE_POOL_REFILL_BACKOFF_SECONDS,
+    ) -> None:
+        self.browsers = browsers
+        self.size = max(0, size)
+        self.max_idle_seconds = max_idle_seconds
+        self.refill_backoff_seconds = refill_backoff_seconds
+        self.stats = PagePoolStats()
+
+        self._idle: deque[WarmPage] = deque()
+        self._refill_needed = asyncio.Event()
+        self._refill_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._refill_task is None and self.size > 0:
+            self._refill_task = asyncio.create_task(self._refill_loop())
+            self._refill_needed.set()
+
+        logger.info(f"Page pool started with target size {self.size}")
+
+    async def stop(self) -> None:
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._refill_task
+            self._refill_task = None
+
+        idle, self._idle = self._idle, deque()
+        await asyncio.gather(
+            *(self.release(warm) for warm in idle),
+            return_exceptions=True
+        )
+
+        logger.info("Page pool stopped")
+
+    async def acquire(self) -> WarmPage:
+        while self._idle:
+            warm = self._idle.popleft()
+
+            if warm.usable(self.max_idle_seconds):
+                self.stats.warm_hits += 1
+                self._refill_needed.set()
+                return warm
+
+            self.stats.discarded_stale += 1
+            await self.release(warm)
+
+        self.stats.cold_misses += 1
+        self._refill_needed.set()
+
+        return await self._prepare()
+
+    async def release(self, warm: WarmPage) -> None:
+        await self.browsers.release(warm.lease)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        warm = await self.acquire()
+        try:
+            yield warm.page
+        finally:
+            await self.release(warm)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "size": self.size,
+            "idle_pages": len(self._idle),
+        }
+
+    async def _prepare(self) -> WarmPage:
+        lease = await self.browsers.acquire()
+        try:
+            page = await create_page_instance(lease.context)
+        except BaseException:
+            await self.browsers.release(lease)
+            raise
+
+        return WarmPage(lease=lease, page=page)
+
+    async def _discard_stale(self) -> None:
+        # Split before the first await, since acquire() can pop pages meanwhile
+        fresh, stale = deque(), []
+        for warm in self._idle:
+            (fresh if warm.usable(self.max_idle_seconds) else stale).append(warm)
+        self._idle = fresh
+
+        for warm in stale:
+            self.stats.discarded_stale += 1
+            await self.release(warm)
+
+    async def _refill_loop(self) -> None:
+        while True:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._refill_needed.wait(),
+                    timeout=self.max_idle_seconds / 2
+                )
+            self._refill_needed.clear()
+
+            try:
+                await self._discard_stale()
+
+                while len(self._idle) < self.size:
+                    self._idle.append(await self._prepare())
+                    self.stats.pages_prepared += 1
+            except Exception as e:
+                self.stats.refill_failures += 1
+                logger.error(f"Failed to pre-warm flights page: {str(e)}")
+                await asyncio.sleep(self.refill_backoff_seconds)
+                self._refill_needed.set()
+
+
+page_pool = PagePool(browser_pool)
@@ -0,0 +1,288 @@
+import asyncio
+import time
+
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator, Coroutine
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Playwright,
+    async_playwright
+)
+
+from .browser import launch_browser, create_browser_context
+from .constants.settings import (
+    BROWSER_POOL_SIZE,
+    BROWSER_MAX_CONTEXTS,
+    BROWSER_MAX_AGE_SECONDS,
+    BROWSER_HEALTH_CHECK_INTERVAL_SECONDS,
+)
+from logging_config import get_logger
+from metrics import SEARCH_STAGE_SECONDS
+
+logger = get_logger("scraper")
+
+HEALTH_PROBE_TIMEOUT_SECONDS = 5
+
+
+@dataclass(slots=True)
+class BrowserPoolStats:
+    cold_acquisitions: int = 0
+    warm_acquisitions: int = 0
+    launches: int = 0
+    recycled: int = 0
+    failed_health_checks: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class PooledBrowser:
+    browser: Browser
+    launched_at: float = field(default_factory=time.monotonic)
+    active_contexts: int = 0
+    served_contexts: int = 0
+    retiring: bool = False
+
+    @property
+    def healthy(self) -> bool:
+        return self.browser.is_connected()
+
+    def expired(self, max_contexts: int, max_age_seconds: float) -> bool:
+        return (
+            self.served_contexts >= max_contexts
+            or time.monotonic() - self.launched_at >= max_age_seconds
+        )
+
+
+@dataclass(slots=True)
+class ContextLease:
+    context: BrowserContext
+    browser: PooledBrowser
+    cold: bool
+
+
+class BrowserPool:
+    """
+    Long-lived set of browser processes handing out one isolated
+    BrowserContext per search. Browsers are recycled after serving
+    `max_contexts` contexts or living `max_age_seconds`, and replaced
+    when they disconnect or fail a health probe.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_contexts: int = BROWSER_MAX_CONTEXTS,
+        max_age_seconds: float = BROWSER_MAX_AGE_SECONDS,
+        health_check_interval: float = BROWSER_HEALTH_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        self.size = max(1, size)
+        self.max_contexts = max_contexts
+        self.max_age_seconds = max_age_seconds
+        self.health_check_interval = health_check_interval
+        self.stats = BrowserPoolStats()
+
+        self._playwright: Playwright | None = None
+        self._browsers: list[PooledBrowser] = []
+        self._launch_lock = asyncio.Lock()
+        self._health_task: asyncio.Task | None = None
+        self._background_tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        try:
+            await self._replenish()
+        except Exception as e:
+            # Keep the API up; browsers will be launched lazily on first use
+            logger.error(f"Failed to pre-launch browser pool: {str(e)}")
+
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_check_loop())
+
+        logger.info(f"Browser pool started with {len(self._live())} browsers")
+
+    async def stop(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._health_task
+            self._health_task = None
+
+        for task in list(self._background_tasks):
+            task.cancel()
+
+        browsers, self._browsers = self._browsers, []
+        await asyncio.gather(
+            *(self._close(pooled) for pooled in browsers),
+            return_exceptions=True
+        )
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+        logger.info("Browser pool stopped")
+
+    async def acquire(self) -> ContextLease:
+        self._retire_stale()
+
+        pooled = self._pick()
+        cold = pooled is None
+
+        if cold:
+            pooled = await self._launch_if_needed()
+
+        pooled.active_contexts += 1
+        pooled.served_contexts += 1
+
+        if cold:
+            self.stats.cold_acquisitions += 1
+        else:
+            self.stats.warm_acquisitions += 1
+
+        if len(self._live()) < self.size:
+            self._spawn(self._replenish())
+
+        try:
+            context = await create_browser_context(pooled.browser)
+        except Exception:
+            self._release_browser(pooled)
+            raise
+
+        return ContextLease(context=context, browser=pooled, cold=cold)
+
+    async def release(self, lease: ContextLease) -> None:
+        try:
+            await lease.context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context: {str(e)}")
+        finally:
+            self._release_browser(lease.browser)
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[BrowserContext]:
+        lease = await self.acquire()
+        try:
+            yield lease.context
+        finally:
+            await self.release(lease)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "size": self.size,
+            "browsers": len(self._live()),
+            "retiring_browsers": sum(1 for pooled in self._browsers if pooled.retiring),
+            "active_contexts": sum(pooled.active_contexts for pooled in self._browsers),
+        }
+
+    def _live(self) -> list[PooledBrowser]:
+        return [pooled for pooled in self._browsers if not pooled.retiring]
+
+    def _pick(self) -> PooledBrowser | None:
+        live = [pooled for pooled in self._live() if pooled.healthy]
+        if not live:
+            return None
+        return min(live, key=lambda pooled: pooled.active_contexts)
+
+    def _release_browser(self, pooled: PooledBrowser) -> None:
+        pooled.active_contexts -= 1
+        if pooled.retiring and pooled.active_contexts == 0:
+            self._discard(pooled)
+
+    def _retire_stale(self) -> None:
+        for pooled in list(self._browsers):
+            if not pooled.healthy:
+                self.stats.failed_health_checks += 1
+                logger.warning("Discarding disconnected browser from pool")
+                self._discard(pooled)
+                continue
+
+            if not pooled.retiring and pooled.expired(self.max_contexts, self.max_age_seconds):
+                logger.info(f"Recycling browser after {pooled.served_contexts} contexts")
+                pooled.retiring = True
+                self.stats.recycled += 1
+
+            if pooled.retiring and pooled.active_contexts == 0:
+                self._discard(pooled)
+
+    def _discard(self, pooled: PooledBrowser) -> None:
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+            self._spawn(self._close(pooled))
+
+    async def _start_playwright(self) -> Playwright:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def _launch(self) -> PooledBrowser:
+        playwright = await self._start_playwright()
+        with SEARCH_STAGE_SECONDS.time(stage="browser_launch"):
+            browser = await launch_browser(playwright)
+        pooled = PooledBrowser(browser=browser)
+        self._browsers.append(pooled)
+        self.stats.launches += 1
+        logger.info(f"Launched pooled browser ({len(self._live())}/{self.size})")
+        return pooled
+
+    async def _launch_if_needed(self) -> PooledBrowser:
+        async with self._launch_lock:
+            return self._pick() or await self._launch()
+
+    async def _replenish(self) -> None:
+        while len(self._live()) < self.size:
+            async with self._launch_lock:
+                if len(self._live()) >= self.size:
+                    break
+                await self._launch()
+
+    async def _probe(self, pooled: PooledBrowser) -> bool:
+        try:
+            context = await asyncio.wait_for(
+                pooled.browser.new_context(),
+                timeout=HEALTH_PROBE_TIMEOUT_SECONDS
+            )
+            await context.close()
+            return True
+        except Exception:
+            return False
+
+    async def _health_check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+
+            try:
+                idle = [
+                    pooled for pooled in self._live()
+                    if pooled.active_contexts == 0 and pooled.healthy
+                ]
+                for pooled in idle:
+                    if not await self._probe(pooled):
+                        self.stats.failed_health_checks += 1
+                        logger.warning("Browser failed health probe, replacing it")
+                        self._discard(pooled)
+
+                self._retire_stale()
+                await self._replenish()
+            except Exception as e:
+                logger.error(f"Browser pool health check failed: {str(e)}")
+
+    async def _close(self, pooled: PooledBrowser) -> None:
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close pooled browser: {str(e)}")
+
+    def _spawn(self, coroutine: Coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Browser pool background task failed: {str(task.exception())}")
+
+
+browser_pool = BrowserPool()
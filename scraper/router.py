@@ -1,9 +1,39 @@
+from typing import Annotated, Any
 from scraper.scraper import search_flights
-from scraper.models import SearchParams, Flight
-from fastapi import APIRouter, HTTPException
+from scraper.batch import run_batch_search
+from scraper.matrix import run_matrix_search
+from scraper.streaming import stream_flights, ndjson_lines, sse_messages
+from scraper.pool import browser_pool
+from scraper.page_pool import page_pool
+from scraper.cache import result_cache
+from scraper.singleflight import search_coalescer
+from scraper.admission import admission_controller
+from scraper.workers import worker_pool
+from scraper.blocking import request_blocker
+from scraper.assets import asset_cache
+from scraper.models import (
+    SearchParams,
+    Flight,
+    BatchSearchRequest,
+    BatchSearchResponse,
+    MatrixSearchRequest,
+    MatrixSearchResponse
+)
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 
-from .constants.docs import API_DESCRIPTION, API_RESPONSES
+from .constants.docs import (
+    API_DESCRIPTION,
+    API_RESPONSES,
+    BATCH_API_DESCRIPTION,
+    BATCH_API_RESPONSES,
+    MATRIX_API_DESCRIPTION,
+    MATRIX_API_RESPONSES,
+    STREAM_API_DESCRIPTION,
+    STREAM_API_RESPONSES,
+    STATS_DESCRIPTION
+)
 
 router = APIRouter()
 
@@ -18,3 +48,59 @@ load_dotenv()
 )
 async def search_flight(params: SearchParams) -> list[Flight]:
     return await search_flights(params)
+
+
+@router.post(
+    "/search/batch",
+    response_model=BatchSearchResponse,
+    description=BATCH_API_DESCRIPTION,
+    responses=BATCH_API_RESPONSES,
+)
+async def search_flight_batch(request: BatchSearchRequest) -> BatchSearchResponse:
+    return await run_batch_search(request.searches, request.concurrency)
+
+
+@router.post(
+    "/search/matrix",
+    response_model=MatrixSearchResponse,
+    description=MATRIX_API_DESCRIPTION,
+    responses=MATRIX_API_RESPONSES,
+)
+async def search_flight_matrix(request: MatrixSearchRequest) -> MatrixSearchResponse:
+    return await run_matrix_search(request)
+
+
+@router.post(
+    "/search/stream",
+    response_class=StreamingResponse,
+    description=STREAM_API_DESCRIPTION,
+    responses=STREAM_API_RESPONSES,
+)
+async def search_flight_stream(
+    params: SearchParams,
+    accept: Annotated[str | None, Header()] = None
+) -> StreamingResponse:
+    events = stream_flights(params)
+
+    if accept and "text/event-stream" in accept:
+        return StreamingResponse(
+            sse_messages(events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+
+    return StreamingResponse(ndjson_lines(events), media_type="application/x-ndjson")
+
+
+@router.get("/stats", description=STATS_DESCRIPTION)
+async def scraper_stats() -> dict[str, Any]:
+    return {
+        "browser_pool": browser_pool.snapshot(),
+        "page_pool": page_pool.snapshot(),
+        "result_cache": result_cache.snapshot(),
+        "single_flight": search_coalescer.snapshot(),
+        "admission": admission_controller.snapshot(),
+        "workers": worker_pool.snapshot(),
+        "request_blocking": request_blocker.snapshot(),
+        "asset_cache": asset_cache.snapshot(),
+    }
@@ -1,5 +1,5 @@
 from .models import SearchParams, Flight
-from .types import TicketType
+from .types import TicketType, ExtractionMode, SearchEngine, PassengerType
 from .constants.selectors import (
     FLIGHT_TYPE_SELECTOR,
     TICKET_TYPE_SELECTOR,
@@ -8,48 +8,82 @@ from .constants.selectors import (
     FLIGHTS_SELECTOR,
     MORE_FLIGHTS_BUTTON
 )
-from .constants.settings import STOP_AFTER_ATTEMPTS
+from .constants.settings import (
+    STOP_AFTER_ATTEMPTS,
+    EXTRACTION_MODE,
+    SEARCH_ENGINE,
+    DEEPLINK_RESULTS_TIMEOUT_SECONDS,
+    RESULTS_TIMEOUT_SECONDS,
+    FLIGHTS_PAGE_URL,
+    RESOLVE_LOCATIONS,
+)
 import asyncio
-from playwright.async_api import Page, async_playwright
-from .errors import AdultPerInfantsOnLapError, NoFlightsFoundError
+import time
+from playwright.async_api import Page
+from .errors import (
+    AdultPerInfantsOnLapError,
+    NoFlightsFoundError,
+    PageUnusableError,
+    SearchOverloadedError
+)
 
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_not_exception_type
+    retry_if_not_exception_type,
+    RetryCallState
 )
 
 from .utils import (
     process_flight,
+    process_flights,
     process_duplicate_flights,
     show_no_flights_found_error,
-    click_more_flights_button
+    click_more_flights_button,
+    has_more_flights_button,
+    ensure_popover_is_closed
 )
+from .locations import resolve_locations
 from .forms import (
-    fill_multi_city_form,
-    fill_one_way_and_round_trip_form,
+    fill_multi_city_route,
+    fill_multi_city_dates,
+    fill_one_way_and_round_trip_route,
+    fill_one_way_and_round_trip_dates,
     fill_passenger_form
 )
-from .browser import (
-    create_browser_instance,
-    create_page_instance
-)
+from .stages import run_stage
+from .page_pool import page_pool
+from .deeplink import build_search_url
+from .cache import CacheState, result_cache, search_cache_key
+from .singleflight import search_coalescer
+from .admission import admission_controller
+from .workers import worker_pool
+from .trace import search_trace
+from .blocking import request_blocker
+from history.store import price_history
+from history.constants.settings import HISTORY_ENABLED
 from logging_config import get_logger
+from metrics import (
+    SEARCH_STAGE_SECONDS,
+    SEARCH_DURATION_SECONDS,
+    SEARCH_RETRIES,
+    SEARCHES_IN_FLIGHT
+)
 
 logger = get_logger("scraper")
 
 
-async def fill_search_form(page: Page, params: SearchParams) -> None:
-    ticket_type_div = page.locator(TICKET_TYPE_SELECTOR).first
-    flight_type_div = page.locator(FLIGHT_TYPE_SELECTOR).first
-    passengers_button_div = page.locator(PASSENGER_BUTTON_SELECTOR).first
-    
-    await ticket_type_div.click()
+async def select_ticket_type(page: Page, params: SearchParams) -> None:
+    await page.locator(TICKET_TYPE_SELECTOR).first.click()
     await page.locator("li").filter(has_text=params.ticket_type.value).nth(0).click()
 
     logger.info("Ticket type selected: %s", params.ticket_type.value)
 
+
+async def open_passenger_form(page: Page, params: SearchParams) -> None:
+    passengers_button_div = page.locator(PASSENGER_BUTTON_SELECTOR).first
+
     await passengers_button_div.scroll_into_view_if_needed()
     await passengers_button_div.wait_for(state='visible')
     await passengers_button_div.click()
@@ -60,34 +94,134 @@ async def fill_search_form(page: Page, params: SearchParams) -> None:
 
     logger.info("Passengers form filled")
 
-    await flight_type_div.click()
+
+async def select_flight_type(page: Page, params: SearchParams) -> None:
+    await page.locator(FLIGHT_TYPE_SELECTOR).first.click()
     await page.locator("li").filter(has_text=params.flight_type.value).nth(0).click()
 
     logger.info("Flight type selected: %s", params.flight_type.value)
 
+
+async def submit_search(page: Page) -> None:
+    await page.locator(SEARCH_BUTTON_SELECTOR).first.click()
+
+
+async def fill_search_form(page: Page, params: SearchParams) -> None:
+    # Every stage leaves no menu or dialog open, so a retry starts by closing
+    # whatever the failed attempt left behind
+    async def close_popovers() -> None:
+        await ensure_popover_is_closed(page)
+
     if params.ticket_type == TicketType.multi_city:
-        await fill_multi_city_form(page, params)
+        fill_route, fill_dates = fill_multi_city_route, fill_multi_city_dates
     else:
-        await fill_one_way_and_round_trip_form(page, params)
+        fill_route, fill_dates = fill_one_way_and_round_trip_route, fill_one_way_and_round_trip_dates
+
+    await run_stage("ticket_type", page, lambda: select_ticket_type(page, params), close_popovers)
+    await run_stage("passenger_form", page, lambda: open_passenger_form(page, params), close_popovers)
+    await run_stage("cabin", page, lambda: select_flight_type(page, params), close_popovers)
+    await run_stage("route", page, lambda: fill_route(page, params), close_popovers)
+    await run_stage("dates", page, lambda: fill_dates(page, params), close_popovers)
 
     logger.info("Flight form filled")
 
-    await page.locator(SEARCH_BUTTON_SELECTOR).first.click()
+    await run_stage("submit", page, lambda: submit_search(page), close_popovers)
 
 
-async def extract_flights(page: Page) -> list[dict]:
+@SEARCH_STAGE_SECONDS.time(stage="results_wait")
+async def wait_for_results(page: Page) -> None:
     await show_no_flights_found_error(page)
     await page.locator(FLIGHTS_SELECTOR).first.wait_for(state='visible', timeout=30000)
+
+
+async def open_deep_link(page: Page, params: SearchParams) -> bool:
+    url = build_search_url(params)
+
+    if url is None:
+        logger.info("Search can't be expressed as a deep link, using the search form")
+        return False
+
+    # The form would surface this through its passenger dialog
+    adults = params.passengers.get(PassengerType.adult, 1)
+    if params.passengers.get(PassengerType.infant_lap, 0) > adults:
+        raise AdultPerInfantsOnLapError("You must have at least one adult per infant on lap")
+
+    try:
+        with SEARCH_STAGE_SECONDS.time(stage="page_goto"):
+            await page.goto(url, wait_until='domcontentloaded')
+        await asyncio.wait_for(wait_for_results(page), DEEPLINK_RESULTS_TIMEOUT_SECONDS)
+    except NoFlightsFoundError:
+        raise
+    except Exception as e:
+        logger.warning(f"Deep link navigation failed, falling back to the search form: {str(e)}")
+        with SEARCH_STAGE_SECONDS.time(stage="page_goto"):
+            await page.goto(FLIGHTS_PAGE_URL, wait_until='domcontentloaded')
+        return False
+
+    logger.info("Opened search results through deep link")
+    return True
+
+
+async def open_search_results(page: Page, params: SearchParams) -> SearchEngine:
+    if SEARCH_ENGINE == SearchEngine.deeplink and await open_deep_link(page, params):
+        return SearchEngine.deeplink
+
+    await fill_search_form(page, params)
+    return SearchEngine.form
+
+
+@SEARCH_STAGE_SECONDS.time(stage="extraction")
+async def extract_flight_rows(page: Page) -> list[dict]:
+    match EXTRACTION_MODE:
+        case ExtractionMode.per_row:
+            all_flights = await page.query_selector_all(FLIGHTS_SELECTOR)
+
+            flight_tasks = [
+                process_flight(flight) for flight in all_flights
+            ]
+
+            return list(await asyncio.gather(*flight_tasks))
+        case ExtractionMode.batched:
+            return await process_flights(page)
+
+
+async def await_results(page: Page, engine: SearchEngine = SearchEngine.form) -> None:
+    async def resubmit() -> None:
+        if engine == SearchEngine.deeplink:
+            await page.reload(wait_until='domcontentloaded')
+        else:
+            await submit_search(page)
+
+    await run_stage(
+        "results_wait",
+        page,
+        lambda: asyncio.wait_for(wait_for_results(page), RESULTS_TIMEOUT_SECONDS),
+        resubmit
+    )
+
+
+async def load_more_flights(page: Page) -> None:
+    # Short result lists have no button, which is no reason to retry
+    if not await has_more_flights_button(page):
+        logger.info("No more flights button, extracting the flights shown")
+        return
+
     logger.info("Clicking more flights button")
-    await click_more_flights_button(page)
 
-    all_flights = await page.query_selector_all(FLIGHTS_SELECTOR)
+    try:
+        await run_stage("more_flights", page, lambda: click_more_flights_button(page))
+    except PageUnusableError as e:
+        # A click that kept failing still leaves the flights on screen valid
+        if page.is_closed():
+            raise
+        logger.warning(f"Extracting the flights shown so far: {str(e)}")
 
-    flight_tasks = [
-        process_flight(flight) for flight in all_flights
-    ]
 
-    results = await asyncio.gather(*flight_tasks)
+async def extract_flights(page: Page, engine: SearchEngine = SearchEngine.form) -> list[dict]:
+    await await_results(page, engine)
+    await load_more_flights(page)
+
+    results = await run_stage("extraction", page, lambda: extract_flight_rows(page))
 
     flights = process_duplicate_flights(results)
 
@@ -96,27 +230,92 @@ async def extract_flights(page: Page) -> list[dict]:
     return flights
 
 
+def record_retry(retry_state: RetryCallState) -> None:
+    error = type(retry_state.outcome.exception()).__name__
+    SEARCH_RETRIES.labels(error=error).inc()
+    logger.warning(
+        f"Scrape attempt {retry_state.attempt_number} failed with {error}, retrying on a fresh page"
+    )
+
+
+# Stages retry in place, so this only runs again once a page became unusable
 @retry(
     stop=stop_after_attempt(STOP_AFTER_ATTEMPTS), 
-    wait=wait_exponential(multiplier=1, min=4, max=10),
-    retry=retry_if_not_exception_type((AdultPerInfantsOnLapError, NoFlightsFoundError))
+    wait=wait_exponential(multiplier=1, min=1, max=4),
+    retry=retry_if_not_exception_type((AdultPerInfantsOnLapError, NoFlightsFoundError)),
+    before_sleep=record_retry
 )
-async def search_flights(params: SearchParams) -> list[Flight]:
-    async with async_playwright() as playwright:
-        browser = await create_browser_instance(playwright)
-        page = await create_page_instance(browser)
-
-        logger.info("Filling search form")
+async def scrape_flights(params: SearchParams) -> list[Flight]:
+    async with page_pool.page() as page:
+        logger.info("Opening search results")
         
-        await fill_search_form(page, params)
+        engine = await open_search_results(page, params)
 
-        logger.info("Filled search form")
+        logger.info(f"Opened search results using the {engine.value} engine")
 
 
         logger.info("Extracting flights")
         
-        flights = await extract_flights(page)
+        flights = await extract_flights(page, engine)
 
-        await browser.close()
+        await request_blocker.record_search(page)
         
         return flights
+
+
+async def run_scrape(params: SearchParams) -> list[Flight]:
+    if worker_pool.enabled:
+        return await worker_pool.scrape(params)
+    return await scrape_flights(params)
+
+
+async def _scrape_and_cache(key: str, params: SearchParams) -> list[Flight]:
+    started = time.perf_counter()
+    outcome = "error"
+
+    try:
+        async with admission_controller.slot():
+            with SEARCHES_IN_FLIGHT.track_inprogress(), search_trace():
+                flights = await run_scrape(params)
+        outcome = "ok"
+    except SearchOverloadedError:
+        outcome = "rejected"
+        raise
+    except NoFlightsFoundError as e:
+        outcome = "no_flights"
+        result_cache.put_negative(key, str(e))
+        raise
+    finally:
+        SEARCH_DURATION_SECONDS.labels(outcome=outcome).observe(time.perf_counter() - started)
+
+    result_cache.put(key, flights)
+    if HISTORY_ENABLED:
+        price_history.record(params, flights)
+    return flights
+
+
+async def _coalesced_scrape(key: str, params: SearchParams) -> list[Flight]:
+    return await search_coalescer.do(key, lambda: _scrape_and_cache(key, params))
+
+
+def refresh_cached_search(key: str, params: SearchParams) -> None:
+    result_cache.schedule_refresh(key, lambda: _coalesced_scrape(key, params))
+
+
+async def search_flights(params: SearchParams) -> list[Flight]:
+    if RESOLVE_LOCATIONS:
+        params = resolve_locations(params)
+
+    key = search_cache_key(params)
+    state, entry = result_cache.get(key)
+
+    match state:
+        case CacheState.fresh:
+            logger.info("Serving flights from cache")
+            return entry.result()
+        case CacheState.stale:
+            logger.info("Serving stale flights from cache while refreshing")
+            refresh_cached_search(key, params)
+            return entry.result()
+
+    return await _coalesced_scrape(key, params)
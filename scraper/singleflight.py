@@ -0,0 +1,70 @@
+import asyncio
+
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class SingleFlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+    abandoned: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class _Call:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key into one underlying task.
+
+    Every caller awaits the same task through `asyncio.shield`, so a caller
+    being cancelled never cancels the work for the others. The shared task
+    is only cancelled once every caller waiting on it has gone away.
+    Results and exceptions are delivered to all callers alike.
+    """
+
+    def __init__(self) -> None:
+        self.stats = SingleFlightStats()
+        self._calls: dict[str, _Call] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.stats.leaders += 1
+        else:
+            self.stats.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self.stats.abandoned += 1
+                # Forgotten first, so a caller arriving while the task winds
+                # down starts a fresh flight instead of joining a cancelled one
+                self._forget(key, call)
+                call.task.cancel()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "in_flight": len(self._calls),
+        }
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+search_coalescer = SingleFlight()
@@ -0,0 +1,93 @@
+import time
+
+from typing import Awaitable, Callable, TypeVar
+
+from playwright.async_api import Page
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential
+)
+
+from .errors import AdultPerInfantsOnLapError, NoFlightsFoundError, PageUnusableError
+from .constants.settings import STAGE_RETRY_ATTEMPTS, STAGE_RETRY_MAX_WAIT_SECONDS
+from .trace import record_stage
+from metrics import STAGE_RETRIES, STAGE_TIME_LOST_SECONDS
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+T = TypeVar("T")
+
+# Outcomes of the search itself, which another attempt would only repeat
+FINAL_ERRORS = (AdultPerInfantsOnLapError, NoFlightsFoundError, PageUnusableError)
+
+_CLOSED_MARKERS = ("has been closed", "crash")
+
+
+def page_is_unusable(page: Page, error: BaseException) -> bool:
+    message = str(error).lower()
+    return page.is_closed() or any(marker in message for marker in _CLOSED_MARKERS)
+
+
+async def run_stage(
+    stage: str,
+    page: Page,
+    action: Callable[[], Awaitable[T]],
+    reset: Callable[[], Awaitable[None]] | None = None,
+    attempts: int = STAGE_RETRY_ATTEMPTS,
+) -> T:
+    """
+    Runs one stage of a search, retrying it in place on the same page.
+
+    `action` must be safe to repeat; `reset`, when given, runs before every
+    retry to put the page back where the stage expects it (closing a menu
+    left open, for instance). Domain outcomes are raised as they are. A
+    page that crashed or closed, or a stage that used up its attempts,
+    raises PageUnusableError so the caller can move to a fresh page.
+    Retries and the time lost to failed attempts are recorded per stage.
+    """
+    def retryable(error: BaseException) -> bool:
+        return not isinstance(error, FINAL_ERRORS) and not page_is_unusable(page, error)
+
+    def before_sleep(retry_state: RetryCallState) -> None:
+        error = retry_state.outcome.exception()
+        logger.warning(
+            f"Stage {stage} attempt {retry_state.attempt_number} failed "
+            f"({type(error).__name__}: {str(error).splitlines()[0] if str(error) else ''}), retrying"
+        )
+
+    started = time.perf_counter()
+    attempt_started = started
+    retries = 0
+
+    try:
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(attempts),
+            wait=wait_exponential(multiplier=0.25, max=STAGE_RETRY_MAX_WAIT_SECONDS),
+            retry=retry_if_exception(retryable),
+            before_sleep=before_sleep,
+            reraise=True,
+        ):
+            with attempt:
+                retries = attempt.retry_state.attempt_number - 1
+                if retries and reset is not None:
+                    await reset()
+
+                attempt_started = time.perf_counter()
+                return await action()
+    except FINAL_ERRORS:
+        raise
+    except Exception as e:
+        # Everything up to now went to failed attempts
+        attempt_started = time.perf_counter()
+        raise PageUnusableError(f"Stage {stage} failed on this page: {str(e)}") from e
+    finally:
+        lost_ms = (attempt_started - started) * 1000
+        record_stage(stage, retries, lost_ms)
+
+        if retries:
+            STAGE_RETRIES.labels(stage=stage).inc(retries)
+            STAGE_TIME_LOST_SECONDS.labels(stage=stage).inc(lost_ms / 1000)
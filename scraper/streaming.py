@@ -0,0 +1,155 @@
+import json
+import time
+
+from typing import Any, AsyncIterator
+
+from playwright.async_api import Page
+
+from .models import SearchParams, Flight
+from .types import SearchEngine
+from .errors import NoFlightsFoundError, SearchOverloadedError
+from .cache import CacheState, result_cache, search_cache_key
+from .page_pool import page_pool
+from .admission import admission_controller
+from .workers import worker_pool
+from .scraper import open_search_results, await_results, load_more_flights, refresh_cached_search
+from .utils import (
+    process_flights,
+    process_duplicate_flights,
+    flight_keys,
+    elapsed_ms
+)
+from .constants.selectors import FLIGHTS_SELECTOR
+from .locations import resolve_locations
+from .trace import search_trace
+from .blocking import request_blocker
+from history.store import price_history
+from history.constants.settings import HISTORY_ENABLED
+from .constants.settings import STREAM_CHUNK_SIZE, RESOLVE_LOCATIONS
+from logging_config import get_logger
+from metrics import SEARCH_STAGE_SECONDS, SEARCHES_IN_FLIGHT
+
+logger = get_logger("scraper")
+
+
+def _event(event: str, started: float, **data: Any) -> dict[str, Any]:
+    return {"event": event, "elapsed_ms": elapsed_ms(started), **data}
+
+
+def _serialize(flights: list[dict]) -> list[dict]:
+    return [Flight(**flight).model_dump() for flight in flights]
+
+
+async def _extract_new_flights(
+    page: Page,
+    seen: dict[tuple, dict],
+    started: float
+) -> AsyncIterator[dict[str, Any]]:
+    total = await page.locator(FLIGHTS_SELECTOR).count()
+
+    for start in range(0, total, STREAM_CHUNK_SIZE):
+        with SEARCH_STAGE_SECONDS.time(stage="extraction"):
+            rows = await process_flights(page, start, start + STREAM_CHUNK_SIZE)
+
+        new_flights = []
+        for row in rows:
+            key = flight_keys(row)
+            if key not in seen:
+                seen[key] = row
+                new_flights.append(row)
+
+        if new_flights:
+            yield _event("flights", started, flights=_serialize(new_flights))
+
+
+async def _scrape_stream(
+    params: SearchParams,
+    seen: dict[tuple, dict],
+    started: float
+) -> AsyncIterator[dict[str, Any]]:
+    if worker_pool.enabled:
+        # The page lives in a worker process, so only the finished scrape comes back
+        yield _event("stage", started, stage="dispatched_to_worker")
+        flights = await worker_pool.scrape(params)
+        for flight in flights:
+            seen.setdefault(flight_keys(flight), flight)
+        yield _event("flights", started, flights=_serialize(flights))
+        return
+
+    async with page_pool.page() as page:
+        yield _event("stage", started, stage="browser_ready")
+
+        engine = await open_search_results(page, params)
+        stage = "deep_link_opened" if engine == SearchEngine.deeplink else "form_filled"
+        yield _event("stage", started, stage=stage)
+
+        await await_results(page, engine)
+        yield _event("stage", started, stage="results_visible")
+
+        # Emit what is already on screen before expanding the list
+        async for event in _extract_new_flights(page, seen, started):
+            yield event
+
+        await load_more_flights(page)
+        yield _event("stage", started, stage="more_flights_loaded")
+
+        async for event in _extract_new_flights(page, seen, started):
+            yield event
+
+        await request_blocker.record_search(page)
+
+
+async def stream_flights(params: SearchParams) -> AsyncIterator[dict[str, Any]]:
+    started = time.perf_counter()
+    if RESOLVE_LOCATIONS:
+        params = resolve_locations(params)
+
+    key = search_cache_key(params)
+    state, entry = result_cache.get(key)
+
+    try:
+        if entry is not None:
+            if state == CacheState.stale:
+                refresh_cached_search(key, params)
+
+            yield _event("stage", started, stage="cache_hit")
+            flights = entry.result()
+            yield _event("flights", started, flights=_serialize(flights))
+        else:
+            seen: dict[tuple, dict] = {}
+
+            try:
+                async with admission_controller.slot():
+                    with SEARCHES_IN_FLIGHT.track_inprogress(), search_trace():
+                        async for event in _scrape_stream(params, seen, started):
+                            yield event
+            except NoFlightsFoundError as e:
+                result_cache.put_negative(key, str(e))
+                raise
+
+            flights = process_duplicate_flights(list(seen.values()))
+            result_cache.put(key, flights)
+            if HISTORY_ENABLED:
+                price_history.record(params, flights)
+
+            logger.info(f"Streamed {len(flights)} unique flights")
+
+        yield _event("summary", started, count=len(flights), flights=_serialize(flights))
+
+    except SearchOverloadedError as e:
+        logger.warning(f"Streaming search rejected: {str(e)}")
+        yield _event("error", started, error=type(e).__name__, detail=str(e), retry_after=e.retry_after)
+
+    except Exception as e:
+        logger.error(f"Streaming search failed: {type(e).__name__}: {str(e)}")
+        yield _event("error", started, error=type(e).__name__, detail=str(e))
+
+
+async def ndjson_lines(events: AsyncIterator[dict[str, Any]]) -> AsyncIterator[str]:
+    async for event in events:
+        yield json.dumps(event) + "\n"
+
+
+async def sse_messages(events: AsyncIterator[dict[str, Any]]) -> AsyncIterator[str]:
+    async for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
@@ -0,0 +1,91 @@
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from metrics import (
+    SEARCH_IDLE_SAVED_SECONDS,
+    SEARCH_BLOCKED_REQUESTS,
+    SEARCH_TRANSFERRED_BYTES
+)
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+
+@dataclass(slots=True)
+class SearchTrace:
+    # Milliseconds actually spent in each readiness wait
+    waits: dict[str, float] = field(default_factory=dict)
+    # Milliseconds the fixed sleeps these waits replaced would have idled on top
+    idle_saved_ms: float = 0.0
+    blocked_requests: int = 0
+    transferred_bytes: int = 0
+    # In-place retries and milliseconds lost to failed attempts, per stage
+    stage_retries: dict[str, int] = field(default_factory=dict)
+    stage_time_lost_ms: dict[str, float] = field(default_factory=dict)
+
+
+_current_trace: ContextVar[SearchTrace | None] = ContextVar("search_trace", default=None)
+
+
+@contextmanager
+def search_trace() -> Iterator[SearchTrace]:
+    trace = SearchTrace()
+    token = _current_trace.set(trace)
+
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        SEARCH_IDLE_SAVED_SECONDS.observe(trace.idle_saved_ms / 1000)
+        SEARCH_BLOCKED_REQUESTS.observe(trace.blocked_requests)
+        SEARCH_TRANSFERRED_BYTES.observe(trace.transferred_bytes)
+
+        if trace.waits:
+            logger.info(
+                f"Readiness waits took {sum(trace.waits.values()):.0f} ms, "
+                f"{trace.idle_saved_ms:.0f} ms less than fixed sleeps"
+            )
+
+        logger.info(
+            f"Blocked {trace.blocked_requests} requests, "
+            f"transferred {trace.transferred_bytes} bytes"
+        )
+
+        if trace.stage_retries:
+            logger.info(
+                f"Stage retries {trace.stage_retries}, lost "
+                f"{sum(trace.stage_time_lost_ms.values()):.0f} ms to failed attempts"
+            )
+
+
+def record_wait(name: str, started: float, fixed_ms: float) -> None:
+    """
+    Records a readiness wait that started at `started` (perf_counter) and
+    replaced a fixed sleep or timeout that would have idled for `fixed_ms`.
+    """
+    waited = (time.perf_counter() - started) * 1000
+    trace = _current_trace.get()
+
+    if trace is not None:
+        trace.waits[name] = trace.waits.get(name, 0.0) + waited
+        trace.idle_saved_ms += max(0.0, fixed_ms - waited)
+
+
+def record_traffic(blocked_requests: int, transferred_bytes: int) -> None:
+    trace = _current_trace.get()
+
+    if trace is not None:
+        trace.blocked_requests += blocked_requests
+        trace.transferred_bytes += transferred_bytes
+
+
+def record_stage(stage: str, retries: int, time_lost_ms: float) -> None:
+    trace = _current_trace.get()
+
+    if trace is not None and retries:
+        trace.stage_retries[stage] = trace.stage_retries.get(stage, 0) + retries
+        trace.stage_time_lost_ms[stage] = trace.stage_time_lost_ms.get(stage, 0.0) + time_lost_ms
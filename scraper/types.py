@@ -21,4 +21,14 @@ class PassengerType(StrEnum):
     infant_seat = "Infants In Seat"
     infant_lap = "Infants On Lap"
 
-type PassengersType = dict[PassengerType, int]
\ No newline at end of file
+type PassengersType = dict[PassengerType, int]
+
+
+class ExtractionMode(StrEnum):
+    batched = "batched"
+    per_row = "per_row"
+
+
+class SearchEngine(StrEnum):
+    form = "form"
+    deeplink = "deeplink"
\ No newline at end of file
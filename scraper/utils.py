@@ -1,17 +1,39 @@
+from .constants.scripts import (
+    EXTRACT_FLIGHT_ROWS_SCRIPT,
+    WAIT_FOR_MORE_FLIGHTS_SCRIPT,
+)
 from .constants.selectors import (
     RESULTS_SELECTORS,
     ADD_FLIGHT_BUTTON_SELECTOR,
+    FROM_SELECTOR,
     ADULT_PER_INFANTS_ON_LAP_ERROR_SELECTOR,
     NO_FLIGHTS_ERROR_SELECTOR,
     FLIGHTS_SELECTOR,
     MORE_FLIGHTS_BUTTON
 )
+from .constants.settings import (
+    FLIGHTS_AUTOMATIC_MULTI_CITY_SPAWN,
+    READINESS_QUIET_MS,
+    MORE_FLIGHTS_TIMEOUT_MS,
+    POPOVER_CLOSE_TIMEOUT_MS,
+    FIXED_MULTI_CITY_SPAWN_WAIT_MS,
+    FIXED_MORE_FLIGHTS_WAIT_MS,
+)
 
-from playwright.async_api import Page, ElementHandle, Locator
+from playwright.async_api import Page, ElementHandle, Locator, expect
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from .errors import AdultPerInfantsOnLapError, NoFlightsFoundError
+from .trace import record_wait
 
-from asyncio import create_task, wait, FIRST_COMPLETED
+from asyncio import create_task, gather, wait, FIRST_COMPLETED
 from itertools import groupby
+import re
+import time
+
+from metrics import SEARCH_STAGE_SECONDS
+from logging_config import get_logger
+
+logger = get_logger("scraper")
 
 
 async def process_flight(page: ElementHandle) -> dict:
@@ -24,12 +46,24 @@ async def process_flight(page: ElementHandle) -> dict:
     return flight_info
 
 
+async def process_flights(page: Page, start: int = 0, end: int | None = None) -> list[dict]:
+    keys = list(RESULTS_SELECTORS.keys())
+
+    rows = await page.locator(FLIGHTS_SELECTOR).evaluate_all(
+        EXTRACT_FLIGHT_ROWS_SCRIPT,
+        [list(RESULTS_SELECTORS.values()), start, end]
+    )
+
+    return [dict(zip(keys, row)) for row in rows]
+
+
 async def process_date_selectors(page: Page, date_selector_type: str, date: str) -> None:
     date_input = page.locator(date_selector_type).first
     await date_input.fill(date)
     await date_input.press("Enter")
 
 
+@SEARCH_STAGE_SECONDS.time(stage="autocomplete")
 async def process_flight_selectors(page: Page, flight_selector: str, value: str) -> None:
     flight_input = page.locator(flight_selector).first
     await flight_input.fill(value)
@@ -43,18 +77,38 @@ async def process_multi_city_selectors(locator: Locator, value: str) -> None:
     
 
 async def spawn_multi_city_selectors(page: Page, city_amount: int) -> None:
-    await page.locator(ADD_FLIGHT_BUTTON_SELECTOR).first.wait_for(state='visible', timeout=800)
-    await page.locator(ADD_FLIGHT_BUTTON_SELECTOR).first.click(click_count=city_amount)
-    await page.wait_for_timeout(500)
+    add_flight_button = page.locator(ADD_FLIGHT_BUTTON_SELECTOR).first
+    await add_flight_button.wait_for(state='visible', timeout=800)
+
+    # Only adds the legs that are missing, so a retried stage doesn't overshoot
+    from_inputs = page.locator(f"{FROM_SELECTOR}:visible")
+    total_legs = city_amount + FLIGHTS_AUTOMATIC_MULTI_CITY_SPAWN
+    missing = total_legs - await from_inputs.count()
+    if missing > 0:
+        await add_flight_button.click(click_count=missing)
+
+    # Ready once every leg rendered, rather than after a fixed sleep
+    started = time.perf_counter()
+    await expect(from_inputs).to_have_count(total_legs)
+    record_wait("multi_city_legs", started, FIXED_MULTI_CITY_SPAWN_WAIT_MS)
 
 
 async def ensure_popover_is_closed(page: Page) -> None:
+    started = time.perf_counter()
+
     try:
         await page.keyboard.press("Escape")
-        await page.get_by_role("dialog").first.wait_for(state='hidden', timeout=1000)
+        # Returns as soon as the dialog is gone; only one that stays open
+        # holds the form for the full timeout
+        await page.get_by_role("dialog").first.wait_for(
+            state='hidden',
+            timeout=POPOVER_CLOSE_TIMEOUT_MS
+        )
     except Exception:
         pass
 
+    record_wait("popover_close", started, 0)
+
 
 async def show_adult_per_infants_on_lap_error(page: Page) -> None:
     error_message = await page.locator(
@@ -78,31 +132,59 @@ async def _wait_for_flights(page: Page) -> None:
 async def show_no_flights_found_error(page: Page) -> None:
     error_task = create_task(_wait_for_no_flights_error(page))
     flights_task = create_task(_wait_for_flights(page))
-    
-    done, pending = await wait(
-        [error_task, flights_task],
-        return_when=FIRST_COMPLETED
-    )
-    
-    for task in pending:
-        task.cancel()
-    
+
+    try:
+        done, _ = await wait(
+            [error_task, flights_task],
+            return_when=FIRST_COMPLETED
+        )
+    finally:
+        # Both waits have no timeout, so a caller's timeout or cancellation
+        # would otherwise leave them polling a page that goes back to the pool
+        for task in (error_task, flights_task):
+            task.cancel()
+        await gather(error_task, flights_task, return_exceptions=True)
+
     if error_task in done:
         error_message = error_task.result()
         if error_message:
             raise NoFlightsFoundError(error_message)
 
 
+async def has_more_flights_button(page: Page) -> bool:
+    try:
+        await page.locator(MORE_FLIGHTS_BUTTON).first.wait_for(state='visible', timeout=2000)
+    except PlaywrightTimeoutError:
+        return False
+    return True
+
+
+@SEARCH_STAGE_SECONDS.time(stage="more_flights")
 async def click_more_flights_button(page: Page) -> None:
-    await page.locator(MORE_FLIGHTS_BUTTON).first.wait_for(state='visible', timeout=2000)
-    await page.locator(MORE_FLIGHTS_BUTTON).first.click()
-    await page.wait_for_timeout(500)
+    more_flights_button = page.locator(MORE_FLIGHTS_BUTTON).first
+    await more_flights_button.wait_for(state='visible', timeout=2000)
+
+    # Held on to, since the page may drop the button once it is clicked
+    button = await more_flights_button.element_handle()
+    before = await page.locator(FLIGHTS_SELECTOR).count()
+    await button.click()
+
+    started = time.perf_counter()
+    result = await button.evaluate(
+        WAIT_FOR_MORE_FLIGHTS_SCRIPT,
+        [FLIGHTS_SELECTOR, before, READINESS_QUIET_MS, MORE_FLIGHTS_TIMEOUT_MS]
+    )
+    record_wait("more_flights", started, FIXED_MORE_FLIGHTS_WAIT_MS)
 
+    if result == "timeout":
+        logger.warning(f"More flights did not load within {MORE_FLIGHTS_TIMEOUT_MS} ms")
 
-def process_duplicate_flights(flights: list[dict]) -> list[dict]:
-    def flight_keys(flight: dict) -> tuple: 
-        return tuple(flight.get(key) for key in flight.keys())
 
+def flight_keys(flight: dict) -> tuple:
+    return tuple(flight.get(key) for key in flight.keys())
+
+
+def process_duplicate_flights(flights: list[dict]) -> list[dict]:
     deduplicated_flights = [
         next(grouped) 
         for _, grouped in groupby(
@@ -115,3 +197,12 @@ def process_duplicate_flights(flights: list[dict]) -> list[dict]:
     ]
 
     return sorted(deduplicated_flights, key=lambda flight: flight['price'])
+
+
+def parse_price(price: str | None) -> int | None:
+    digits = re.sub(r"[^\d]", "", price or "")
+    return int(digits) if digits else None
+
+
+def elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
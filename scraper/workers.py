@@ -0,0 +1,445 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import zlib
+
+from contextlib import suppress
+from dataclasses import dataclass, field, asdict
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from typing import Any
+
+from .models import SearchParams
+from .errors import (
+    AdultPerInfantsOnLapError,
+    NoFlightsFoundError,
+    PageUnusableError,
+    ScrapeWorkerError
+)
+from .constants.settings import (
+    SCRAPER_WORKERS,
+    WORKER_AFFINITY_SKEW,
+    WORKER_MAX_JOB_ATTEMPTS,
+    WORKER_RESTART_BACKOFF_SECONDS,
+    WORKER_HEALTH_CHECK_INTERVAL_SECONDS,
+    WORKER_STOP_TIMEOUT_SECONDS,
+)
+from logging_config import get_logger
+
+logger = get_logger("scraper")
+
+# Errors a worker reports by name that are raised again with their own type,
+# so the API maps them to the same responses as in-process scrapes
+_REBUILT_ERRORS = {
+    error.__name__: error
+    for error in (AdultPerInfantsOnLapError, NoFlightsFoundError, PageUnusableError)
+}
+_PARENT_POLL_SECONDS = 1.0
+
+
+def route_key(params: SearchParams) -> str:
+    departure = params.departure[0] if isinstance(params.departure, list) else params.departure
+    destination = params.destination[0] if isinstance(params.destination, list) else params.destination
+    return f"{departure.strip().upper()}-{destination.strip().upper()}"
+
+
+def run_worker(index: int, jobs: Queue, results: Queue, parent_pid: int) -> None:
+    """Entry point of a worker process."""
+    # Shutdown is driven by the API process, not by a Ctrl+C reaching the group
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve(index, jobs, results, parent_pid))
+
+
+async def _serve(index: int, jobs: Queue, results: Queue, parent_pid: int) -> None:
+    # Imported here so the API process can import this module without a cycle
+    from .pool import browser_pool
+    from .page_pool import page_pool
+    from .scraper import scrape_flights
+    from .trace import search_trace
+
+    async def run_job(job_id: int, payload: str) -> None:
+        try:
+            params = SearchParams.model_validate_json(payload)
+            with search_trace():
+                flights = await scrape_flights(params)
+            results.put((index, job_id, True, flights))
+        except asyncio.CancelledError:
+            # Tells the API the search let go of its page and browser
+            results.put((index, job_id, False, ("CancelledError", "Search cancelled by the API")))
+            raise
+        except Exception as e:
+            results.put((index, job_id, False, (type(e).__name__, str(e))))
+
+    def next_job() -> tuple[int, str | None] | None:
+        while True:
+            try:
+                return jobs.get(timeout=_PARENT_POLL_SECONDS)
+            except queue.Empty:
+                # Don't outlive an API process that was killed without stopping us
+                if os.getppid() != parent_pid:
+                    return None
+
+    await browser_pool.start()
+    await page_pool.start()
+    logger.info(f"Scrape worker {index} ready (pid {os.getpid()})")
+
+    loop = asyncio.get_running_loop()
+    running: dict[int, asyncio.Task] = {}
+
+    try:
+        while (job := await loop.run_in_executor(None, next_job)) is not None:
+            job_id, payload = job
+
+            # A job without a payload cancels the search sent earlier under that id
+            if payload is None:
+                if (task := running.get(job_id)) is not None:
+                    task.cancel()
+                continue
+
+            task = asyncio.create_task(run_job(job_id, payload))
+            running[job_id] = task
+            task.add_done_callback(lambda _, job_id=job_id: running.pop(job_id, None))
+
+        await asyncio.gather(*running.values(), return_exceptions=True)
+    finally:
+        await page_pool.stop()
+        await browser_pool.stop()
+        logger.info(f"Scrape worker {index} stopped")
+
+
+@dataclass(slots=True)
+class WorkerPoolStats:
+    dispatched: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    spilled: int = 0
+    redispatched: int = 0
+    crashes: int = 0
+    restarts: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class WorkerHandle:
+    index: int
+    process: BaseProcess
+    jobs: Queue
+    started_at: float
+    running: set[int] = field(default_factory=set)
+    completed: int = 0
+    restarts: int = 0
+    crashed: bool = False
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.running)
+
+    @property
+    def alive(self) -> bool:
+        return not self.crashed and self.process.is_alive()
+
+
+@dataclass(slots=True, eq=False)
+class _Job:
+    payload: str
+    future: asyncio.Future
+    attempts: int = 1
+    cancelled: bool = False
+
+
+class ScrapeWorkerPool:
+    """
+    Runs scrapes in `size` worker processes, each with its own event loop,
+    browser pool and page pool, so concurrent scrapes use more than one core.
+
+    Searches are sent to a worker over its own multiprocessing queue, picked
+    by hashing the route so repeated routes land on the same worker, unless
+    that worker is `affinity_skew` searches busier than the least loaded
+    one. Results come back over a shared queue read by a thread. Crashed
+    workers are restarted and their searches sent again, up to
+    `max_job_attempts` times. A caller that is cancelled has its search
+    cancelled in the worker too, and waits up to `stop_timeout` for the
+    worker to report it stopped.
+    """
+
+    def __init__(
+        self,
+        size: int = SCRAPER_WORKERS,
+        affinity_skew: int = WORKER_AFFINITY_SKEW,
+        max_job_attempts: int = WORKER_MAX_JOB_ATTEMPTS,
+        restart_backoff: float = WORKER_RESTART_BACKOFF_SECONDS,
+        health_check_interval: float = WORKER_HEALTH_CHECK_INTERVAL_SECONDS,
+        stop_timeout: float = WORKER_STOP_TIMEOUT_SECONDS,
+    ) -> None:
+        self.size = max(0, size)
+        self.affinity_skew = max(1, affinity_skew)
+        self.max_job_attempts = max(1, max_job_attempts)
+        self.restart_backoff = restart_backoff
+        self.health_check_interval = health_check_interval
+        self.stop_timeout = stop_timeout
+        self.stats = WorkerPoolStats()
+
+        # Spawned rather than forked: the API process has running threads
+        # and an event loop that a forked child must not inherit
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: list[WorkerHandle] = []
+        self._jobs: dict[int, _Job] = {}
+        self._job_ids = itertools.count()
+        self._results: Queue | None = None
+        self._reader: threading.Thread | None = None
+        self._monitor_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    async def start(self) -> None:
+        if self._workers or not self.enabled:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._results = self._context.Queue()
+        self._workers = [self._spawn(index) for index in range(self.size)]
+
+        self._reader = threading.Thread(target=self._read_results, name="scrape-results", daemon=True)
+        self._reader.start()
+        self._monitor_task = asyncio.create_task(self._monitor_loop())
+
+        logger.info(f"Scrape worker pool started with {self.size} workers")
+
+    async def stop(self) -> None:
+        if not self._workers:
+            return
+
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._monitor_task
+            self._monitor_task = None
+
+        # Workers finish the searches they hold before exiting, and their
+        # results are still delivered while they're joined
+        for worker in self._workers:
+            worker.jobs.put(None)
+
+        await asyncio.gather(*(asyncio.to_thread(self._join, worker) for worker in self._workers))
+        self._workers = []
+
+        for job in self._jobs.values():
+            if not job.future.done():
+                job.future.set_exception(ScrapeWorkerError("Scrape worker pool stopped"))
+        self._jobs.clear()
+
+        self._results.put(None)
+        await asyncio.to_thread(self._reader.join)
+        self._results.close()
+
+        logger.info("Scrape worker pool stopped")
+
+    async def scrape(self, params: SearchParams) -> list[dict]:
+        job_id = next(self._job_ids)
+        job = _Job(payload=params.model_dump_json(), future=asyncio.get_running_loop().create_future())
+
+        self._jobs[job_id] = job
+        self._dispatch(job_id, job, self._pick(params))
+
+        try:
+            # Shielded so a cancelled caller can still wait for the worker to let go
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            await self._cancel(job_id, job)
+            raise
+        finally:
+            self._jobs.pop(job_id, None)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "size": self.size,
+            "alive": sum(1 for worker in self._workers if worker.alive),
+            "in_flight": len(self._jobs),
+            "workers": [
+                {
+                    "index": worker.index,
+                    "pid": worker.process.pid,
+                    "alive": worker.alive,
+                    "in_flight": worker.in_flight,
+                    "completed": worker.completed,
+                    "restarts": worker.restarts,
+                }
+                for worker in self._workers
+            ],
+        }
+
+    def _spawn(self, index: int) -> WorkerHandle:
+        jobs = self._context.Queue()
+        process = self._context.Process(
+            target=run_worker,
+            args=(index, jobs, self._results, os.getpid()),
+            name=f"scrape-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return WorkerHandle(index=index, process=process, jobs=jobs, started_at=time.monotonic())
+
+    def _pick(self, params: SearchParams) -> WorkerHandle:
+        affine = self._workers[zlib.crc32(route_key(params).encode("utf-8")) % len(self._workers)]
+        alive = [worker for worker in self._workers if worker.alive]
+        if not alive:
+            return affine
+
+        least_loaded = min(alive, key=lambda worker: worker.in_flight)
+        if not affine.alive or affine.in_flight - least_loaded.in_flight >= self.affinity_skew:
+            self.stats.spilled += 1
+            return least_loaded
+
+        return affine
+
+    def _dispatch(self, job_id: int, job: _Job, worker: WorkerHandle) -> None:
+        worker.running.add(job_id)
+        self.stats.dispatched += 1
+        worker.jobs.put((job_id, job.payload))
+
+    async def _cancel(self, job_id: int, job: _Job) -> None:
+        if job.future.done():
+            return
+
+        job.cancelled = True
+        self.stats.cancelled += 1
+
+        worker = next((worker for worker in self._workers if job_id in worker.running), None)
+        if worker is None:
+            return
+
+        if not worker.alive:
+            # Parked in the queue of a crashed worker, so it's never sent again
+            worker.running.discard(job_id)
+            return
+
+        worker.jobs.put((job_id, None))
+
+        # Holds the caller, and the admission slot around it, until the
+        # worker stopped scraping, so the slot can't be handed to another
+        # search while this one still holds a page
+        await asyncio.wait([job.future], timeout=self.stop_timeout)
+        if job.future.done():
+            job.future.exception()
+        else:
+            logger.warning(f"Scrape worker {worker.index} didn't cancel search {job_id} in time")
+
+    def _read_results(self) -> None:
+        while (message := self._results.get()) is not None:
+            self._loop.call_soon_threadsafe(self._resolve, *message)
+
+    def _resolve(self, index: int, job_id: int, ok: bool, payload: Any) -> None:
+        worker = self._workers[index] if index < len(self._workers) else None
+
+        # A result from a worker the job was since taken away from is stale
+        if worker is None or job_id not in worker.running:
+            return
+
+        worker.running.discard(job_id)
+        worker.completed += 1
+
+        job = self._jobs.get(job_id)
+        if job is None or job.future.done():
+            return
+
+        if ok:
+            self.stats.completed += 1
+            job.future.set_result(payload)
+            return
+
+        if not job.cancelled:
+            self.stats.failed += 1
+        name, message = payload
+        error = _REBUILT_ERRORS.get(name)
+        job.future.set_exception(
+            error(message) if error is not None else ScrapeWorkerError(f"{name}: {message}")
+        )
+
+    async def _monitor_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+
+            for worker in list(self._workers):
+                try:
+                    self._check(worker)
+                except Exception as e:
+                    logger.error(f"Failed to restart scrape worker {worker.index}: {str(e)}")
+
+    def _check(self, worker: WorkerHandle) -> None:
+        if not worker.crashed:
+            if worker.process.is_alive():
+                return
+
+            worker.crashed = True
+            self.stats.crashes += 1
+            lived = time.monotonic() - worker.started_at
+            logger.error(
+                f"Scrape worker {worker.index} (pid {worker.process.pid}) exited with "
+                f"code {worker.process.exitcode} after {lived:.1f}s"
+            )
+
+            crash_looping = lived < self.restart_backoff
+            lost, worker.running = worker.running, set()
+
+            for job_id in lost:
+                job = self._jobs.get(job_id)
+                if job is None or job.future.done():
+                    continue
+                if job.cancelled or crash_looping or job.attempts >= self.max_job_attempts:
+                    job.future.set_exception(
+                        ScrapeWorkerError(f"Scrape worker {worker.index} crashed while running the search")
+                    )
+                else:
+                    job.attempts += 1
+                    self.stats.redispatched += 1
+                    self._dispatch(job_id, job, self._pick_other(worker))
+
+            if crash_looping:
+                # Restarted on a later check, once the backoff passed
+                return
+
+        if time.monotonic() - worker.started_at < self.restart_backoff:
+            return
+
+        self._restart(worker)
+
+    def _pick_other(self, crashed: WorkerHandle) -> WorkerHandle:
+        alive = [worker for worker in self._workers if worker.alive]
+        # With nothing else alive the search waits for this worker's restart
+        return min(alive, key=lambda worker: worker.in_flight) if alive else crashed
+
+    def _restart(self, worker: WorkerHandle) -> None:
+        worker.jobs.close()
+        worker.jobs.cancel_join_thread()
+
+        replacement = self._spawn(worker.index)
+        replacement.restarts = worker.restarts + 1
+        self._workers[worker.index] = replacement
+        self.stats.restarts += 1
+
+        # Searches queued while no worker was alive are in the old queue
+        for job_id in worker.running:
+            job = self._jobs.get(job_id)
+            if job is not None and not job.future.done():
+                self._dispatch(job_id, job, replacement)
+
+        logger.info(f"Restarted scrape worker {worker.index} (pid {replacement.process.pid})")
+
+    def _join(self, worker: WorkerHandle) -> None:
+        worker.process.join(self.stop_timeout)
+        if worker.process.is_alive():
+            logger.warning(f"Scrape worker {worker.index} didn't stop in time, terminating it")
+            worker.process.terminate()
+            worker.process.join()
+
+
+worker_pool = ScrapeWorkerPool()
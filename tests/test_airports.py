@@ -0,0 +1,36 @@
+import unittest
+
+from datetime import date
+
+from airports.index import airport_index, fold
+from text.parser import query_parser
+
+
+class ResolveTest(unittest.TestCase):
+    def test_exact_matches_are_rewritten(self) -> None:
+        self.assertEqual(airport_index.resolve("jfk"), "JFK")
+        self.assertEqual(airport_index.resolve("Bogotá"), "BOG")
+
+    def test_cities_missing_from_the_table_pass_through(self) -> None:
+        # Each of these used to be "corrected" into another city's airport
+        for city in ("Fargo", "Bari", "Bern", "Linz", "Kiel", "Genova"):
+            with self.subTest(city=city):
+                self.assertEqual(airport_index.resolve(city), city)
+
+
+class FoldTest(unittest.TestCase):
+    def test_folds_characters_whose_lowercase_changes_length(self) -> None:
+        self.assertEqual(fold("İstanbul"), "istanbul")
+        self.assertEqual(fold("Bogotá"), "bogota")
+
+    def test_parser_finds_places_after_length_changing_characters(self) -> None:
+        data = query_parser.parse(
+            "Flights from İstanbul to London on 2026-03-15", date(2026, 3, 1)
+        ).extracted_data
+
+        self.assertEqual(data["departure"], airport_index.resolve("Istanbul"))
+        self.assertEqual(data["destination"], airport_index.resolve("London"))
+
+
+if __name__ == "__main__":
+    unittest.main()
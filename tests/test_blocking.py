@@ -0,0 +1,33 @@
+import unittest
+
+from scraper.blocking import compile_block_pattern
+
+PATTERN = compile_block_pattern(("analytics", "doubleclick"), (".png", ".woff2"))
+
+
+class BlockPatternTest(unittest.TestCase):
+    def test_blocks_extensions_on_the_path(self) -> None:
+        for url in (
+            "https://www.google.com/images/logo.png",
+            "https://fonts.gstatic.com/s/roboto.woff2?v=3",
+            "https://www.google.com/images/logo.PNG#top",
+        ):
+            self.assertIsNotNone(PATTERN.search(url), url)
+
+    def test_ignores_extensions_in_the_query_or_fragment(self) -> None:
+        for url in (
+            "https://www.google.com/travel/flights/search?tfs=abc&icon=logo.png",
+            "https://www.google.com/travel/flights?q=a.png#b",
+            "https://www.google.com/travel/flights#section.woff2",
+        ):
+            self.assertIsNone(PATTERN.search(url), url)
+
+    def test_blocks_domains_by_host_only(self) -> None:
+        self.assertIsNotNone(PATTERN.search("https://www.google-analytics.com/collect?v=1"))
+        self.assertIsNotNone(PATTERN.search("https://ad.doubleclick.net/pixel"))
+        self.assertIsNone(PATTERN.search("https://www.google.com/travel/flights?ref=analytics"))
+        self.assertIsNone(PATTERN.search("https://www.google.com/analytics/flights"))
+
+
+if __name__ == "__main__":
+    unittest.main()
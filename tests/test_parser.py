@@ -0,0 +1,31 @@
+import unittest
+
+from datetime import date
+
+from text.parser import query_parser
+
+TODAY = date(2026, 3, 1)
+
+
+class PassengerTest(unittest.TestCase):
+    def test_unstated_adult_is_assumed(self) -> None:
+        parsed = query_parser.parse("JFK to LHR 2026-03-15 1 child", TODAY)
+
+        self.assertEqual(parsed.extracted_data["passengers"]["Adult"], 1)
+        self.assertEqual(parsed.confidence, 1.0)
+
+    def test_invalid_party_falls_back_instead_of_being_rewritten(self) -> None:
+        for text in (
+            "JFK to LHR 2026-03-15 0 adults 1 child",
+            "JFK to LHR 2026-03-15 1 adult 2 infants on lap",
+        ):
+            with self.subTest(text=text):
+                parsed = query_parser.parse(text, TODAY)
+                self.assertLess(parsed.confidence, query_parser.min_confidence)
+
+        parsed = query_parser.parse("JFK to LHR 2026-03-15 0 adults 1 child", TODAY)
+        self.assertEqual(parsed.extracted_data["passengers"]["Adult"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
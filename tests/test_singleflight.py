@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+from scraper.singleflight import SingleFlight
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_share_one_task(self) -> None:
+        flight = SingleFlight()
+        calls = 0
+
+        async def work() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+
+        self.assertEqual(results, [42, 42, 42])
+        self.assertEqual(calls, 1)
+
+    async def test_caller_after_abandoned_flight_starts_a_fresh_one(self) -> None:
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def slow_to_cancel() -> str:
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            finally:
+                # Stands in for releasing the page and context on cancellation
+                await asyncio.sleep(0.05)
+            return "stale"
+
+        async def fresh() -> str:
+            return "fresh"
+
+        abandoned = asyncio.create_task(flight.do("key", slow_to_cancel))
+        await started.wait()
+        abandoned.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await abandoned
+
+        # The cancelled task is still winding down at this point
+        self.assertEqual(await flight.do("key", fresh), "fresh")
+        self.assertEqual(flight.stats.abandoned, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from text.cache import ExtractionCache
+
+QUERY = "I want flights from JFK to London on March 3 for two adults in business"
+
+
+class FuzzyTierTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ExtractionCache(path=os.path.join(tempfile.mkdtemp(), "cache.sqlite3"))
+        asyncio.run(self.cache.put(QUERY, "v1", {"departure": "JFK"}))
+
+    def tearDown(self) -> None:
+        self.cache.close()
+
+    def test_typos_reuse_the_entry(self) -> None:
+        text = "I wanna flihgts from JFK to London on March 3 for two adults in business"
+
+        self.assertEqual(asyncio.run(self.cache.get(text, "v1")), {"departure": "JFK"})
+        self.assertEqual(self.cache.stats.fuzzy_hits, 1)
+
+    def test_different_search_fields_miss(self) -> None:
+        for text in (
+            QUERY.replace("March 3", "March 4"),
+            QUERY.replace("London", "Paris"),
+            QUERY.replace("JFK", "Fargo"),
+            QUERY.replace("two", "three"),
+            QUERY.replace("business", "economy"),
+            "I want flights to London from JFK on March 3 for two adults in business",
+        ):
+            with self.subTest(text=text):
+                self.assertIsNone(asyncio.run(self.cache.get(text, "v1")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,306 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from dataclasses import dataclass, asdict
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from airports.index import airport_index
+from text.constants.settings import (
+    TEXT_CACHE_PATH,
+    TEXT_CACHE_MAX_ENTRIES,
+    TEXT_CACHE_FUZZY_THRESHOLD,
+)
+from text.constants.vocabulary import (
+    FILLER_WORDS,
+    RELATIVE_DATE_TERMS,
+    MONTHS,
+    WEEKDAYS,
+    NUMBER_WORDS,
+    SEARCH_FIELD_WORDS,
+    DIRECTION_WORDS,
+)
+from logging_config import get_logger
+
+logger = get_logger("text")
+
+_SHINGLE_SIZE = 3
+
+# Bumped when the table layout or the key changes; older tables are dropped
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extractions (
+    key TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used);
+"""
+
+
+def normalize_text(text: str) -> str:
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    normalized = normalized.replace("'", "").replace("’", "")
+    normalized = re.sub(r"[^\w\s:-]", " ", normalized)
+    return " ".join(normalized.split())
+
+
+def content_tokens(normalized: str) -> tuple[str, ...]:
+    return tuple(token for token in normalized.split() if token not in FILLER_WORDS)
+
+
+def _place_words() -> frozenset[str]:
+    words = {code.lower() for code in airport_index.codes}
+    for name in airport_index.place_names():
+        words.update(name.split())
+    return frozenset(words)
+
+
+_FIELD_WORDS = (
+    SEARCH_FIELD_WORDS | RELATIVE_DATE_TERMS | MONTHS.keys() | WEEKDAYS.keys()
+    | NUMBER_WORDS.keys() | _place_words()
+)
+
+
+def field_tokens(tokens: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    The tokens that can change an extraction, in order: places, dates,
+    numbers, cabin, trip and passenger words, direction words and the word
+    following each direction word.
+    """
+    return tuple(
+        token for index, token in enumerate(tokens)
+        if token in _FIELD_WORDS
+        or any(char.isdigit() for char in token)
+        or (index > 0 and tokens[index - 1] in DIRECTION_WORDS)
+    )
+
+
+def shingles(tokens: tuple[str, ...]) -> frozenset[str]:
+    text = " ".join(tokens)
+    return frozenset(
+        text[index:index + _SHINGLE_SIZE]
+        for index in range(max(1, len(text) - _SHINGLE_SIZE + 1))
+    )
+
+
+@dataclass(slots=True)
+class ExtractionCacheStats:
+    exact_hits: int = 0
+    fuzzy_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of natural language -> structured search extractions,
+    persisted to SQLite and evicted LRU.
+
+    The exact tier is keyed on the text's content words, so texts that
+    differ only in filler words, punctuation or casing share an entry. On a
+    miss the fuzzy tier compares the text with earlier ones that carry the
+    same field tokens in the same order (see `field_tokens`), and reuses
+    the most similar once its character 3-gram Jaccard similarity reaches
+    `fuzzy_threshold`. Typos and rephrasing can differ, a place, date or
+    passenger count can't. Every entry is scoped to the prompt version, and
+    to the current day when the text uses relative dates ("next friday").
+    SQLite is only touched from a worker thread, one call at a time, so
+    lookups never block the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str = TEXT_CACHE_PATH,
+        max_entries: int = TEXT_CACHE_MAX_ENTRIES,
+        fuzzy_threshold: float = TEXT_CACHE_FUZZY_THRESHOLD,
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold
+        self.stats = ExtractionCacheStats()
+
+        self._connection: sqlite3.Connection | None = None
+        self._entries = 0
+        self._lock = threading.Lock()
+        # (scope, field tokens) -> cache key -> shingles of the content words
+        self._similar: dict[tuple[str, tuple[str, ...]], dict[str, frozenset[str]]] = {}
+
+    async def get(self, text: str, prompt_version: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._get, text, prompt_version)
+
+    async def put(self, text: str, prompt_version: str, data: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._put, text, prompt_version, data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.stats.exact_hits + self.stats.fuzzy_hits + self.stats.misses
+
+        def rate(hits: int) -> float:
+            return round(hits / lookups, 4) if lookups else 0.0
+
+        return {
+            **asdict(self.stats),
+            "entries": self._entries,
+            "exact_hit_rate": rate(self.stats.exact_hits),
+            "fuzzy_hit_rate": rate(self.stats.fuzzy_hits),
+            "hit_rate": rate(self.stats.exact_hits + self.stats.fuzzy_hits),
+        }
+
+    def _get(self, text: str, prompt_version: str) -> dict[str, Any] | None:
+        normalized = normalize_text(text)
+        scope = self._scope(normalized, prompt_version)
+        key = self._key(normalized, prompt_version)
+
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT data FROM extractions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self.stats.exact_hits += 1
+                else:
+                    match = self._fuzzy_match(scope, normalized)
+                    if match is not None:
+                        key = match
+                        row = connection.execute(
+                            "SELECT data FROM extractions WHERE key = ?", (key,)
+                        ).fetchone()
+                        self.stats.fuzzy_hits += row is not None
+
+                if row is not None:
+                    connection.execute(
+                        "UPDATE extractions SET last_used = ? WHERE key = ?", (time.time(), key)
+                    )
+                    return json.loads(row[0])
+            except (sqlite3.Error, json.JSONDecodeError) as e:
+                self.stats.errors += 1
+                logger.warning(f"Extraction cache lookup failed: {str(e)}")
+
+            self.stats.misses += 1
+            return None
+
+    def _put(self, text: str, prompt_version: str, data: dict[str, Any]) -> None:
+        normalized = normalize_text(text)
+        scope = self._scope(normalized, prompt_version)
+        key = self._key(normalized, prompt_version)
+        now = time.time()
+
+        with self._lock:
+            try:
+                connection = self._connect()
+                existed = connection.execute(
+                    "SELECT 1 FROM extractions WHERE key = ?", (key,)
+                ).fetchone() is not None
+                connection.execute(
+                    "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        scope,
+                        normalized,
+                        json.dumps(data),
+                        now,
+                        now,
+                    )
+                )
+                self._entries += not existed
+                self._index(key, scope, normalized)
+                self._evict(connection)
+            except sqlite3.Error as e:
+                self.stats.errors += 1
+                logger.warning(f"Extraction cache write failed: {str(e)}")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS extractions")
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.executescript(SCHEMA)
+
+            self._entries = 0
+            for key, scope, normalized in connection.execute(
+                "SELECT key, scope, normalized FROM extractions"
+            ):
+                self._entries += 1
+                self._index(key, scope, normalized)
+            self._connection = connection
+            logger.info(f"Loaded {self._entries} cached text extractions")
+
+        return self._connection
+
+    def _scope(self, normalized: str, prompt_version: str) -> str:
+        relative = any(token in RELATIVE_DATE_TERMS for token in normalized.split())
+        return f"{prompt_version}:{date.today().isoformat() if relative else ''}"
+
+    def _key(self, normalized: str, prompt_version: str) -> str:
+        scope = self._scope(normalized, prompt_version)
+        tokens = " ".join(content_tokens(normalized))
+        return hashlib.sha256(f"{scope}\n{tokens}".encode("utf-8")).hexdigest()
+
+    def _index(self, key: str, scope: str, normalized: str) -> None:
+        tokens = content_tokens(normalized)
+        self._similar.setdefault((scope, field_tokens(tokens)), {})[key] = shingles(tokens)
+
+    def _unindex(self, key: str, scope: str, normalized: str) -> None:
+        group_key = (scope, field_tokens(content_tokens(normalized)))
+        group = self._similar.get(group_key)
+        if group is not None:
+            group.pop(key, None)
+            if not group:
+                del self._similar[group_key]
+
+    def _fuzzy_match(self, scope: str, normalized: str) -> str | None:
+        tokens = content_tokens(normalized)
+        group = self._similar.get((scope, field_tokens(tokens)))
+        if not group:
+            return None
+
+        text_shingles = shingles(tokens)
+        best_key, best_similarity = None, self.fuzzy_threshold
+        for candidate, candidate_shingles in group.items():
+            similarity = len(text_shingles & candidate_shingles) / len(text_shingles | candidate_shingles)
+            if similarity >= best_similarity:
+                best_key, best_similarity = candidate, similarity
+
+        return best_key
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        overflow = self._entries - self.max_entries
+        if overflow <= 0:
+            return
+
+        rows = connection.execute(
+            "SELECT key, scope, normalized FROM extractions ORDER BY last_used ASC LIMIT ?",
+            (overflow,)
+        ).fetchall()
+
+        for key, scope, normalized in rows:
+            connection.execute("DELETE FROM extractions WHERE key = ?", (key,))
+            self._unindex(key, scope, normalized)
+            self._entries -= 1
+            self.stats.evictions += 1
+
+
+extraction_cache = ExtractionCache()
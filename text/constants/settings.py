@@ -0,0 +1,17 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TEXT_EXTRACTION_MODEL = "gpt-4o-mini"
+
+TEXT_CACHE_ENABLED: bool = os.getenv("TEXT_CACHE_ENABLED", "true").lower() == "true"
+TEXT_CACHE_PATH: str = os.getenv("TEXT_CACHE_PATH", ".cache/text_extraction.sqlite3")
+TEXT_CACHE_MAX_ENTRIES: int = int(os.getenv("TEXT_CACHE_MAX_ENTRIES", "10000"))
+# Minimum Jaccard similarity (character 3-grams) for a near-duplicate hit
+TEXT_CACHE_FUZZY_THRESHOLD: float = float(os.getenv("TEXT_CACHE_FUZZY_THRESHOLD", "0.8"))
+
+TEXT_PARSER_ENABLED: bool = os.getenv("TEXT_PARSER_ENABLED", "true").lower() == "true"
+# Below this confidence the local parser's result is dropped and the LLM is used
+TEXT_PARSER_MIN_CONFIDENCE: float = float(os.getenv("TEXT_PARSER_MIN_CONFIDENCE", "0.9"))
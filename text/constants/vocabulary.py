@@ -0,0 +1,64 @@
+# Words that can be added or dropped without changing what a query asks for.
+# Direction words ("from", "to") and anything carrying route, date, cabin or
+# passenger information are deliberately absent.
+FILLER_WORDS = frozenset({
+    "a", "an", "the", "i", "im", "me", "my", "we", "us", "our",
+    "please", "pls", "thanks", "thank", "you", "hi", "hello", "hey",
+    "can", "could", "would", "will", "find", "search", "show", "get",
+    "look", "looking", "want", "wanna", "need", "like", "id",
+    "book", "booking", "flight", "flights", "ticket", "tickets", "fly",
+    "some", "any", "for", "is", "are", "there", "cheap", "cheapest",
+})
+
+RELATIVE_DATE_TERMS = frozenset({
+    "today", "tonight", "tomorrow", "yesterday", "next", "this", "coming",
+    "weekend", "week", "month", "year", "days", "weeks", "months",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+})
+
+MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3,
+    "april": 4, "apr": 4, "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7,
+    "august": 8, "aug": 8, "september": 9, "sep": 9, "sept": 9,
+    "october": 10, "oct": 10, "november": 11, "nov": 11, "december": 12, "dec": 12,
+}
+
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+}
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9,
+}
+
+# Words the local query parser understands as glue between the parts it
+# extracts, on top of FILLER_WORDS
+CONNECTIVE_WORDS = frozenset({
+    "from", "to", "on", "in", "and", "then", "with", "of", "at",
+    "leaving", "departing", "depart", "going", "returning", "return",
+    "back", "coming", "until", "till", "class", "cabin", "trip",
+    "passenger", "passengers", "people", "person", "persons",
+})
+
+# Words that set a search field. The extraction cache only treats two texts
+# as near duplicates when they agree on these, together with places, dates
+# and numbers
+SEARCH_FIELD_WORDS = frozenset({
+    "from", "to", "via", "return", "returning", "back", "until", "till",
+    "one", "way", "oneway", "round", "roundtrip", "multi", "city",
+    "economy", "coach", "premium", "business", "first",
+    "adult", "adults", "child", "children", "kid", "kids",
+    "infant", "infants", "baby", "babies", "lap", "seat",
+})
+# Followed by a place, so the next word is kept even when the airport table
+# doesn't know it
+DIRECTION_WORDS = frozenset({"from", "to", "via"})
+
+# Place names that are also everyday words, only taken as a location when
+# written with a capital letter ("Nice", not "a nice flight")
+CAPITALIZED_PLACE_WORDS = frozenset({
+    "nice", "split", "male", "cork", "la", "dc", "sf", "rio", "bole",
+    "hobby", "midway", "logan", "orly", "lima", "perth", "reading",
+})
@@ -0,0 +1,372 @@
+import re
+
+from dataclasses import dataclass, field, asdict
+from datetime import date, timedelta
+from typing import Any, Callable
+
+from scraper.types import TicketType, FlightType, PassengerType
+from scraper.constants.settings import FLIGHTS_AUTOMATIC_MULTI_CITY_SPAWN
+from airports.index import airport_index, fold
+from text.cache import normalize_text
+from text.constants.vocabulary import (
+    FILLER_WORDS,
+    CONNECTIVE_WORDS,
+    CAPITALIZED_PLACE_WORDS,
+    MONTHS,
+    WEEKDAYS,
+    NUMBER_WORDS,
+)
+from text.constants.settings import TEXT_PARSER_MIN_CONFIDENCE
+
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+_WEEKDAY = "|".join(WEEKDAYS)
+_COUNT = "|".join([r"\d+", *NUMBER_WORDS])
+_ORDINAL = r"(?:st|nd|rd|th)?"
+
+ISO_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+MONTH_DAY = re.compile(
+    rf"\b(?:({_MONTH})\.?\s+(\d{{1,2}}){_ORDINAL}|(\d{{1,2}}){_ORDINAL}(?:\s+of)?\s+({_MONTH})\.?)(?:,?\s+(\d{{4}}))?\b",
+    re.IGNORECASE
+)
+RELATIVE_DAY = re.compile(rf"\b(today|tomorrow|in\s+({_COUNT})\s+days?)\b", re.IGNORECASE)
+WEEKDAY = re.compile(rf"\b(?:(next|this|on)\s+)?({_WEEKDAY})\b", re.IGNORECASE)
+
+PASSENGERS = re.compile(
+    rf"\b({_COUNT})\s+(adults?|children|child|kids?|infants?|babies|baby)"
+    r"(?:\s+(?:in|on)\s+(?:a\s+|the\s+)?(seat|lap)s?)?\b",
+    re.IGNORECASE
+)
+CABINS = [
+    (re.compile(r"\bpremium\s+economy\b", re.IGNORECASE), FlightType.premium_economy),
+    (re.compile(r"\bbusiness(?:\s+class)?\b", re.IGNORECASE), FlightType.business),
+    (re.compile(r"\bfirst\s+class\b", re.IGNORECASE), FlightType.first),
+    (re.compile(r"\b(?:economy|coach)(?:\s+class)?\b", re.IGNORECASE), FlightType.economy),
+]
+TRIPS = [
+    (re.compile(r"\bone[\s-]?way\b", re.IGNORECASE), TicketType.one_way),
+    (re.compile(r"\b(?:round[\s-]?trip|return\s+trip)\b", re.IGNORECASE), TicketType.round_trip),
+    (re.compile(r"\bmulti[\s-]?city\b", re.IGNORECASE), TicketType.multi_city),
+]
+RETURN_HINT = re.compile(r"\b(returning|return|back|until|till)\b", re.IGNORECASE)
+# Place names are matched on folded text, so "Bogotá" finds "bogota"
+PLACE = re.compile(
+    r"\b(" + "|".join(
+        re.escape(name).replace(r"\ ", r"\W+")
+        for name in sorted(airport_index.place_names(), key=len, reverse=True)
+    ) + r")\b"
+)
+AIRPORT_CODE = re.compile(r"\b([A-Z]{3})\b")
+PRECEDING_WORD = re.compile(r"(\w+)\W*$")
+
+
+@dataclass(slots=True)
+class ParsedQuery:
+    extracted_data: dict[str, Any]
+    confidence: float
+    missing_fields: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class QueryParserStats:
+    parsed: int = 0
+    fallbacks: int = 0
+
+
+class _Scanner:
+    """Matches patterns over the text, never reusing characters already claimed."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._claimed = bytearray(len(text))
+
+        # Folding can change the length ("İ" becomes "i", "ß" becomes "ss"),
+        # so every folded character keeps the index it came from
+        pieces = [fold(char) for char in text]
+        self.folded = "".join(pieces)
+        self._origins = [index for index, piece in enumerate(pieces) for _ in piece]
+        self._origins.append(len(text))
+
+    def origin(self, position: int) -> int:
+        """Index in the original text of a position in the folded text."""
+        return self._origins[position]
+
+    def take(
+        self,
+        pattern: re.Pattern,
+        folded: bool = False,
+        accept: Callable[[re.Match], bool] | None = None
+    ) -> list[re.Match]:
+        matches = []
+        for match in pattern.finditer(self.folded if folded else self.text):
+            start, end = match.start(), match.end()
+            if folded:
+                start, end = self.origin(start), self.origin(end - 1) + 1
+
+            if any(self._claimed[start:end]):
+                continue
+            if accept is not None and not accept(match):
+                continue
+            self._claimed[start:end] = b"\x01" * (end - start)
+            matches.append(match)
+        return matches
+
+    def unclaimed_words(self) -> list[str]:
+        remaining = "".join(
+            " " if claimed else char for char, claimed in zip(self.text, self._claimed)
+        )
+        return normalize_text(remaining).split()
+
+
+def _count(value: str) -> int:
+    return NUMBER_WORDS.get(value.lower()) or int(value)
+
+
+def _next_on_or_after(anchor: date, month: int, day: int, year: int | None) -> date | None:
+    try:
+        if year is not None:
+            return date(year, month, day)
+
+        candidate = date(anchor.year, month, day)
+        return candidate if candidate >= anchor else date(anchor.year + 1, month, day)
+    except ValueError:
+        return None
+
+
+class QueryParser:
+    """
+    Deterministic parser for simple flight queries such as
+    "JFK to LHR 2026-03-15 one way 2 adults business".
+
+    Produces the same `extracted_data` shape as the LLM extraction with a
+    confidence in [0, 1]: the share of meaningful words it understood,
+    zeroed when a required field is missing and halved when the parts it
+    found contradict each other. Callers fall back to the LLM below
+    `min_confidence`.
+    """
+
+    def __init__(self, min_confidence: float = TEXT_PARSER_MIN_CONFIDENCE) -> None:
+        self.min_confidence = min_confidence
+        self.stats = QueryParserStats()
+
+    def extract(self, text: str, today: date | None = None) -> dict[str, Any] | None:
+        parsed = self.parse(text, today)
+
+        if parsed.confidence < self.min_confidence:
+            self.stats.fallbacks += 1
+            return None
+
+        self.stats.parsed += 1
+        return parsed.extracted_data
+
+    def parse(self, text: str, today: date | None = None) -> ParsedQuery:
+        today = today or date.today()
+        scanner = _Scanner(text)
+        conflicts = 0
+
+        trips = {trip for pattern, trip in TRIPS for _ in scanner.take(pattern)}
+        cabins = {cabin for pattern, cabin in CABINS for _ in scanner.take(pattern)}
+        passengers, invalid_party = self._passengers(scanner)
+        dates, unresolved_dates = self._dates(scanner, today)
+        locations = self._locations(scanner)
+        return_hint = bool(RETURN_HINT.search(text))
+
+        conflicts += len(trips) > 1
+        conflicts += len(cabins) > 1
+        conflicts += unresolved_dates
+        conflicts += invalid_party
+
+        if TicketType.multi_city in trips or len(locations) > 2:
+            ticket_type = TicketType.multi_city
+        elif trips:
+            ticket_type = next(iter(trips))
+        elif len(dates) == 2 or return_hint:
+            ticket_type = TicketType.round_trip
+        else:
+            ticket_type = TicketType.one_way
+
+        extracted_data: dict[str, Any] = {
+            "departure": None,
+            "destination": None,
+            "departure_date": None,
+            "return_date": None,
+            "ticket_type": ticket_type.value,
+            "flight_type": (next(iter(cabins)) if cabins else FlightType.economy).value,
+            "city_amount": 0,
+            "passengers": passengers,
+        }
+        missing_fields = []
+
+        match ticket_type:
+            case TicketType.multi_city:
+                names = [name for _, name in locations]
+                legs = len(names) - 1
+                if legs >= 2:
+                    extracted_data["departure"] = names[:-1]
+                    extracted_data["destination"] = names[1:]
+                    extracted_data["city_amount"] = legs - FLIGHTS_AUTOMATIC_MULTI_CITY_SPAWN
+                if len(dates) == legs:
+                    extracted_data["departure_date"] = [day.isoformat() for day in dates]
+                conflicts += bool(dates) and len(dates) != legs
+
+            case TicketType.round_trip:
+                self._assign_route(text, locations, extracted_data)
+                if dates:
+                    extracted_data["departure_date"] = dates[0].isoformat()
+                if len(dates) > 1:
+                    extracted_data["return_date"] = dates[1].isoformat()
+                else:
+                    missing_fields.append("return_date")
+                conflicts += len(dates) > 2
+
+            case _:
+                self._assign_route(text, locations, extracted_data)
+                if dates:
+                    extracted_data["departure_date"] = dates[0].isoformat()
+                conflicts += len(dates) > 1
+
+        for required in ("departure", "destination", "departure_date"):
+            if extracted_data[required] is None and required not in missing_fields:
+                missing_fields.append(required)
+
+        words = [word for word in normalize_text(text).split() if word not in FILLER_WORDS]
+        unknown = [
+            word for word in scanner.unclaimed_words()
+            if word not in FILLER_WORDS and word not in CONNECTIVE_WORDS
+        ]
+
+        confidence = 1 - len(unknown) / len(words) if words else 0.0
+        if missing_fields:
+            confidence = 0.0
+        if conflicts:
+            confidence /= 2
+
+        return ParsedQuery(
+            extracted_data=extracted_data,
+            confidence=round(max(confidence, 0.0), 2),
+            missing_fields=missing_fields
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        return asdict(self.stats)
+
+    def _passengers(self, scanner: _Scanner) -> tuple[dict[str, int], bool]:
+        """Passenger counts, and whether the counts the text gave make no valid party."""
+        counts = {passenger_type.value: 0 for passenger_type in PassengerType}
+        adults_given = False
+
+        for match in scanner.take(PASSENGERS):
+            amount = _count(match.group(1))
+            kind = match.group(2).lower()
+
+            if kind.startswith("adult"):
+                passenger_type = PassengerType.adult
+                adults_given = True
+            elif kind.startswith(("child", "kid")):
+                passenger_type = PassengerType.children
+            elif (match.group(3) or "").lower() == "seat":
+                passenger_type = PassengerType.infant_seat
+            else:
+                passenger_type = PassengerType.infant_lap
+
+            counts[passenger_type.value] += amount
+
+        # Google Flights always needs at least one adult on the booking. An
+        # unstated adult is assumed, but "0 adults" is left as asked and
+        # reported as invalid rather than quietly rewritten
+        adults = counts[PassengerType.adult.value]
+        if not adults_given:
+            adults = counts[PassengerType.adult.value] = 1
+
+        invalid = adults < 1 or counts[PassengerType.infant_lap.value] > adults
+        return counts, invalid
+
+    def _dates(self, scanner: _Scanner, today: date) -> tuple[list[date], int]:
+        found: list[tuple[int, date | tuple | None]] = []
+
+        for match in scanner.take(ISO_DATE):
+            try:
+                found.append((match.start(), date.fromisoformat(match.group(1))))
+            except ValueError:
+                found.append((match.start(), None))
+
+        for match in scanner.take(MONTH_DAY):
+            month = MONTHS[(match.group(1) or match.group(4)).lower()]
+            day = int(match.group(2) or match.group(3))
+            year = int(match.group(5)) if match.group(5) else None
+            found.append((match.start(), (month, day, year)))
+
+        for match in scanner.take(RELATIVE_DAY):
+            word = match.group(1).lower()
+            if word == "today":
+                offset = 0
+            elif word == "tomorrow":
+                offset = 1
+            else:
+                offset = _count(match.group(2))
+            found.append((match.start(), today + timedelta(days=offset)))
+
+        for match in scanner.take(WEEKDAY):
+            weekday = WEEKDAYS[match.group(2).lower()]
+            offset = (weekday - today.weekday()) % 7
+            if offset == 0 and (match.group(1) or "").lower() == "next":
+                offset = 7
+            found.append((match.start(), today + timedelta(days=offset)))
+
+        # Dates without a year take the first occurrence on or after the
+        # previous date, so "December 27th to January 10th" spans new year
+        dates, unresolved, anchor = [], 0, today
+        for _, value in sorted(found, key=lambda item: item[0]):
+            if isinstance(value, tuple):
+                value = _next_on_or_after(anchor, *value)
+
+            if value is None:
+                unresolved += 1
+                continue
+
+            dates.append(value)
+            anchor = max(anchor, value)
+
+        unresolved += any(later < earlier for earlier, later in zip(dates, dates[1:]))
+        return dates, unresolved
+
+    def _locations(self, scanner: _Scanner) -> list[tuple[int, str]]:
+        def is_place(match: re.Match) -> bool:
+            return (
+                match.group(1) not in CAPITALIZED_PLACE_WORDS
+                or scanner.text[scanner.origin(match.start())].isupper()
+            )
+
+        found = [
+            (scanner.origin(match.start()), airport_index.resolve(match.group(1)))
+            for match in scanner.take(PLACE, folded=True, accept=is_place)
+        ]
+        found += [
+            (match.start(), match.group(1))
+            for match in scanner.take(
+                AIRPORT_CODE,
+                accept=lambda match: match.group(1) in airport_index.codes
+            )
+        ]
+        return sorted(found)
+
+    def _assign_route(
+        self,
+        text: str,
+        locations: list[tuple[int, str]],
+        extracted_data: dict[str, Any]
+    ) -> None:
+        if len(locations) != 2:
+            return
+
+        (first_position, first), (_, second) = locations
+
+        # "to London from Paris" names the destination first
+        preceding = PRECEDING_WORD.search(text[:first_position])
+        if preceding is not None and preceding.group(1).lower() == "to":
+            first, second = second, first
+
+        extracted_data["departure"] = first
+        extracted_data["destination"] = second
+
+
+query_parser = QueryParser()
@@ -1,12 +1,11 @@
-import os
-
-from typing import Annotated
-from fastapi import APIRouter, Body
+from typing import Annotated, Any
+from fastapi import APIRouter, Body, Depends, Request
 from text.text import TextRecognitionService
+from text.cache import extraction_cache
+from text.parser import query_parser
+from text.constants.settings import TEXT_CACHE_ENABLED, TEXT_PARSER_ENABLED
 from dotenv import load_dotenv
 
-from openai import OpenAI
-
 from scraper.scraper import search_flights
 from scraper.models import SearchParams, Flight
 
@@ -15,14 +14,28 @@ load_dotenv()
 router = APIRouter()
 
 
-text_service = TextRecognitionService(
-    client=OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-)
+def get_text_service(request: Request) -> TextRecognitionService:
+    return TextRecognitionService(
+        client=request.app.state.openai_client,
+        cache=extraction_cache if TEXT_CACHE_ENABLED else None,
+        parser=query_parser if TEXT_PARSER_ENABLED else None
+    )
 
 
 @router.post("/text/search")
-async def text_search(text: Annotated[str, Body(..., embed=True)]) -> list[Flight]:
-    result = text_service.extract_structured_data(text)
+async def text_search(
+    text: Annotated[str, Body(..., embed=True)],
+    text_service: Annotated[TextRecognitionService, Depends(get_text_service)]
+) -> list[Flight]:
+    result = await text_service.extract_structured_data(text)
     params = SearchParams(**result)
     flights = await search_flights(params)
     return flights
+
+
+@router.get("/text/stats")
+async def text_stats() -> dict[str, Any]:
+    return {
+        "extraction_cache": extraction_cache.snapshot(),
+        "query_parser": query_parser.snapshot(),
+    }
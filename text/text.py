@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from openai import (
-    OpenAI,
+    AsyncOpenAI,
     OpenAIError,
     APIError,
     RateLimitError,
@@ -16,8 +16,12 @@ from text.errors import (
     EmptyTextInputError,
     APIError as TextAPIError
 )
+from text.cache import ExtractionCache
+from text.parser import QueryParser
 from text.constants.prompts import BASE_TEXT_EXTRACTION_PROMPT
-from utils import build_prompt, load_template
+from text.constants.settings import TEXT_EXTRACTION_MODEL
+from utils import build_prompt, load_template, prompt_version
+from metrics import SEARCH_STAGE_SECONDS
 from logging_config import get_logger
 
 logger = get_logger("text")
@@ -25,41 +29,62 @@ logger = get_logger("text")
 
 @dataclass(slots=True)
 class TextRecognitionService:
-    client: OpenAI
+    client: AsyncOpenAI
+    cache: ExtractionCache | None = None
+    parser: QueryParser | None = None
 
-    def extract_structured_data(self, text: str) -> dict[str, Any]:
+    async def extract_structured_data(self, text: str) -> dict[str, Any]:
         if not text or not text.strip():
             error_message = "Text input is empty or contains only whitespace"
             logger.error(error_message)
             raise EmptyTextInputError(error_message)
+
+        if self.parser is not None:
+            parsed = self.parser.extract(text)
+            if parsed is not None:
+                logger.info("Structured data extracted by the local query parser")
+                return parsed
         
         try:
             template_path = Path(__file__).parent.parent / "text_output_structure.md"
             template_content = load_template(template_path)
 
             system_prompt = build_prompt(BASE_TEXT_EXTRACTION_PROMPT, template_content)
+            version = prompt_version(TEXT_EXTRACTION_MODEL, system_prompt)
+
+            if self.cache is not None:
+                cached = await self.cache.get(text, version)
+                if cached is not None:
+                    logger.info("Structured data served from extraction cache")
+                    return cached
 
             logger.info("Structured data extraction from natural text started")
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Extract flight search information from this text:\n\n{text}"
-                    }
-                ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
+            with SEARCH_STAGE_SECONDS.time(stage="llm_extraction"):
+                response = await self.client.chat.completions.create(
+                    model=TEXT_EXTRACTION_MODEL,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": system_prompt
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Extract flight search information from this text:\n\n{text}"
+                        }
+                    ],
+                    temperature=0.1,
+                    response_format={"type": "json_object"}
+                )
 
             logger.info("Structured data extraction completed successfully")
 
-            return json.loads(response.choices[0].message.content)["extracted_data"]
+            extracted_data = json.loads(response.choices[0].message.content)["extracted_data"]
+
+            if self.cache is not None:
+                await self.cache.put(text, version, extracted_data)
+
+            return extracted_data
         
         except json.JSONDecodeError as e:
             error_message = "Failed to parse extracted data. Please try again."
@@ -1,3 +1,4 @@
+import hashlib
 from pathlib import Path
 
 
@@ -14,3 +15,7 @@ def load_template(template_path: Path) -> str | None:
             return f.read()
 
     return None
+
+
+def prompt_version(model: str, system_prompt: str) -> str:
+    return hashlib.sha256(f"{model}\n{system_prompt}".encode("utf-8")).hexdigest()[:16]
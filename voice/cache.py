@@ -0,0 +1,196 @@
+import asyncio
+import copy
+import json
+import os
+
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any
+
+from voice.constants.settings import (
+    VOICE_CACHE_MAX_ENTRIES,
+    VOICE_CACHE_MAX_BYTES,
+    VOICE_CACHE_DIR,
+    VOICE_CACHE_DISK_MAX_ENTRIES,
+)
+from logging_config import get_logger
+
+logger = get_logger("voice")
+
+
+@dataclass(slots=True)
+class TranscriptionCacheStats:
+    hits: int = 0
+    transcription_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_evictions: int = 0
+    errors: int = 0
+
+
+@dataclass(slots=True)
+class CachedAudio:
+    transcription: str
+    prompt_version: str | None = None
+    result: dict[str, Any] | None = None
+
+    def result_for(self, prompt_version: str) -> dict[str, Any] | None:
+        if self.result is None or self.prompt_version != prompt_version:
+            return None
+        return copy.deepcopy(self.result)
+
+
+class TranscriptionCache:
+    """
+    Content-addressed cache of audio clip -> transcription and extraction,
+    keyed on the SHA-256 of the uploaded bytes.
+
+    The memory tier is an LRU bounded by entry count and serialized size.
+    When `directory` is set, every entry is also written there as
+    `<key>.json` so it survives restarts; files beyond `disk_max_entries`
+    are pruned oldest first. The disk tier is read and written in a worker
+    thread, off the event loop. Extractions are stored with the prompt
+    version they were made under, and after a prompt change only the
+    transcription is reused.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = VOICE_CACHE_MAX_ENTRIES,
+        max_bytes: int = VOICE_CACHE_MAX_BYTES,
+        directory: str = VOICE_CACHE_DIR,
+        disk_max_entries: int = VOICE_CACHE_DISK_MAX_ENTRIES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        self.disk_max_entries = disk_max_entries
+        self.stats = TranscriptionCacheStats()
+
+        self._entries: OrderedDict[str, tuple[CachedAudio, int]] = OrderedDict()
+        self._bytes = 0
+        self._disk_entries: int | None = None
+        # Writes (and the pruning they trigger) go one at a time
+        self._disk_lock = asyncio.Lock()
+
+    async def get(self, key: str, prompt_version: str) -> CachedAudio | None:
+        entry = self._get_memory(key)
+
+        if entry is None and self.directory is not None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                self.stats.disk_hits += 1
+                self._store_memory(key, entry)
+
+        if entry is None:
+            self.stats.misses += 1
+        elif entry.result_for(prompt_version) is not None:
+            self.stats.hits += 1
+        else:
+            self.stats.transcription_hits += 1
+
+        return entry
+
+    async def put(self, key: str, entry: CachedAudio) -> None:
+        self._store_memory(key, entry)
+        if self.directory is None:
+            return
+
+        async with self._disk_lock:
+            await asyncio.to_thread(self._write_disk, key, entry)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "disk_entries": self._disk_entries if self.directory else None,
+        }
+
+    def _get_memory(self, key: str) -> CachedAudio | None:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+
+        self._entries.move_to_end(key)
+        return item[0]
+
+    def _store_memory(self, key: str, entry: CachedAudio) -> None:
+        size = len(json.dumps(asdict(entry), default=str))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+
+        self._entries[key] = (entry, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.stats.evictions += 1
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read_disk(self, key: str) -> CachedAudio | None:
+        if self.directory is None:
+            return None
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return CachedAudio(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, json.JSONDecodeError) as e:
+            self.stats.errors += 1
+            logger.warning(f"Transcription cache read failed: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, entry: CachedAudio) -> None:
+        if self.directory is None:
+            return
+
+        path = self._path(key)
+        temp_path = path.with_suffix(".tmp")
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            existed = path.exists()
+
+            # Write then rename so readers never see a partial file
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f)
+            os.replace(temp_path, path)
+
+            if self._disk_entries is None:
+                self._disk_entries = sum(1 for _ in self.directory.glob("*.json"))
+            elif not existed:
+                self._disk_entries += 1
+
+            if self._disk_entries > self.disk_max_entries:
+                self._prune_disk()
+        except OSError as e:
+            self.stats.errors += 1
+            logger.warning(f"Transcription cache write failed: {str(e)}")
+
+    def _prune_disk(self) -> None:
+        # Prune down to 90% of the limit so the directory isn't rescanned on every write
+        files = sorted(self.directory.glob("*.json"), key=lambda file: file.stat().st_mtime)
+        overflow = max(len(files) - int(self.disk_max_entries * 0.9), 0)
+
+        for file in files[:overflow]:
+            file.unlink(missing_ok=True)
+            self.stats.disk_evictions += 1
+
+        self._disk_entries = len(files) - overflow
+
+
+transcription_cache = TranscriptionCache()
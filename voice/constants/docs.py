@@ -4,6 +4,7 @@ from voice.models import (
 )
 from scraper.models import Flight
 from voice.constants.settings import (
+    AUDIO_FIELD_NAME,
     MAX_FILE_SIZE_MB,
     SUPPORTED_AUDIO_FORMATS
 )
@@ -77,4 +78,23 @@ VOICE_FLIGHT_SEARCH_ENDPOINT_RESPONSES = {
     500: {
         "description": "Server Error - OpenAI API error or failed to scrape flight data",
     }
-}
\ No newline at end of file
+}
+AUDIO_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": [AUDIO_FIELD_NAME],
+                    "properties": {
+                        AUDIO_FIELD_NAME: {
+                            "type": "string",
+                            "format": "binary"
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
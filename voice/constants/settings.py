@@ -1,6 +1,29 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
 SUPPORTED_AUDIO_FORMATS = {
     "mp3", "mp4", "mpeg", "mpga", "m4a", "wav", "webm"
 }
 
 MAX_FILE_SIZE_MB = 25
-MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
\ No newline at end of file
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+
+
+AUDIO_FIELD_NAME = "audio"
+
+# Room left on top of MAX_FILE_SIZE_BYTES for multipart boundaries and part
+# headers before a request is refused on its Content-Length alone
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+TRANSCRIPTION_MODEL = "whisper-1"
+VOICE_EXTRACTION_MODEL = "gpt-4o-mini"
+
+VOICE_CACHE_ENABLED: bool = os.getenv("VOICE_CACHE_ENABLED", "true").lower() == "true"
+VOICE_CACHE_MAX_ENTRIES: int = int(os.getenv("VOICE_CACHE_MAX_ENTRIES", "1000"))
+VOICE_CACHE_MAX_BYTES: int = int(os.getenv("VOICE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+# Directory for the on-disk tier, left empty to keep the cache in memory only
+VOICE_CACHE_DIR: str = os.getenv("VOICE_CACHE_DIR", "")
+VOICE_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("VOICE_CACHE_DISK_MAX_ENTRIES", "10000"))
@@ -1,11 +1,14 @@
-import os
-import tempfile
-from fastapi import APIRouter, UploadFile
+from typing import Annotated, Any
+from fastapi import APIRouter, Depends, Request
 from dotenv import load_dotenv
 
 from voice.voice import VoiceRecognitionService
 from voice.models import VoiceSearchResponse
+from voice.upload import read_audio_request
+from voice.cache import transcription_cache
+from voice.constants.settings import VOICE_CACHE_ENABLED
 from voice.constants.docs import (
+    AUDIO_UPLOAD_OPENAPI,
     VOICE_RECOGNITION_ENDPOINT_DESCRIPTION,
     VOICE_RECOGNITION_ENDPOINT_RESPONSES,
     VOICE_FLIGHT_SEARCH_ENDPOINT_DESCRIPTION,
@@ -14,77 +17,71 @@ from voice.constants.docs import (
 from scraper.scraper import search_flights
 from scraper.models import SearchParams, Flight
 
-from openai import OpenAI
-
 load_dotenv()
 
 router = APIRouter()
 
-voice_service = VoiceRecognitionService(
-    client=OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-)
+
+def get_voice_service(request: Request) -> VoiceRecognitionService:
+    return VoiceRecognitionService(
+        client=request.app.state.openai_client,
+        cache=transcription_cache if VOICE_CACHE_ENABLED else None
+    )
+
 
 @router.post(
     "/voice/recognition",
     response_model=VoiceSearchResponse,
     responses=VOICE_RECOGNITION_ENDPOINT_RESPONSES,
-    description=VOICE_RECOGNITION_ENDPOINT_DESCRIPTION
+    description=VOICE_RECOGNITION_ENDPOINT_DESCRIPTION,
+    openapi_extra=AUDIO_UPLOAD_OPENAPI
 )
-async def voice_recognition(audio: UploadFile) -> VoiceSearchResponse:
-    audio_content = await audio.read()
-    
-    # Create temporary file for audio processing
-    with tempfile.NamedTemporaryFile(
-        delete=False,
-        suffix=f"_{audio.filename}"
-    ) as temp_file:
-        temp_file.write(audio_content)
-        temp_file.flush()
-        temp_path = temp_file.name
-    
-    try:
-        with open(temp_path, "rb") as audio_file:
-            result = await voice_service.process_audio(
-                file=audio_file,
-                filename=audio.filename
-            )
-        
-        return VoiceSearchResponse(**result)
-    finally:
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+async def voice_recognition(
+    request: Request,
+    voice_service: Annotated[VoiceRecognitionService, Depends(get_voice_service)]
+) -> VoiceSearchResponse:
+    # Format and size are checked while the body streams in
+    audio = await read_audio_request(request)
+
+    result = await voice_service.process_audio(
+        file=audio.file,
+        filename=audio.filename,
+        validate=False,
+        audio_sha256=audio.sha256
+    )
+
+    return VoiceSearchResponse(**result)
 
 
 @router.post(
     "/voice/search",
     response_model=list[Flight],
     responses=VOICE_FLIGHT_SEARCH_ENDPOINT_RESPONSES,
-    description=VOICE_FLIGHT_SEARCH_ENDPOINT_DESCRIPTION
+    description=VOICE_FLIGHT_SEARCH_ENDPOINT_DESCRIPTION,
+    openapi_extra=AUDIO_UPLOAD_OPENAPI
 )
-async def voice_search(audio: UploadFile) -> list[Flight]:
-    audio_content = await audio.read()
-    
-    # Create temporary file for audio processing
-    with tempfile.NamedTemporaryFile(
-        delete=False,
-        suffix=f"_{audio.filename}"
-    ) as temp_file:
-        temp_file.write(audio_content)
-        temp_file.flush()
-        temp_path = temp_file.name
-    
-    try:
-        with open(temp_path, "rb") as audio_file:
-            result = await voice_service.process_audio(
-                file=audio_file,
-                filename=audio.filename
-            )
-
-        voice_result = VoiceSearchResponse(**result)
-        params = SearchParams(**voice_result.extracted_data.dict())
-        flights = await search_flights(params)
-
-        return flights  
-    finally:
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+async def voice_search(
+    request: Request,
+    voice_service: Annotated[VoiceRecognitionService, Depends(get_voice_service)]
+) -> list[Flight]:
+    audio = await read_audio_request(request)
+
+    result = await voice_service.process_audio(
+        file=audio.file,
+        filename=audio.filename,
+        validate=False,
+        audio_sha256=audio.sha256
+    )
+
+    voice_result = VoiceSearchResponse(**result)
+    params = SearchParams(**voice_result.extracted_data.dict())
+    flights = await search_flights(params)
+
+    return flights
+
+
+@router.get("/voice/stats")
+async def voice_stats() -> dict[str, Any]:
+    return {
+        "transcription_cache": transcription_cache.snapshot(),
+    }
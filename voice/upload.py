@@ -0,0 +1,184 @@
+import hashlib
+import io
+
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import Request
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from voice.errors import InvalidAudioFormatError
+from voice.validators import (
+    ensure_supported_audio_format,
+    ensure_audio_size_within_limit,
+)
+from voice.constants.settings import (
+    AUDIO_FIELD_NAME,
+    MAX_FILE_SIZE_BYTES,
+    MULTIPART_OVERHEAD_BYTES,
+)
+from logging_config import get_logger
+
+logger = get_logger("voice")
+
+
+@dataclass(slots=True)
+class AudioUpload:
+    filename: str
+    file: io.BytesIO
+    size: int
+    sha256: str
+
+
+class _AudioPartCollector:
+    """
+    Multipart parser callbacks that keep the bytes of a single file field
+    in memory and drop every other part. Stops buffering as soon as the
+    running byte count passes `max_bytes`.
+    """
+
+    def __init__(self, field_name: str, max_bytes: int) -> None:
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.filename: str | None = None
+        self.buffer = io.BytesIO()
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.too_large = False
+
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._collecting = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._collecting = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        name = options.get(b"name", b"").decode("utf-8")
+
+        if name == self.field_name and b"filename" in options and self.filename is None:
+            self.filename = options[b"filename"].decode("utf-8")
+            self._collecting = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._collecting or self.too_large:
+            return
+
+        self.size += end - start
+        if self.size > self.max_bytes:
+            self.too_large = True
+            return
+
+        chunk = data[start:end]
+        self.buffer.write(chunk)
+        self.digest.update(chunk)
+
+    def on_part_end(self) -> None:
+        self._collecting = False
+
+
+def _malformed_upload(error: Exception) -> InvalidAudioFormatError:
+    error_message = f"Malformed multipart upload: {str(error)}"
+    logger.error(error_message)
+    return InvalidAudioFormatError(error_message)
+
+
+async def read_audio_upload(
+    chunks: AsyncIterator[bytes],
+    content_type: str | None,
+    content_length: int | None = None,
+    field_name: str = AUDIO_FIELD_NAME,
+    max_bytes: int = MAX_FILE_SIZE_BYTES
+) -> AudioUpload:
+    """
+    Stream a multipart/form-data body into an in-memory buffer holding just
+    the audio file, validating it on the way instead of after the fact.
+
+    Bodies whose Content-Length can't fit within the size limit are refused
+    before a byte is read, the file extension is checked as soon as the
+    part headers arrive, and the upload is aborted the moment the running
+    byte count passes `max_bytes`, so a request never holds more than the
+    limit plus one chunk. The SHA-256 of the audio is computed on the way.
+    """
+    if content_length is not None and content_length > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        ensure_audio_size_within_limit(content_length)
+
+    media_type, options = parse_options_header(content_type)
+    if media_type != b"multipart/form-data" or b"boundary" not in options:
+        error_message = "Audio must be uploaded as multipart/form-data"
+        logger.error(error_message)
+        raise InvalidAudioFormatError(error_message)
+
+    collector = _AudioPartCollector(field_name, max_bytes)
+    parser = MultipartParser(options[b"boundary"], collector.callbacks())
+    format_checked = False
+
+    async for chunk in chunks:
+        try:
+            parser.write(chunk)
+        except (FormParserError, UnicodeDecodeError) as e:
+            # A broken body is the client's fault, the same as a wrong content type
+            raise _malformed_upload(e) from e
+
+        if collector.filename is not None and not format_checked:
+            ensure_supported_audio_format(collector.filename)
+            format_checked = True
+
+        if collector.too_large:
+            ensure_audio_size_within_limit(collector.size)
+
+    try:
+        parser.finalize()
+    except FormParserError as e:
+        raise _malformed_upload(e) from e
+
+    if collector.filename is None:
+        error_message = f"Missing '{field_name}' file in the upload"
+        logger.error(error_message)
+        raise InvalidAudioFormatError(error_message)
+
+    collector.buffer.seek(0)
+    logger.info(f"Audio upload received: {collector.size} bytes")
+
+    return AudioUpload(
+        filename=collector.filename,
+        file=collector.buffer,
+        size=collector.size,
+        sha256=collector.digest.hexdigest()
+    )
+
+
+async def read_audio_request(request: Request) -> AudioUpload:
+    content_length = request.headers.get("content-length")
+
+    return await read_audio_upload(
+        request.stream(),
+        content_type=request.headers.get("content-type"),
+        content_length=int(content_length) if content_length and content_length.isdigit() else None
+    )
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from voice.errors import InvalidAudioFormatError, AudioFileTooLargeError
+from voice.constants.settings import (
+    SUPPORTED_AUDIO_FORMATS,
+    MAX_FILE_SIZE_MB,
+    MAX_FILE_SIZE_BYTES,
+)
+from logging_config import get_logger
+
+logger = get_logger("voice")
+
+
+def ensure_supported_audio_format(filename: str) -> None:
+    file_extension = Path(filename).suffix.lower().lstrip(".")
+
+    if file_extension not in SUPPORTED_AUDIO_FORMATS:
+        error_message = f"""
+        Unsupported audio format: {file_extension}. 
+        Supported formats: {', '.join(SUPPORTED_AUDIO_FORMATS)}
+        """
+
+        logger.error(error_message)
+        raise InvalidAudioFormatError(error_message)
+
+
+def ensure_audio_size_within_limit(file_size: int) -> None:
+    if file_size > MAX_FILE_SIZE_BYTES:
+        total_size = file_size / 1024 / 1024
+        error_message = f"""
+        Audio file size ({total_size:.2f}MB) exceeds maximum allowed size ({MAX_FILE_SIZE_MB}MB)
+        """
+
+        logger.error(error_message)
+        raise AudioFileTooLargeError(error_message)
@@ -1,9 +1,9 @@
-import os
+import copy
 import json
 from pathlib import Path
 from typing import BinaryIO, Any
 from openai import (
-    OpenAI,
+    AsyncOpenAI,
     OpenAIError,
     APIError,
     RateLimitError,
@@ -11,21 +11,19 @@ from openai import (
 )
 
 from voice.errors import (
-    VoiceRecognitionError,
-    InvalidAudioFormatError,
-    AudioFileTooLargeError,
     TranscriptionError,
     StructuredExtractionError,
 )
+from voice.validators import (
+    ensure_supported_audio_format,
+    ensure_audio_size_within_limit,
+)
 
+from voice.cache import TranscriptionCache, CachedAudio
 from voice.constants.prompts import BASE_EXTRACTION_PROMPT
-from utils import build_prompt, load_template
-
-from voice.constants.settings import (
-    SUPPORTED_AUDIO_FORMATS,
-    MAX_FILE_SIZE_MB,
-    MAX_FILE_SIZE_BYTES,
-)
+from voice.constants.settings import TRANSCRIPTION_MODEL, VOICE_EXTRACTION_MODEL
+from utils import build_prompt, load_template, prompt_version
+from metrics import SEARCH_STAGE_SECONDS
 
 from dataclasses import dataclass
 from logging_config import get_logger
@@ -35,42 +33,28 @@ logger = get_logger("voice")
 
 @dataclass(slots=True)
 class VoiceRecognitionService:
-    client: OpenAI
+    client: AsyncOpenAI
+    cache: TranscriptionCache | None = None
 
     def validate_audio_file(self, file: BinaryIO, filename: str) -> None:
-        file_extension = Path(filename).suffix.lower().lstrip(".")
-        
-        if file_extension not in SUPPORTED_AUDIO_FORMATS:
-            error_message = f"""
-            Unsupported audio format: {file_extension}. 
-            Supported formats: {', '.join(SUPPORTED_AUDIO_FORMATS)}
-            """
-            
-            logger.error(error_message)
-            raise InvalidAudioFormatError(error_message)
+        ensure_supported_audio_format(filename)
         
         file.seek(0, 2)
         file_size = file.tell()
         file.seek(0)
 
+        ensure_audio_size_within_limit(file_size)
+
         logger.info("Audio file validated successfully")
-        
-        if file_size > MAX_FILE_SIZE_BYTES:
-            total_size = file_size / 1024 / 1024
-            error_message = f"""
-            Audio file size ({total_size:.2f}MB) exceeds maximum allowed size ({MAX_FILE_SIZE_MB}MB)
-            """
-            
-            logger.error(error_message)
-            raise AudioFileTooLargeError(error_message)
 
-    def transcribe_audio(self, file: BinaryIO, filename: str) -> str:
+    async def transcribe_audio(self, file: BinaryIO, filename: str) -> str:
         try:
-            response = self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=(filename, file),
-                response_format="text"
-            )
+            with SEARCH_STAGE_SECONDS.time(stage="transcription"):
+                response = await self.client.audio.transcriptions.create(
+                    model=TRANSCRIPTION_MODEL,
+                    file=(filename, file),
+                    response_format="text"
+                )
             
             logger.info("Audio transcription completed successfully")
             return response.strip() if isinstance(response, str) else response
@@ -85,28 +69,32 @@ class VoiceRecognitionService:
             logger.error(message)
             raise TranscriptionError(message) from e
 
-    def extract_structured_data(self, transcription: str) -> dict[str, Any]:
-        try:
-            template_path = Path(__file__).parent.parent / "voice_output_structure.md"
-            template_content = load_template(template_path)
+    def system_prompt(self) -> str:
+        template_path = Path(__file__).parent.parent / "voice_output_structure.md"
+        template_content = load_template(template_path)
+
+        return build_prompt(BASE_EXTRACTION_PROMPT, template_content)
 
-            system_prompt = build_prompt(BASE_EXTRACTION_PROMPT, template_content)
+    async def extract_structured_data(self, transcription: str) -> dict[str, Any]:
+        try:
+            system_prompt = self.system_prompt()
         
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"Extract flight search information from this transcription:\n\n{transcription}"
-                    }
-                ],
-                temperature=0.1,  # Low temperature for consistent extraction
-                response_format={"type": "json_object"}
-            )
+            with SEARCH_STAGE_SECONDS.time(stage="llm_extraction"):
+                response = await self.client.chat.completions.create(
+                    model=VOICE_EXTRACTION_MODEL,
+                    messages=[
+                        {
+                            "role": "system", 
+                            "content": system_prompt
+                        },
+                        {
+                            "role": "user", 
+                            "content": f"Extract flight search information from this transcription:\n\n{transcription}"
+                        }
+                    ],
+                    temperature=0.1,  # Low temperature for consistent extraction
+                    response_format={"type": "json_object"}
+                )
             
             logger.info("Structured data extraction completed successfully")
             
@@ -135,12 +123,40 @@ class VoiceRecognitionService:
         self, 
         file: BinaryIO, 
         filename: str,
-        validate: bool = True
+        validate: bool = True,
+        audio_sha256: str | None = None
     ) -> dict[str, Any]:
         if validate:
             self.validate_audio_file(file, filename)
-        
-        transcription = self.transcribe_audio(file, filename)
-        structured_data = self.extract_structured_data(transcription)
-        
+
+        if self.cache is None or audio_sha256 is None:
+            transcription = await self.transcribe_audio(file, filename)
+            return await self.extract_structured_data(transcription)
+
+        # The same clip transcribed by another model is a different entry
+        key = f"{TRANSCRIPTION_MODEL}-{audio_sha256}"
+        version = prompt_version(VOICE_EXTRACTION_MODEL, self.system_prompt())
+        cached = await self.cache.get(key, version)
+
+        if cached is not None:
+            result = cached.result_for(version)
+            if result is not None:
+                logger.info("Voice search served from transcription cache")
+                return result
+
+            logger.info("Transcription served from cache, extracting with the current prompt")
+            transcription = cached.transcription
+        else:
+            transcription = await self.transcribe_audio(file, filename)
+            # Keep the transcription even if the extraction below fails
+            await self.cache.put(key, CachedAudio(transcription=transcription))
+
+        structured_data = await self.extract_structured_data(transcription)
+
+        await self.cache.put(key, CachedAudio(
+            transcription=transcription,
+            prompt_version=version,
+            result=copy.deepcopy(structured_data)
+        ))
+
         return structured_data